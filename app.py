@@ -1,5 +1,7 @@
 import streamlit as st
 import os
+import shutil
+import tempfile
 
 # 1. 页面配置
 st.set_page_config(page_title="CFD Studio", layout="wide")
@@ -17,6 +19,14 @@ if 'reading_article' not in st.session_state:
 if 'cfd_result' not in st.session_state:
     st.session_state.cfd_result = None
 
+
+def _discard_cfd_result():
+    """清空当前结果，并删除其磁盘快照目录（如有）。"""
+    res = st.session_state.get("cfd_result")
+    if res and res.get("snapshot_dir"):
+        shutil.rmtree(res["snapshot_dir"], ignore_errors=True)
+    st.session_state.cfd_result = None
+
 # ==============================================================================
 # 左侧栏 (Sidebar) - 固定头部防止跳动
 # ==============================================================================
@@ -83,6 +93,7 @@ if selected_key == "project":
 elif selected_key == "cfd":
     # 懒加载：新求解器与新绘图模块
     from core.solver import lid_driven_cavity_mac
+    from core.codec import SnapshotCodec
     from viz.plot_flow import plot_pressure, plot_streamlines, plot_u_velocity, plot_v_velocity
     from viz.center_line import zxpm
     import numpy as np
@@ -127,6 +138,15 @@ elif selected_key == "cfd":
     with st.expander("⚙️ 求解器参数设置 (Advanced Settings)", expanded=False):
         st.caption("调整以下参数以控制收敛速度和稳定性：")
 
+        # 拉伸网格只支持部分压力求解器，先确定网格类型再给出求解器选项
+        grid_stretch = "tanh" if st.checkbox(
+            "壁面加密网格（tanh 拉伸，高 Re 下用更少网格分辨壁面边界层与角涡）",
+            value=False,
+            key="cfd_grid_stretch",
+        ) else None
+        if grid_stretch is not None:
+            st.caption("拉伸网格仅支持 direct / sor / gauss_seidel 压力求解器；显式扩散限制按最小网格间距计算，建议启用自适应时间步长。")
+
         c4, c5, c6 = st.columns(3)
         with c4:
             # 1) 默认值不要用格式化截断（避免推荐值很小时变成 0 导致减号按钮直接不可用）
@@ -141,15 +161,24 @@ elif selected_key == "cfd":
                 format="%.2e",
                 key="cfd_dt",
             )
+            dt_auto = st.checkbox("自适应时间步长 (按实际 CFL 调整)", value=False, key="cfd_dt_auto")
         with c5:
             max_iter = st.number_input("最大时间步数", 100, 60000000, 20000, step=1000, key="cfd_max_iter")
         with c6:
-            pressure_solver = st.selectbox(
-                "压力方程求解器",
-                options=["jacobi", "gauss_seidel", "sor"],
-                index=2,
-                key="cfd_pressure_solver",
-            )
+            if grid_stretch is None:
+                pressure_solver = st.selectbox(
+                    "压力方程求解器",
+                    options=["jacobi", "gauss_seidel", "sor", "multigrid", "pcg", "direct", "fft"],
+                    index=6,
+                    key="cfd_pressure_solver",
+                )
+            else:
+                pressure_solver = st.selectbox(
+                    "压力方程求解器",
+                    options=["direct", "sor", "gauss_seidel"],
+                    index=0,
+                    key="cfd_pressure_solver_stretched",
+                )
 
         c7, c8, c9 = st.columns(3)
         with c7:
@@ -173,15 +202,19 @@ elif selected_key == "cfd":
             # - Jacobi：不显示 slider，改为提示“雅可比迭代不涉及 omega”
             # - GS：显示为 1 且灰色不可改
             # - SOR：可调
+            # - 多重网格 / PCG / 直接法 / FFT：不涉及 omega
             if pressure_solver == "jacobi":
                 omega = 1.0
                 st.info("雅可比迭代不涉及 omega。")
+            elif pressure_solver in ("multigrid", "pcg", "direct", "fft"):
+                omega = 1.0
+                st.info("多重网格 / PCG / 直接法 / FFT 求解不涉及 omega。")
             elif pressure_solver == "gauss_seidel":
                 omega = st.slider("SOR 松弛因子 omega", 1.0, 1.95, 1.0, disabled=True, key="cfd_omega_gs")
             else:  # sor
                 omega = st.slider("SOR 松弛因子 omega", 1.0, 1.95, 1.8, key="cfd_omega_sor")
 
-        save_snapshots = st.checkbox("保存间隔快照内存（便于查看指定时间步作图）", value=False, key="cfd_save_snapshots")
+        save_snapshots = st.checkbox("保存间隔快照（流式写入临时磁盘文件，便于查看指定时间步作图）", value=False, key="cfd_save_snapshots")
         save_interval = None
         if save_snapshots:
             save_interval = st.number_input(
@@ -192,6 +225,12 @@ elif selected_key == "cfd":
                 step=10,
                 key="cfd_save_interval",
             )
+            snapshot_storage = st.radio(
+                "快照存储方式",
+                ["磁盘内存映射 (无损)", "内存压缩 (float32 + 时间增量 + zlib)"],
+                horizontal=True,
+                key="cfd_snapshot_storage",
+            )
 
     st.markdown("<br>", unsafe_allow_html=True)
     # 运行控制：开始/停止并排（不要求全幅）
@@ -206,7 +245,7 @@ elif selected_key == "cfd":
         # Streamlit 的脚本执行是同步的：停止按钮主要用于“停止后清空/隐藏结果”。
         # 若需要中断正在运行的计算，可使用 Streamlit 自带的 Stop/重载。
         st.session_state.cfd_cancel_requested = True
-        st.session_state.cfd_result = None
+        _discard_cfd_result()
         st.session_state.pop("cfd_plot_cache", None)
         st.session_state.cfd_status_msg = "⏹ 已停止并清空当前结果。"
         st.session_state.cfd_status_kind = "info"
@@ -217,6 +256,13 @@ elif selected_key == "cfd":
     # B. 计算逻辑
     if submitted:
         st.session_state.cfd_cancel_requested = False
+        _discard_cfd_result()
+        # 间隔快照流式写入临时目录的内存映射文件，session_state 中只保留惰性帧序列
+        # 选择内存压缩时各帧以 float32 + 时间增量 + zlib 编码保存在内存中，读取时才解码
+        compress_snapshots = save_interval is not None and snapshot_storage.startswith("内存压缩")
+        snapshot_dir = None
+        if save_interval is not None and not compress_snapshots:
+            snapshot_dir = tempfile.mkdtemp(prefix="cfd_snapshots_")
         with st.spinner("正在进行 N-S 方程求解..."):
             try:
                 u_list, v_list, p_list, solve_info = lid_driven_cavity_mac(
@@ -224,12 +270,16 @@ elif selected_key == "cfd":
                     nx=int(nx),
                     ny=int(ny),
                     max_iter=int(max_iter),
-                    dt=float(time_step),
+                    dt="auto" if dt_auto else float(time_step),
                     Vtol=float(Vtol),
                     Ptol=float(Ptol),
                     pressure_solver=pressure_solver,
                     omega=float(omega),
                     save_interval=save_interval,
+                    snapshot_dir=snapshot_dir,
+                    snapshot_codec=SnapshotCodec() if compress_snapshots else None,
+                    grid_stretch=grid_stretch,
+                    progress="streamlit",
                     return_info=True,
                 )
 
@@ -240,10 +290,12 @@ elif selected_key == "cfd":
                     "re": float(re_num),
                     "nx": int(nx),
                     "ny": int(ny),
-                    "dt": float(time_step),
+                    "dt": "auto" if dt_auto else float(time_step),
                     "pressure_solver": pressure_solver,
                     "omega": float(omega),
                     "save_interval": save_interval,
+                    "snapshot_dir": snapshot_dir,
+                    "grid_stretch": grid_stretch,
                     "solve_info": solve_info,
                 }
                 # 新结果产生后，清空旧的图像缓存，避免显示错帧/错参数
@@ -253,6 +305,9 @@ elif selected_key == "cfd":
                 if solve_info.get("canceled") and solve_info.get("canceled_step") is not None:
                     st.session_state.cfd_status_msg = f"⏹ 已停止：在第 {solve_info['canceled_step']} 步停止。"
                     st.session_state.cfd_status_kind = "info"
+                elif solve_info.get("diverged"):
+                    st.session_state.cfd_status_msg = f"❌ 计算发散：在第 {solve_info['diverged_step']} 步出现非有限值，请减小 dt。"
+                    st.session_state.cfd_status_kind = "error"
                 elif solve_info.get("converged") and solve_info.get("converged_step") is not None:
                     st.session_state.cfd_status_msg = f"✅ 计算完成！在第 {solve_info['converged_step']} 步收敛。"
                     st.session_state.cfd_status_kind = "success"
@@ -263,6 +318,8 @@ elif selected_key == "cfd":
                 # 当结果帧数变化时，重置快照选择默认到最后一帧
                 st.session_state.cfd_frame_no = len(u_list)
             except Exception as e:
+                if snapshot_dir is not None:
+                    shutil.rmtree(snapshot_dir, ignore_errors=True)
                 st.error(f"Error: {e}")
 
     # C. 结果展示
@@ -276,6 +333,8 @@ elif selected_key == "cfd":
         if status_msg:
             if status_kind == "info":
                 st.info(status_msg)
+            elif status_kind == "error":
+                st.error(status_msg)
             else:
                 st.success(status_msg)
 
@@ -319,11 +378,13 @@ elif selected_key == "cfd":
         nx = res["nx"]
         ny = res["ny"]
 
-        # 生成网格坐标（用于中心线对比）
-        x_face = np.linspace(0.0, 1.0, nx + 1)
-        y_face = np.linspace(0.0, 1.0, ny + 1)
-        x_center = (x_face[:-1] + x_face[1:]) / 2.0
-        y_center = (y_face[:-1] + y_face[1:]) / 2.0
+        # 网格坐标（求解器返回的实际坐标，拉伸网格时为非均匀分布）
+        coords = (res.get("solve_info") or {}).get("coords")
+        if coords is not None:
+            x_face, y_face = coords["x_face"], coords["y_face"]
+        else:
+            x_face = np.linspace(0.0, 1.0, nx + 1)
+            y_face = np.linspace(0.0, 1.0, ny + 1)
 
         # 图像缓存：避免你在上方改参数时，下方四张图每次都重新生成（造成“重新加载”的感觉）
         plot_cache = st.session_state.setdefault("cfd_plot_cache", {})
@@ -331,9 +392,10 @@ elif selected_key == "cfd":
             float(res["re"]),
             int(res["nx"]),
             int(res["ny"]),
-            float(res["dt"]),
+            res["dt"],
             str(res["pressure_solver"]),
             float(res["omega"]),
+            res.get("grid_stretch"),
             int(frame_idx),
         )
 
@@ -355,13 +417,15 @@ elif selected_key == "cfd":
         with r1c1:
             img_u = _get_plot_bytes(
                 "u",
-                lambda: plot_u_velocity(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False),
+                lambda: plot_u_velocity(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False,
+                                        x_face=x_face, y_face=y_face),
             )
             layout.render_plot_with_caption(image_bytes=img_u, caption_text="u-velocity", color_theme="#d0ebff")
         with r1c2:
             img_v = _get_plot_bytes(
                 "v",
-                lambda: plot_v_velocity(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False),
+                lambda: plot_v_velocity(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False,
+                                        x_face=x_face, y_face=y_face),
             )
             layout.render_plot_with_caption(image_bytes=img_v, caption_text="v-velocity", color_theme="#d0ebff")
 
@@ -369,13 +433,15 @@ elif selected_key == "cfd":
         with r2c1:
             img_p = _get_plot_bytes(
                 "p",
-                lambda: plot_pressure(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False),
+                lambda: plot_pressure(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False,
+                                        x_face=x_face, y_face=y_face),
             )
             layout.render_plot_with_caption(image_bytes=img_p, caption_text="Pressure Field", color_theme="#d0ebff")
         with r2c2:
             img_s = _get_plot_bytes(
                 "s",
-                lambda: plot_streamlines(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False),
+                lambda: plot_streamlines(u, v, p, Re=res["re"], Lx=1.0, Ly=1.0, filename=None, show=False,
+                                        x_face=x_face, y_face=y_face),
             )
             layout.render_plot_with_caption(image_bytes=img_s, caption_text="Streamlines", color_theme="#d0ebff")
 
@@ -387,8 +453,6 @@ elif selected_key == "cfd":
                 v,
                 x_face,
                 y_face,
-                x_center,
-                y_center,
                 int(res["re"]),
                 filename=None,
                 show=False,
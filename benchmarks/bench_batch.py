@@ -0,0 +1,57 @@
+"""
+批量求解基准：B 个 Reynolds 数逐个调用 lid_driven_cavity_mac vs 一次 lid_driven_cavity_batch。
+
+用法 (在仓库根目录):
+    python -m benchmarks.bench_batch [--grids 32 64 128] [--re 100 200 300 400 500 600 800 1000]
+                                     [--steps 300] [--solver fft]
+
+两种方式都以相同的固定 dt（最小 Re 的稳定步长乘 0.8）推进 --steps 步（Vtol=0，不提前收敛），
+报告总耗时、每个算例的等效 steps/s 与加速比，并给出两者最终场的最大差值。
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from core.batch import lid_driven_cavity_batch
+from core.solver import lid_driven_cavity_mac
+
+
+def _quiet(func, **kwargs):
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        t0 = time.perf_counter()
+        result = func(**kwargs)
+        return result, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="逐个求解 vs 批量求解")
+    parser.add_argument("--grids", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--re", type=float, nargs="+", default=[100, 200, 300, 400, 500, 600, 800, 1000])
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--solver", default="fft")
+    args = parser.parse_args(argv)
+
+    batch = len(args.re)
+    print(f"== {batch} 个算例，{args.steps} 步，压力求解器 {args.solver} ==")
+    print(f"{'grid':>6} {'serial[s]':>10} {'batch[s]':>9} {'case-steps/s':>13} {'speedup':>8} {'max|du|':>10}")
+    for n in args.grids:
+        dt = 0.8 * min(1.0 / n, 0.25 * min(args.re) / n ** 2)
+        common = dict(nx=n, ny=n, max_iter=args.steps, dt=dt, Vtol=0.0, pressure_solver=args.solver)
+        t_serial = 0.0
+        u_serial = []
+        for Re in args.re:
+            (u_list, _, _), elapsed = _quiet(lid_driven_cavity_mac, Re=Re, **common)
+            t_serial += elapsed
+            u_serial.append(u_list[-1])
+        (u, _, _), t_batch = _quiet(lid_driven_cavity_batch, Re=args.re, **common)
+        diff = np.abs(u - np.array(u_serial)).max()
+        rate = batch * args.steps / t_batch
+        print(f"{n:>6d} {t_serial:>10.2f} {t_batch:>9.2f} {rate:>13.1f} {t_serial / t_batch:>8.2f} {diff:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
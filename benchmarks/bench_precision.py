@@ -0,0 +1,80 @@
+"""
+精度模式基准：float64 / float32 / 混合精度 PPE 的吞吐量与精度。
+
+用法 (在仓库根目录):
+    python -m benchmarks.bench_precision [--grids 256 512 1024] [--steps 50] [--solver fft]
+                                         [--re 100 1000] [--acc-grid 64] [--vtol 1e-6]
+
+第一部分固定推进 --steps 步，报告各精度模式的 steps/s 与 MLUPS (每秒百万单元更新)。
+第二部分在 --acc-grid 网格上计算至收敛，报告中心线与 Ghia (1982) 的最大误差，
+以及与 float64 结果中心线的最大偏差（衡量精度模式本身引入的误差，与离散误差无关）。
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from core.solver import lid_driven_cavity_mac
+from core.validation import centerline_profiles, ghia_error
+
+MODES = {
+    "float64": dict(dtype=np.float64),
+    "float32": dict(dtype=np.float32),
+    "mixed": dict(dtype=np.float64, mixed_precision=True),
+}
+
+
+def _run(**kwargs):
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        t0 = time.perf_counter()
+        u_list, v_list, _, info = lid_driven_cavity_mac(return_info=True, **kwargs)
+        elapsed = time.perf_counter() - t0
+    return u_list[-1], v_list[-1], info, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="float64 / float32 / 混合精度 PPE 对比")
+    parser.add_argument("--grids", type=int, nargs="+", default=[256, 512, 1024])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--solver", default="fft")
+    parser.add_argument("--re", type=float, nargs="+", default=[100.0, 1000.0])
+    parser.add_argument("--acc-grid", type=int, default=64)
+    parser.add_argument("--vtol", type=float, default=1e-6)
+    parser.add_argument("--max-iter", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    print(f"== 吞吐量：{args.steps} 步，压力求解器 {args.solver}，Re=1000 ==")
+    print(f"{'grid':>6} {'mode':>8} {'time[s]':>9} {'steps/s':>9} {'MLUPS':>8} {'speedup':>8}")
+    for n in args.grids:
+        base = None
+        for mode, opts in MODES.items():
+            *_, elapsed = _run(Re=1000.0, nx=n, ny=n, dt=0.25 / n, max_iter=args.steps, Vtol=0.0,
+                               pressure_solver=args.solver, **opts)
+            base = base or elapsed
+            rate = args.steps / elapsed
+            print(f"{n:>6d} {mode:>8} {elapsed:>9.2f} {rate:>9.1f} {rate * n * n / 1e6:>8.2f} {base / elapsed:>8.2f}")
+
+    n = args.acc_grid
+    print(f"\n== 精度：{n}x{n}，计算至 Vtol={args.vtol:g}，压力求解器 {args.solver} ==")
+    print(f"{'Re':>6} {'mode':>8} {'steps':>7} {'Ghia u_max':>11} {'Ghia v_max':>11} {'vs float64':>11}")
+    for Re in args.re:
+        ref = None
+        for mode, opts in MODES.items():
+            u, v, info, _ = _run(Re=Re, nx=n, ny=n, dt="auto", Vtol=args.vtol, max_iter=args.max_iter,
+                                 pressure_solver=args.solver, **opts)
+            profiles = centerline_profiles(u, v)
+            ref = ref or profiles
+            dev = max(np.abs(profiles[1] - ref[1]).max(), np.abs(profiles[3] - ref[3]).max())
+            err = ghia_error(u, v, Re)
+            steps = info["converged_step"] if info["converged"] else info["max_iter"]
+            if err is None:
+                print(f"{Re:>6g} {mode:>8} {steps:>7d} {'-':>11} {'-':>11} {dev:>11.2e}")
+            else:
+                print(f"{Re:>6g} {mode:>8} {steps:>7d} {err['u_max']:>11.4f} {err['v_max']:>11.4f} {dev:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
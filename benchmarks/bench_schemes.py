@@ -0,0 +1,69 @@
+"""
+时间推进格式基准：各格式达到 Vtol 所需的墙钟时间。
+
+用法 (在仓库根目录):
+    python -m benchmarks.bench_schemes [--res 100 1000 3200] [--schemes euler ab2 rk3]
+                                       [--grid 64] [--vtol 1e-5] [--fractions 1.0 0.5 0.25 0.125 0.0625]
+
+对每个 (Re, 格式)，时间步长依次取 CFL 限制 min(dx, dy) 的 --fractions 倍（从大到小），
+并与该格式的扩散稳定限制取小；第一个收敛（未发散）的 dt 即视为该格式可用的最大步长，
+报告该 dt 下的步数、达到 Vtol 的墙钟时间与 steps/s。压力方程统一使用 fft。
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from core.schemes import DIFFUSION_FACTOR
+from core.solver import lid_driven_cavity_mac
+
+
+def _run(Re, n, dt, scheme, vtol, max_iter):
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        t0 = time.perf_counter()
+        *_, info = lid_driven_cavity_mac(
+            Re=Re, nx=n, ny=n, dt=dt, Vtol=vtol, max_iter=max_iter,
+            pressure_solver="fft", time_scheme=scheme, return_info=True,
+        )
+        elapsed = time.perf_counter() - t0
+    return info, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="时间推进格式：达到 Vtol 的墙钟时间对比")
+    parser.add_argument("--res", type=float, nargs="+", default=[100.0, 1000.0, 3200.0])
+    parser.add_argument("--schemes", nargs="+", default=["euler", "ab2", "rk3"])
+    parser.add_argument("--grid", type=int, default=64)
+    parser.add_argument("--vtol", type=float, default=1e-5)
+    parser.add_argument("--max-iter", type=int, default=200000)
+    parser.add_argument("--fractions", type=float, nargs="+", default=[1.0, 0.5, 0.25, 0.125, 0.0625],
+                        help="dt 取 CFL 限制的倍数（从大到小依次尝试）")
+    args = parser.parse_args(argv)
+
+    n = args.grid
+    h = 1.0 / n
+    print(f"网格 {n}x{n}，Vtol={args.vtol:g}，压力求解器 fft")
+    print(f"{'Re':>6} {'scheme':>7} {'dt':>10} {'steps':>8} {'time[s]':>9} {'steps/s':>9}")
+    for Re in args.res:
+        for scheme in args.schemes:
+            dt_diff = 0.25 * Re * h ** 2 * DIFFUSION_FACTOR.get(scheme, float("inf"))
+            result = None
+            for frac in sorted(args.fractions, reverse=True):
+                dt = min(frac * h, dt_diff)
+                info, elapsed = _run(Re, n, dt, scheme, args.vtol, args.max_iter)
+                if info["converged"]:
+                    result = (dt, info["converged_step"], elapsed)
+                    break
+                if not info["diverged"]:
+                    # 稳定但在 max_iter 内未收敛：更小的 dt 只会更慢
+                    break
+            if result is None:
+                print(f"{Re:>6g} {scheme:>7} {'-':>10} {'-':>8} {'-':>9} {'-':>9}  (未收敛)")
+                continue
+            dt, steps, elapsed = result
+            print(f"{Re:>6g} {scheme:>7} {dt:>10.2e} {steps:>8d} {elapsed:>9.2f} {steps / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+时间步内核微基准：逐数组分配的旧写法 vs 预分配工作区内核。
+
+用法 (在仓库根目录):
+    python -m benchmarks.bench_step [--grids 60 200 400] [--sweeps 20]
+
+两种实现都使用红黑 SOR 且每步固定 --sweeps 次扫描，只比较时间步内核本身。
+“KiB/step”为 tracemalloc 统计的单步峰值减去步前占用，反映每步新分配的数组量
+（内核一侧的少量剩余来自 NumPy 对非连续视图做归约时的固定大小缓冲区）。
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.kernels import MACWorkspace, ppe_source, predict, project
+from core.pressure import rb_sweep, red_black_views
+
+
+def _legacy_state(nx, ny):
+    """旧写法的状态：裸数组 + 布尔红黑掩码。"""
+    y_grid, x_grid = np.meshgrid(np.arange(ny), np.arange(nx), indexing='ij')
+    return {
+        "u": np.zeros((ny, nx + 1)), "v": np.zeros((ny + 1, nx)), "p": np.zeros((ny, nx)),
+        "mask_red": (y_grid + x_grid) % 2 == 0, "mask_black": (y_grid + x_grid) % 2 == 1,
+    }
+
+
+def legacy_step(state, dx, dy, dt, Re, sweeps, omega=1.8, u_top=1.0):
+    """重构前 lid_driven_cavity_mac 的单步写法（np.pad / copy / 掩码 gather-scatter）。"""
+    u, v, p = state["u"], state["v"], state["p"]
+    mask_red, mask_black = state["mask_red"], state["mask_black"]
+    inv_Re, dx2, dy2 = 1.0 / Re, dx ** 2, dy ** 2
+    inv_denom = 1.0 / (2 * (dx2 + dy2))
+
+    un = u.copy()
+    vn = v.copy()
+
+    un_pad = np.pad(un, ((1, 1), (0, 0)), 'edge')
+    un_pad[0, :] = -un[0, :]
+    un_pad[-1, :] = 2 * u_top - un[-1, :]
+    u_c = un[:, 1:-1]
+    diff_u = inv_Re * ((un[:, 2:] - 2 * u_c + un[:, :-2]) / dx2 +
+                       (un_pad[2:, 1:-1] - 2 * u_c + un_pad[:-2, 1:-1]) / dy2)
+    du2_dx = (((u_c + un[:, 2:]) / 2) ** 2 - ((u_c + un[:, :-2]) / 2) ** 2) / dx
+    duv_dy = ((un_pad[2:, 1:-1] + u_c) / 2 * (vn[1:, 1:] + vn[1:, :-1]) / 2 -
+              (u_c + un_pad[:-2, 1:-1]) / 2 * (vn[:-1, 1:] + vn[:-1, :-1]) / 2) / dy
+    u_star = un.copy()
+    u_star[:, 1:-1] = u_c + dt * (-du2_dx - duv_dy + diff_u)
+
+    vn_pad = np.pad(vn, ((0, 0), (1, 1)), 'edge')
+    vn_pad[:, 0] = -vn[:, 0]
+    vn_pad[:, -1] = -vn[:, -1]
+    v_c = vn[1:-1, :]
+    diff_v = inv_Re * ((vn_pad[1:-1, 2:] - 2 * v_c + vn_pad[1:-1, :-2]) / dx2 +
+                       (vn[2:, :] - 2 * v_c + vn[:-2, :]) / dy2)
+    dv2_dy = (((v_c + vn[2:, :]) / 2) ** 2 - ((v_c + vn[:-2, :]) / 2) ** 2) / dy
+    duv_dx = ((vn_pad[1:-1, 2:] + v_c) / 2 * (un[1:, 1:] + un[:-1, 1:]) / 2 -
+              (vn_pad[1:-1, :-2] + v_c) / 2 * (un[1:, :-1] + un[:-1, :-1]) / 2) / dx
+    v_star = vn.copy()
+    v_star[1:-1, :] = v_c + dt * (-duv_dx - dv2_dy + diff_v)
+
+    u_star[:, 0] = 0.0
+    u_star[:, -1] = 0.0
+    v_star[0, :] = 0.0
+    v_star[-1, :] = 0.0
+
+    b = ((u_star[:, 1:] - u_star[:, :-1]) / dx + (v_star[1:, :] - v_star[:-1, :]) / dy) / dt
+    p_pad = np.pad(p, ((1, 1), (1, 1)), 'edge')
+    for _ in range(sweeps):
+        p_old_inner = p_pad[1:-1, 1:-1].copy()  # noqa: F841  旧写法每次扫描都拷贝
+        p_pad[0, 1:-1] = p_pad[1, 1:-1]
+        p_pad[-1, 1:-1] = p_pad[-2, 1:-1]
+        p_pad[1:-1, 0] = p_pad[1:-1, 1]
+        p_pad[1:-1, -1] = p_pad[1:-1, -2]
+        for mask in (mask_red, mask_black):
+            p_gs = (dy2 * (p_pad[1:-1, 2:] + p_pad[1:-1, :-2]) +
+                    dx2 * (p_pad[2:, 1:-1] + p_pad[:-2, 1:-1]) - dx2 * dy2 * b) * inv_denom
+            p_pad[1:-1, 1:-1][mask] = (1 - omega) * p_pad[1:-1, 1:-1][mask] + omega * p_gs[mask]
+    p = p_pad[1:-1, 1:-1]
+    p -= np.mean(p)
+
+    u[:, 1:-1] = u_star[:, 1:-1] - dt * (p[:, 1:] - p[:, :-1]) / dx
+    v[1:-1, :] = v_star[1:-1, :] - dt * (p[1:, :] - p[:-1, :]) / dy
+    u[:, 0] = 0.0
+    u[:, -1] = 0.0
+    v[0, :] = 0.0
+    v[-1, :] = 0.0
+    u[-1, :] = u_top
+    state["p"] = p
+
+
+def kernel_step(ws, colors, dt, Re, sweeps, omega=1.8, u_top=1.0):
+    """预分配工作区内核的单步写法。"""
+    dx2, dy2 = ws.dx ** 2, ws.dy ** 2
+    predict(ws, dt, 1.0 / Re, u_top)
+    ppe_source(ws, dt)
+    for _ in range(sweeps):
+        rb_sweep(ws.p_pad, colors, dx2, dy2, omega)
+    ws.p -= ws.p.mean()
+    project(ws, dt, u_top)
+
+
+def _measure(step, n_steps):
+    step()  # 预热
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for _ in range(n_steps):
+        step()
+    elapsed = time.perf_counter() - t0
+    return n_steps / elapsed, (peak - base) / 1024.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="时间步内核微基准")
+    parser.add_argument("--grids", type=int, nargs="+", default=[60, 200, 400])
+    parser.add_argument("--sweeps", type=int, default=20, help="每步红黑 SOR 扫描次数")
+    parser.add_argument("--steps", type=int, default=None, help="计时步数（默认按网格自动选择）")
+    args = parser.parse_args(argv)
+
+    Re = 100.0
+    print(f"{'grid':>8} {'legacy steps/s':>15} {'kernel steps/s':>15} {'speedup':>8} "
+          f"{'legacy KiB/step':>16} {'kernel KiB/step':>16}")
+    for n in args.grids:
+        dx = dy = 1.0 / n
+        dt = 0.5 * min(dx, 0.25 * Re * dx ** 2)  # 取稳定步长的一半，避免计时期间发散
+        n_steps = args.steps or max(5, int(2e6 / (n * n)))
+
+        state = _legacy_state(n, n)
+        legacy_rate, legacy_kib = _measure(
+            lambda: legacy_step(state, dx, dy, dt, Re, args.sweeps), n_steps)
+
+        ws = MACWorkspace(n, n, dx, dy)
+        colors = red_black_views(ws.p_pad, ws.b)
+        kernel_rate, kernel_kib = _measure(
+            lambda: kernel_step(ws, colors, dt, Re, args.sweeps), n_steps)
+
+        print(f"{n:>4}x{n:<3} {legacy_rate:>15.1f} {kernel_rate:>15.1f} {kernel_rate / legacy_rate:>7.2f}x "
+              f"{legacy_kib:>16.1f} {kernel_kib:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
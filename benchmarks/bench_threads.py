@@ -0,0 +1,60 @@
+"""
+多线程行带内核的强扩展性基准 (NumPy 后端)。
+
+用法 (在仓库根目录):
+    python -m benchmarks.bench_threads [--grids 400 800] [--threads 1 2 4 8 16] [--sweeps 20]
+
+固定网格规模，逐个线程数运行相同的时间步（预测步 + 每步 --sweeps 次红黑 SOR 扫描 +
+速度修正），报告 steps/s、相对单线程的加速比与并行效率。
+"""
+import argparse
+import os
+import time
+
+from core.kernels import MACWorkspace, ppe_source, predict, project, row_bands
+from core.pressure import rb_sweep, red_black_views
+
+
+def _step(ws, colors, dt, Re, sweeps, omega=1.8, u_top=1.0):
+    dx2, dy2 = ws.dx ** 2, ws.dy ** 2
+    predict(ws, dt, 1.0 / Re, u_top)
+    ppe_source(ws, dt)
+    for _ in range(sweeps):
+        rb_sweep(ws.p_pad, colors, dx2, dy2, omega, pool=ws.pool)
+    ws.p -= ws.p.mean()
+    project(ws, dt, u_top)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多线程行带内核强扩展性基准")
+    parser.add_argument("--grids", type=int, nargs="+", default=[400, 800])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--sweeps", type=int, default=20, help="每步红黑 SOR 扫描次数")
+    parser.add_argument("--steps", type=int, default=10, help="每个配置的计时步数")
+    args = parser.parse_args(argv)
+
+    Re = 100.0
+    print(f"CPU 核数: {os.cpu_count()}")
+    print(f"{'grid':>8} {'threads':>8} {'steps/s':>10} {'speedup':>8} {'efficiency':>11}")
+    for n in args.grids:
+        dx = dy = 1.0 / n
+        dt = 0.5 * min(dx, 0.25 * Re * dx ** 2)
+        base_rate = None
+        for threads in args.threads:
+            ws = MACWorkspace(n, n, dx, dy, threads=threads)
+            colors = red_black_views(ws.p_pad, ws.b, bands=row_bands(n, threads))
+            _step(ws, colors, dt, Re, args.sweeps)  # 预热（含线程池启动）
+
+            t0 = time.perf_counter()
+            for _ in range(args.steps):
+                _step(ws, colors, dt, Re, args.sweeps)
+            rate = args.steps / (time.perf_counter() - t0)
+
+            if base_rate is None:
+                base_rate = rate
+            speedup = rate / base_rate
+            print(f"{n:>4}x{n:<3} {threads:>8} {rate:>10.2f} {speedup:>7.2f}x {speedup / threads:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
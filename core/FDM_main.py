@@ -1,13 +1,19 @@
+"""
+交互式入口：逐项询问参数后求解并绘图。在仓库根目录以 python -m core.FDM_main 运行。
+
+批处理 / 无显示器环境请使用无交互的命令行 python -m core（见 core.cli）。
+"""
 import matplotlib.pyplot as plt
 import numpy as np
-# 设置支持中文的字体
-plt.rcParams['font.sans-serif'] = ['Microsoft YaHei']  # 用于正常显示中文标签
+# 中文字体：按顺序取第一个已安装的字体（Windows / macOS / Linux 常见中文字体），都没有时退回 DejaVu Sans
+plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'PingFang SC', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei',
+                                   'SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False  # 用于正常显示负号
 
 # 方腔计算函数：包括边界条件，时间迭代，求解压力方程，修正步，速度边界条件
-from solver import lid_driven_cavity_mac
-from center_line import zxpm
-from plot_flow import plot_results
+from core.solver import lid_driven_cavity_mac
+from viz.center_line import zxpm
+from viz.plot_flow import plot_results
 
 def get_input(prompt, type_func, default=None):
     while True:
@@ -73,10 +79,10 @@ else:
     save_interval = None  # 只保存最后一帧
 
 # 5. 求解器设置
-print("\n可用压力求解器: jacobi, gauss_seidel, sor")
+print("\n可用压力求解器: jacobi, gauss_seidel, sor, multigrid, pcg, direct, fft")
 while True:
-    pressure_solver = get_input("请选择压力求解器", str, default="sor").lower()
-    if pressure_solver in ["jacobi", "gauss_seidel", "sor"]:
+    pressure_solver = get_input("请选择压力求解器", str, default="fft").lower()
+    if pressure_solver in ["jacobi", "gauss_seidel", "sor", "multigrid", "pcg", "direct", "fft"]:
         break
     print("无效的选择，请重新输入。")
 
@@ -100,13 +106,9 @@ u_list, v_list, p_list = lid_driven_cavity_mac(
 
 # 1. 生成精确的网格坐标
 # x_face: (nx+1,)  网格面坐标 (0, dx, 2dx, ..., Lx)
-# x_center: (nx,)  网格中心坐标 (dx/2, 3dx/2, ...)
 x_face = np.linspace(0, Lx, nx + 1)
 y_face = np.linspace(0, Ly, ny + 1)
 
-x_center = (x_face[:-1] + x_face[1:]) / 2.0
-y_center = (y_face[:-1] + y_face[1:]) / 2.0
-
 # 2. 获取最后一步的结果
 u_final = u_list[-1]  # (ny, nx+1)
 v_final = v_list[-1]  # (ny+1, nx)
@@ -114,7 +116,7 @@ p_final = p_list[-1]  # (ny, nx)
 
 # 3. 调用中心剖面绘图函数
 print("\n正在绘制中心剖面对比图...")
-zxpm(u_final, v_final, x_face, y_face, x_center, y_center, Re)
+zxpm(u_final, v_final, x_face, y_face, Re)
 
 # 4. 绘制综合结果图 (u, v, p, Streamlines)
 print("正在绘制综合结果图...")
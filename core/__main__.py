@@ -0,0 +1,6 @@
+"""python -m core：无交互命令行入口（见 core.cli）。"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
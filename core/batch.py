@@ -0,0 +1,441 @@
+"""
+批量求解：同一网格上的 B 个算例沿前导轴堆叠，由同一组 NumPy 模板运算同时推进。
+
+场数组在 kernels.MACWorkspace 的布局前多一个批量轴，如 u_pad 为 (B, ny+2, nx+1)；
+切片只作用于最后两个轴，因此预测步直接复用 kernels._predict_u / _predict_v。
+逐算例的 dt 与 1/Re 以 (B, 1, 1) 数组参与运算并沿批量轴广播，PPE 的 DCT 变换或
+稀疏 LU 回代也沿批量轴一次完成。小网格上每个 ufunc 调用的固定开销与计算量相当，
+B 个算例共用一次调用即可摊薄这部分开销。批量按块 (chunk) 推进，每块依次完成整个时间步，
+块的大小使其工作数组留在缓存中；大网格上每块只含少数算例，吞吐量与逐个求解持平。
+
+每个算例独立判断收敛：检查步上逐算例计算相对速度变化，已收敛（或发散）的算例写出
+最终场并从工作区中移除（压缩批量轴），其余算例继续推进，已冻结的算例不再占用计算量。
+"""
+import numpy as np
+from scipy.fft import dctn, idctn
+
+from .kernels import _predict_u, _predict_v, apply_velocity_ghosts, momentum_views
+from .pressure import dct_eigenvalues, direct_factor
+from .progress import make_progress
+from .schemes import DIFFUSION_FACTOR, RK3_STAGES
+from .solver import DT_GROWTH
+
+# 批量引擎支持的压力求解器与时间推进格式（auto 选 fft）
+BATCH_SOLVERS = ("fft", "direct")
+BATCH_SCHEMES = ("euler", "rk3")
+
+# 自动分块时每块的单元数上限：一块的全部工作数组约为 L2 缓存大小，整个时间步在缓存内完成
+CHUNK_CELLS = 2 ** 15
+
+
+class BatchWorkspace:
+    """
+    批量 MAC 工作区：与 kernels.MACWorkspace 相同的持久化数组，每个数组多一个前导批量轴。
+
+        u_pad: (B, ny+2, nx+1)，v_pad: (B, ny+1, nx+2)，p_pad: (B, ny+2, nx+2)
+    u / v / p 为其内部视图。rk3=True 时另保存时间步开始时的内部速度 (u_n / v_n)。
+    """
+
+    def __init__(self, batch, nx, ny, dx, dy, dtype=np.float64, rk3=False):
+        self.batch = batch
+        self.nx, self.ny = nx, ny
+        self.dx, self.dy = dx, dy
+        self.dtype = np.dtype(dtype)
+        self.rk3 = rk3
+
+        self.u_pad = np.zeros((batch, ny + 2, nx + 1), dtype=dtype)
+        self.v_pad = np.zeros((batch, ny + 1, nx + 2), dtype=dtype)
+        self.p_pad = np.zeros((batch, ny + 2, nx + 2), dtype=dtype)
+        self.u = self.u_pad[:, 1:-1, :]
+        self.v = self.v_pad[:, :, 1:-1]
+        self.p = self.p_pad[:, 1:-1, 1:-1]
+
+        self.u_star = np.zeros((batch, ny, nx + 1), dtype=dtype)
+        self.v_star = np.zeros((batch, ny + 1, nx), dtype=dtype)
+        self.b = np.zeros((batch, ny, nx), dtype=dtype)
+
+        self.u_old = np.zeros_like(self.u)
+        self.v_old = np.zeros_like(self.v)
+
+        self.tu = [np.empty((batch, ny, nx - 1), dtype=dtype) for _ in range(4)]
+        self.tv = [np.empty((batch, ny - 1, nx), dtype=dtype) for _ in range(4)]
+        self.tp = np.empty((batch, ny, nx), dtype=dtype)
+        if rk3:
+            self.u_n = np.empty((batch, ny, nx - 1), dtype=dtype)
+            self.v_n = np.empty((batch, ny - 1, nx), dtype=dtype)
+
+        # 整个批量作为一个“行带”：(视图, 输出, 临时数组)
+        u_views, v_views = momentum_views(self.u_pad, self.v_pad)
+        self.u_band = u_views + (self.u_star[:, :, 1:-1],) + tuple(self.tu)
+        self.v_band = v_views + (self.v_star[:, 1:-1, :],) + tuple(self.tv)
+
+    def fields(self):
+        """带 ghost cells 的场数组 (u_pad, v_pad, p_pad)。"""
+        return self.u_pad, self.v_pad, self.p_pad
+
+
+def chunk_size(nx, ny, chunk=None):
+    """每块的算例数：chunk 为 None 时按 CHUNK_CELLS 自动选取（至少 1）。"""
+    if chunk is None:
+        return max(1, CHUNK_CELLS // (nx * ny))
+    try:
+        chunk = int(chunk)
+    except (TypeError, ValueError):
+        raise ValueError("chunk 必须是 None 或正整数")
+    if chunk <= 0:
+        raise ValueError("chunk 必须是 None 或正整数")
+    return chunk
+
+
+def split_batch(fields, size, nx, ny, dx, dy, dtype=np.float64, rk3=False):
+    """
+    把带批量轴的 (u_pad, v_pad, p_pad) 按每块 size 个算例切分为若干 BatchWorkspace。
+
+    返回 [(ws, start, stop), ...]，start:stop 为该块在批量轴上的范围。
+    """
+    total = fields[0].shape[0]
+    chunks = []
+    for start in range(0, total, size):
+        stop = min(start + size, total)
+        ws = BatchWorkspace(stop - start, nx, ny, dx, dy, dtype=dtype, rk3=rk3)
+        for dst, src in zip(ws.fields(), fields):
+            np.copyto(dst, src[start:stop])
+        chunks.append((ws, start, stop))
+    return chunks
+
+
+def predict(ws, dt, inv_Re, u_top):
+    """预测步：dt / inv_Re 为 (B, 1, 1) 的逐算例系数，结果写入 ws.u_star / ws.v_star。"""
+    apply_velocity_ghosts(ws, u_top)
+    _predict_u(*ws.u_band, ws.dx, ws.dy, dt, inv_Re)
+    _predict_v(*ws.v_band, ws.dx, ws.dy, dt, inv_Re)
+
+
+def ppe_source(ws, dt):
+    """PPE 源项 b = div(u*) / dt，逐算例投影到零均值子空间。"""
+    b, tmp = ws.b, ws.tp
+    u_star, v_star = ws.u_star, ws.v_star
+    np.subtract(u_star[:, :, 1:], u_star[:, :, :-1], out=b)
+    b *= 1.0 / (ws.dx * dt)
+    np.subtract(v_star[:, 1:, :], v_star[:, :-1, :], out=tmp)
+    tmp *= 1.0 / (ws.dy * dt)
+    b += tmp
+    b -= b.mean(axis=(1, 2), keepdims=True)
+    return b
+
+
+def solve_pressure(ws, b, solver):
+    """沿批量轴一次求解全部算例的 PPE，结果写入 ws.p 并逐算例归一化为零均值。"""
+    nx, ny, p = ws.nx, ws.ny, ws.p
+    if solver == "fft":
+        b_hat = dctn(b, type=2, norm="ortho", axes=(1, 2))
+        b_hat /= dct_eigenvalues(nx, ny, ws.dx, ws.dy)
+        b_hat[:, 0, 0] = 0.0  # 去掉常数模态
+        np.copyto(p, idctn(b_hat, type=2, norm="ortho", axes=(1, 2)))
+    else:
+        # 缓存的 LU 分解以 (N, B) 矩阵为多右端项一次回代（钉住 p[0, 0]，同 solve_direct）
+        rhs = b.reshape(ws.batch, -1).T.astype(np.float64)
+        rhs[0] = 0.0
+        np.copyto(p, direct_factor(nx, ny, ws.dx, ws.dy)(rhs).T.reshape(ws.batch, ny, nx))
+    p -= p.mean(axis=(1, 2), keepdims=True)
+
+
+def project(ws, dt, u_top):
+    """速度修正：u = u* - dt * grad(p)，并强制壁面与顶盖边界条件。"""
+    u, v, p = ws.u, ws.v, ws.p
+    gx = ws.tu[0]
+    gy = ws.tv[0]
+
+    np.subtract(p[:, :, 1:], p[:, :, :-1], out=gx)
+    gx *= dt / ws.dx
+    np.subtract(ws.u_star[:, :, 1:-1], gx, out=u[:, :, 1:-1])
+
+    np.subtract(p[:, 1:, :], p[:, :-1, :], out=gy)
+    gy *= dt / ws.dy
+    np.subtract(ws.v_star[:, 1:-1, :], gy, out=v[:, 1:-1, :])
+
+    u[:, :, 0] = 0.0
+    u[:, :, -1] = 0.0
+    v[:, 0, :] = 0.0
+    v[:, -1, :] = 0.0
+    u[:, -1, :] = u_top  # 恢复驱动速度
+
+
+def stable_dt(ws, Re):
+    """逐算例的稳定时间步长上限 (dt_cfl, dt_diff)，均为 (B,) 数组，定义同 kernels.stable_dt。"""
+    u_max = np.abs(ws.u).max(axis=(1, 2)).astype(np.float64)
+    v_max = np.abs(ws.v).max(axis=(1, 2)).astype(np.float64)
+    rate = u_max / ws.dx + v_max / ws.dy
+    with np.errstate(divide="ignore"):
+        dt_cfl = np.where(rate > 0, 1.0 / rate, np.inf)
+    dt_diff = 0.25 * Re * min(ws.dx, ws.dy) ** 2
+    return dt_cfl, dt_diff
+
+
+def velocity_change(ws):
+    """逐算例的相对速度变化 (err_u, err_v)，与 ws.u_old / ws.v_old 比较（差值写回二者）。"""
+    err = []
+    for cur, old in ((ws.u, ws.u_old), (ws.v, ws.v_old)):
+        old_norm = np.linalg.norm(old, axis=(1, 2))
+        np.subtract(cur, old, out=old)
+        err.append(np.linalg.norm(old, axis=(1, 2)) / (old_norm + 1e-12))
+    return err[0], err[1]
+
+
+def _batch_field(value, batch, shape, name):
+    """初始场：单个算例的形状 shape（全部算例共用）或 (batch,) + shape；None 时返回 None。"""
+    if value is None:
+        return None
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.shape not in (shape, (batch,) + shape):
+        raise ValueError(f"{name} 的形状应为 {shape} 或 {(batch,) + shape}，实际为 {arr.shape}")
+    if not np.all(np.isfinite(arr)):
+        raise ValueError(f"{name} 含有 inf 或 nan")
+    return arr
+
+
+def lid_driven_cavity_batch(
+        Re, nx=60, ny=60, max_iter=20000, dt=0.001, Vtol=1e-6,
+        pressure_solver="auto", time_scheme="euler",
+        dt_every=50, dt_safety=0.8, check_every=100,
+        u0=None, v0=None, p0=None, dtype=np.float64, chunk=None,
+        progress="auto", progress_every=None, on_progress=None, should_cancel=None,
+        return_info=False,
+):
+    """
+    在同一网格上批量求解 B 个顶盖驱动方腔流算例（B = len(Re)）。
+
+    离散格式与 lid_driven_cavity_mac 的均匀网格 numpy 后端相同，单个算例的结果与逐个调用
+    lid_driven_cavity_mac 在舍入误差内一致。
+
+    参数:
+        Re: 各算例的 Reynolds 数序列。
+        dt: 时间步长。一个正数为全部算例共用；长度为 B 的序列为逐算例步长；
+            "auto" 时各算例独立做自适应时间步长（规则同 lid_driven_cavity_mac 的 dt="auto"，
+            每 dt_every 步按各自的 CFL / 扩散限制更新）。
+        Vtol: 速度场收敛容差。每 check_every 步逐算例检查相对速度变化，收敛或发散的算例
+            立即冻结并移出批量，其余算例继续推进，直到全部冻结或达到 max_iter。
+        pressure_solver: 'auto' (= 'fft')、'fft' 或 'direct'，沿批量轴一次求解全部算例。
+        time_scheme: 'euler' 或 'rk3'。
+        u0, v0, p0: 初始场，单个算例的形状 (ny, nx+1) / (ny+1, nx) / (ny, nx)（全部算例共用），
+            或带批量轴的 (B, ny, nx+1) 等。
+        dtype: 场与工作数组的浮点类型，np.float64（默认）或 np.float32。
+        chunk: 每块的算例数。批量按块推进，每块依次完成整个时间步；None 时按 CHUNK_CELLS
+            自动选取，使一块的工作数组留在缓存中（小网格一块容纳多个算例，大网格退化为逐个推进）。
+        progress, progress_every, on_progress, should_cancel: 进度显示与停止请求，同 lid_driven_cavity_mac；
+            stats 中的 active 为仍在推进的算例数。停止时未冻结的算例返回当前场。
+
+    返回:
+        (u, v, p)：各算例的最终场，形状 (B, ny, nx+1) / (B, ny+1, nx) / (B, ny, nx)，float64。
+        return_info=True 时另返回 info：
+            Re: 各算例的 Reynolds 数；converged / diverged: (B,) 布尔数组；
+            converged_step / diverged_step: 各算例的步数列表（未发生时为 None）；
+            steps: 各算例实际推进的步数；dt: 各算例最后的时间步长；
+            dt_history: 各算例的 [(步数, dt), ...]；max_iter: 最大步数；
+            canceled_step: 被停止时的步数（未停止时为 None）。
+    """
+    Re = np.atleast_1d(np.asarray(Re, dtype=np.float64))
+    if Re.ndim != 1 or Re.size == 0:
+        raise ValueError("Re 必须是非空的一维序列")
+    if np.any(Re <= 0):
+        raise ValueError("Reynolds 数必须为正")
+    batch = Re.size
+
+    if pressure_solver == "auto":
+        pressure_solver = "fft"
+    if pressure_solver not in BATCH_SOLVERS:
+        raise ValueError(f"批量求解不支持压力求解器 {pressure_solver}（可用: {', '.join(BATCH_SOLVERS)}）")
+    if time_scheme not in BATCH_SCHEMES:
+        raise ValueError(f"批量求解不支持时间推进格式 {time_scheme}（可用: {', '.join(BATCH_SCHEMES)}）")
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float64, np.float32):
+        raise ValueError(f"不支持的浮点类型: {dtype}")
+    try:
+        check_every = int(check_every)
+    except (TypeError, ValueError):
+        raise ValueError("check_every 必须是正整数")
+    if check_every <= 0:
+        raise ValueError("check_every 必须是正整数")
+
+    size = chunk_size(nx, ny, chunk)
+    rk3 = time_scheme == "rk3"
+    dx, dy = 1.0 / nx, 1.0 / ny
+    initial = (np.zeros((batch, ny + 2, nx + 1)), np.zeros((batch, ny + 1, nx + 2)),
+               np.zeros((batch, ny + 2, nx + 2)))
+    for field, value, name in ((initial[0][:, 1:-1, :], u0, "u0"), (initial[1][:, :, 1:-1], v0, "v0"),
+                               (initial[2][:, 1:-1, 1:-1], p0, "p0")):
+        value = _batch_field(value, batch, field.shape[1:], name)
+        if value is not None:
+            np.copyto(field, value)
+    chunks = split_batch(initial, size, nx, ny, dx, dy, dtype=dtype, rk3=rk3)
+
+    # 顶盖速度估计的稳定步长（同 lid_driven_cavity_mac）
+    dt_cfl = min(dx, dy)
+    dt_diff = 0.25 * Re * min(dx, dy) ** 2 * DIFFUSION_FACTOR[time_scheme]
+    dt_recommended = np.minimum(dt_cfl, dt_diff)
+
+    dt_auto = isinstance(dt, str)
+    if dt_auto:
+        if dt != "auto":
+            raise ValueError("dt 必须是正数、逐算例序列或 \"auto\"")
+        try:
+            dt_every = int(dt_every)
+        except (TypeError, ValueError):
+            raise ValueError("dt_every 必须是正整数")
+        if dt_every <= 0:
+            raise ValueError("dt_every 必须是正整数")
+        if not 0.0 < dt_safety <= 1.0:
+            raise ValueError("dt_safety 必须在 (0, 1] 内")
+        dt = dt_safety * dt_recommended
+    else:
+        dt = np.asarray(dt, dtype=np.float64)
+        if dt.ndim > 1 or dt.size not in (1, batch):
+            raise ValueError(f"dt 必须是正数或长度为 {batch} 的序列")
+        dt = np.broadcast_to(dt.ravel(), (batch,)).copy()
+        if np.any(dt <= 0):
+            raise ValueError("dt 必须为正")
+        unstable = np.flatnonzero(dt > dt_recommended)
+        if unstable.size:
+            print(f"警告: 算例 {', '.join(map(str, unstable))} 的 dt 可能导致不稳定！建议减小 dt。")
+    dt_history = [[(0, float(t))] for t in dt]
+
+    u_top = 1.0
+    active = np.arange(batch)  # 工作区中各算例的原始编号
+
+    def coeffs():
+        """当前活动算例的 (dt, 1/Re) 系数，形状 (B_active, 1, 1)。"""
+        return (dt[active].astype(dtype)[:, None, None],
+                (1.0 / Re[active]).astype(dtype)[:, None, None])
+
+    dt_c, inv_Re_c = coeffs()
+
+    def pressure_step(ws, dt_k):
+        b = ppe_source(ws, dt_k)
+        solve_pressure(ws, b, pressure_solver)
+        project(ws, dt_k, u_top)
+
+    def time_step(ws, dt_k, inv_Re_k):
+        if rk3:
+            np.copyto(ws.u_n, ws.u[:, :, 1:-1])
+            np.copyto(ws.v_n, ws.v[:, 1:-1, :])
+            for a_k, b_k in RK3_STAGES:
+                predict(ws, dt_k, inv_Re_k, u_top)
+                if a_k != 0.0:
+                    for x_star, x_n, tmp in ((ws.u_star[:, :, 1:-1], ws.u_n, ws.tu[0]),
+                                             (ws.v_star[:, 1:-1, :], ws.v_n, ws.tv[0])):
+                        x_star *= b_k
+                        np.multiply(x_n, a_k, out=tmp)
+                        x_star += tmp
+                pressure_step(ws, b_k * dt_k)
+            return
+        predict(ws, dt_k, inv_Re_k, u_top)
+        pressure_step(ws, dt_k)
+
+    u_out = np.zeros((batch, ny, nx + 1))
+    v_out = np.zeros((batch, ny + 1, nx))
+    p_out = np.zeros((batch, ny, nx))
+    converged_step = [None] * batch
+    diverged_step = [None] * batch
+
+    def freeze(mask):
+        """写出 mask（按当前活动算例排列）选中算例的最终场。"""
+        for ws, start, stop in chunks:
+            for k in np.flatnonzero(mask[start:stop]):
+                case = active[start + k]
+                u_out[case], v_out[case], p_out[case] = ws.u[k], ws.v[k], ws.p[k]
+
+    sink = make_progress(progress, progress_every, on_progress, should_cancel)
+    every = sink.every
+    canceled_step = None
+    last_step = 0
+
+    print(f"开始批量计算: {batch} 个算例 (每块 {min(size, batch)} 个), Grid={nx}x{ny}, "
+          f"Solver={pressure_solver}, Scheme={time_scheme}, Precision={dtype.name}")
+
+    sink.start(0, max_iter)
+    for n in range(max_iter):
+        last_step = n + 1
+        check_step = (n % check_every == 0)
+
+        if dt_auto and n > 0 and n % dt_every == 0:
+            limits = [stable_dt(ws, Re[active[start:stop]]) for ws, start, stop in chunks]
+            dt_cfl_live, dt_diff_live = (np.concatenate(x) for x in zip(*limits))
+            dt_limit = np.minimum(dt_cfl_live, DIFFUSION_FACTOR[time_scheme] * dt_diff_live)
+            dt_new = np.minimum(dt_safety * dt_limit, DT_GROWTH * dt[active])
+            changed = dt_new != dt[active]
+            for case, value in zip(active[changed], dt_new[changed]):
+                dt_history[case].append((n, float(value)))
+            dt[active] = dt_new
+            dt_c, inv_Re_c = coeffs()
+
+        # 逐块推进一个完整时间步，块内的工作数组在整个时间步中留在缓存里
+        errors = []
+        for ws, start, stop in chunks:
+            if check_step:
+                np.copyto(ws.u_old, ws.u)
+                np.copyto(ws.v_old, ws.v)
+            time_step(ws, dt_c[start:stop], inv_Re_c[start:stop])
+            if check_step:
+                errors.append(velocity_change(ws))
+
+        if check_step:
+            err_u = np.concatenate([e[0] for e in errors])
+            err_v = np.concatenate([e[1] for e in errors])
+            diverged = ~(np.isfinite(err_u) & np.isfinite(err_v))
+            converged = ~diverged & (err_u < Vtol) & (err_v < Vtol)
+            done = diverged | converged
+            if done.any():
+                for k in np.flatnonzero(done):
+                    case = active[k]
+                    if diverged[k]:
+                        diverged_step[case] = n + 1
+                        print(f"算例 {case} (Re={Re[case]:g}) 发散于第 {n + 1} 步，请减小 dt。")
+                    else:
+                        converged_step[case] = n + 1
+                        print(f"算例 {case} (Re={Re[case]:g}) 收敛于第 {n + 1} 步 "
+                              f"(Error: {max(err_u[k], err_v[k]):.2e})")
+                freeze(done)
+                # 冻结的算例移出批量，其余算例重新分块
+                keep = ~done
+                if not keep.any():
+                    active = active[keep]
+                    break
+                fields = [np.concatenate(arrays)[keep] for arrays in zip(*(ws.fields() for ws, _, _ in chunks))]
+                active = active[keep]
+                chunks = split_batch(fields, size, nx, ny, dx, dy, dtype=dtype, rk3=rk3)
+                dt_c, inv_Re_c = coeffs()
+
+        if every is not None and (n + 1) % every == 0:
+            sink.on_progress(n + 1, {"phase": "march", "total": max_iter, "active": int(active.size)})
+            if sink.should_cancel():
+                canceled_step = n + 1
+                break
+    else:
+        print(f"达到最大迭代次数 {max_iter}，{active.size} 个算例未完全收敛。")
+
+    if active.size:
+        freeze(np.ones(active.size, dtype=bool))
+
+    if canceled_step is not None:
+        sink.finish(canceled_step, "canceled")
+    elif active.size:
+        sink.finish(last_step, "max_iter")
+    else:
+        sink.finish(last_step, "diverged" if any(s is not None for s in diverged_step) else "converged")
+
+    if return_info:
+        steps = [converged_step[i] or diverged_step[i] or canceled_step or int(max_iter) for i in range(batch)]
+        info = {
+            "Re": Re,
+            "converged": np.array([s is not None for s in converged_step]),
+            "converged_step": converged_step,
+            "diverged": np.array([s is not None for s in diverged_step]),
+            "diverged_step": diverged_step,
+            "steps": steps,
+            "dt": dt.copy(),
+            "dt_history": dt_history,
+            "max_iter": int(max_iter),
+            "canceled_step": canceled_step,
+        }
+        return u_out, v_out, p_out, info
+    return u_out, v_out, p_out
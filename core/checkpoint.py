@@ -0,0 +1,102 @@
+"""
+检查点 (checkpoint) 与断点续算。
+
+检查点为压缩的 .npz 文件，包含继续计算所需的全部状态：
+    u / v / p、已完成的步数 step、当前 dt 与 dt 历史、AB2 环形缓冲区（如有），
+    以及以 JSON 字符串保存的求解参数 params（续算时用于一致性校验）。
+
+写入先写临时文件再 os.replace 替换，任何时刻磁盘上的检查点都是完整的。
+CheckpointWriter 在后台线程中压缩、写盘：时间循环只负责拷贝数组（内存拷贝），
+上一次写入尚未完成时跳过本次检查点，而不是等待。
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def save_checkpoint(path, state):
+    """原子地把 state (数组 / 标量字典) 写入 path。"""
+    path = os.fspath(path)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **state)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """读取检查点，返回数组字典；params 解码为 dict。"""
+    with np.load(path, allow_pickle=False) as data:
+        state = {key: data[key] for key in data.files}
+    state["params"] = json.loads(str(state["params"]))
+    return state
+
+
+def pack_state(u, v, p, step, dt, dt_history, params, ab2=None):
+    """把当前计算状态拷贝为可写入检查点的字典（数组均为副本）。"""
+    state = {
+        "u": u.copy(),
+        "v": v.copy(),
+        "p": p.copy(),
+        "step": np.int64(step),
+        "dt": np.float64(dt),
+        "dt_history": np.array(dt_history, dtype=np.float64).reshape(-1, 2),
+        "params": np.array(json.dumps(params)),
+    }
+    if ab2 is not None:
+        state.update({
+            "ab2_f_u": np.stack(ab2.f_u),
+            "ab2_f_v": np.stack(ab2.f_v),
+            "ab2_k": np.int64(ab2.k),
+            "ab2_dt_prev": np.float64(np.nan if ab2.dt_prev is None else ab2.dt_prev),
+        })
+    return state
+
+
+def restore_ab2(ab2, state):
+    """从检查点恢复 AB2 环形缓冲区。"""
+    if "ab2_f_u" not in state:
+        raise ValueError("检查点中没有 AB2 历史，无法以 time_scheme='ab2' 续算")
+    for dst, src in zip(ab2.f_u + ab2.f_v, list(state["ab2_f_u"]) + list(state["ab2_f_v"])):
+        np.copyto(dst, src)
+    ab2.k = int(state["ab2_k"])
+    dt_prev = float(state["ab2_dt_prev"])
+    ab2.dt_prev = None if np.isnan(dt_prev) else dt_prev
+
+
+class CheckpointWriter:
+    """单线程后台写入器：同一时刻最多一个写入任务。"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self.pending = None
+        self.written = 0
+        self.skipped = 0
+
+    def _check(self):
+        """取回已完成的写入结果；写入失败时报告错误（不中断计算）。"""
+        if self.pending is not None and self.pending.done():
+            err = self.pending.exception()
+            if err is not None:
+                print(f"警告: 检查点写入失败: {err}")
+            else:
+                self.written += 1
+            self.pending = None
+
+    def submit(self, state):
+        """提交一次写入；上一次尚未完成时跳过并返回 False。"""
+        self._check()
+        if self.pending is not None:
+            self.skipped += 1
+            return False
+        self.pending = self.pool.submit(save_checkpoint, self.path, state)
+        return True
+
+    def close(self):
+        """等待正在进行的写入完成并关闭线程。"""
+        if self.pending is not None:
+            self.pending.exception()
+        self._check()
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,281 @@
+"""
+无交互命令行入口：python -m core [run] / python -m core sweep。
+
+run（默认）求解一个算例：参数来自 --config 指定的 TOML / JSON 文件与命令行选项
+（命令行优先），结果写入输出目录：
+
+    result.json   参数、收敛状态、步数、墙钟时间、steps/s、MLUPS、分阶段耗时、PPE 残差、
+                  Ghia 中心线误差、输出文件列表
+    fields.npz    最终场 u / v / p 与网格坐标（--no-fields 时不写）
+    *.png         综合结果图与中心线对比图（--no-plots 时不画；使用 Agg 后端，不需要显示器）
+
+配置文件的顶层键即 lid_driven_cavity_mac 的参数名，可选的 [output] 表给出
+dir / plots / fields，例如：
+
+    Re = 1000
+    nx = 128
+    ny = 128
+    dt = "auto"
+    time_scheme = "rk3"
+
+    [output]
+    dir = "runs/re1000"
+    plots = false
+
+--json 时把 result.json 的内容输出到 stdout，求解过程的提示信息改到 stderr，
+便于批处理调度器直接解析。退出码：0 正常结束（含未收敛），1 参数错误（配置文件无法读取或
+无效、未知的 --set 键、求解器拒绝的参数），2 命令行语法错误（argparse），3 计算发散。
+
+sweep 子命令转交 core.sweep（参数扫描，见该模块）。
+"""
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .solver import _steps_taken, lid_driven_cavity_mac
+from .validation import ghia_error
+
+# 不能由配置文件 / --set 给出的求解器参数（由 CLI 自身控制）
+_RESERVED = ("return_info", "snapshot_dir", "snapshot_codec", "on_progress", "should_cancel")
+
+# 命令行选项 -> 求解器参数
+_OPTIONS = (
+    ("--re", "Re", float),
+    ("--nx", "nx", int),
+    ("--ny", "ny", int),
+    ("--dt", "dt", None),
+    ("--max-iter", "max_iter", int),
+    ("--vtol", "Vtol", float),
+    ("--ptol", "Ptol", float),
+    ("--solver", "pressure_solver", str),
+    ("--omega", "omega", float),
+    ("--time-scheme", "time_scheme", str),
+    ("--backend", "backend", str),
+    ("--threads", "threads", int),
+    ("--dtype", "dtype", str),
+    ("--grid-stretch", "grid_stretch", str),
+    ("--stretch-factor", "stretch_factor", float),
+    ("--save-interval", "save_interval", int),
+    ("--checkpoint-every", "checkpoint_every", int),
+    ("--checkpoint-path", "checkpoint_path", str),
+    ("--resume-from", "resume_from", str),
+)
+
+
+def solver_parameters():
+    """lid_driven_cavity_mac 可由配置文件给出的参数名。"""
+    names = inspect.signature(lid_driven_cavity_mac).parameters
+    return [name for name in names if name not in _RESERVED]
+
+
+def load_config(path):
+    """读取 TOML (.toml) 或 JSON 配置文件，返回 (求解器参数, 输出设置)。"""
+    with open(path, "rb") as f:
+        if str(path).lower().endswith(".toml"):
+            import tomllib
+            data = tomllib.load(f)
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"配置文件 {path} 的顶层必须是键值表")
+    output = data.pop("output", {}) or {}
+    if not isinstance(output, dict):
+        raise ValueError("配置文件中的 output 必须是表")
+    return data, output
+
+
+def _parse_value(text):
+    """--set 的取值：能按 JSON 解析则用解析结果（数字 / 布尔 / 列表 / null），否则为字符串。"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _parse_dt(text):
+    return text if text == "auto" else float(text)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m core", description="二维顶盖驱动方腔流求解（无交互）",
+        epilog="参数扫描: python -m core sweep --help",
+    )
+    parser.add_argument("--config", help="TOML / JSON 配置文件")
+    group = parser.add_argument_group("求解参数（覆盖配置文件）")
+    for flag, name, kind in _OPTIONS:
+        group.add_argument(flag, dest=name, type=_parse_dt if name == "dt" else kind, default=None)
+    group.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                       help="其他求解器参数，如 --set mg_cycles=10（值按 JSON 解析）")
+    out = parser.add_argument_group("输出")
+    out.add_argument("--out", "-o", dest="out_dir", default=None, help="输出目录（默认 cavity_out）")
+    out.add_argument("--no-plots", dest="plots", action="store_false", default=None, help="不绘图")
+    out.add_argument("--no-fields", dest="fields", action="store_false", default=None, help="不保存 fields.npz")
+    out.add_argument("--json", action="store_true", help="把结果 JSON 输出到 stdout")
+    out.add_argument("--quiet", "-q", action="store_true", help="不输出求解过程信息与进度条")
+    return parser
+
+
+def resolve_settings(args):
+    """合并配置文件与命令行，返回 (求解器参数, 输出设置)；未知参数抛出 ValueError。"""
+    params, output = load_config(args.config) if args.config else ({}, {})
+    for _, name, _ in _OPTIONS:
+        value = getattr(args, name)
+        if value is not None:
+            params[name] = value
+    for item in args.overrides:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"--set 的格式应为 KEY=VALUE: {item}")
+        params[key.strip()] = _parse_value(value.strip())
+
+    unknown = sorted(set(params) - set(solver_parameters()))
+    if unknown:
+        raise ValueError(f"未知的求解器参数: {', '.join(unknown)}")
+    unknown = sorted(set(output) - {"dir", "plots", "fields"})
+    if unknown:
+        raise ValueError(f"output 中有未知的键: {', '.join(unknown)}")
+
+    settings = {
+        "dir": output.get("dir", "cavity_out"),
+        "plots": bool(output.get("plots", True)),
+        "fields": bool(output.get("fields", True)),
+    }
+    for key, value in (("dir", args.out_dir), ("plots", args.plots), ("fields", args.fields)):
+        if value is not None:
+            settings[key] = value
+    return params, settings
+
+
+def save_plots(u, v, p, Re, coords, out_dir):
+    """用 Agg 后端保存综合结果图与中心线对比图，返回文件名列表；未安装 matplotlib 时返回空列表。"""
+    try:
+        import matplotlib
+    except ImportError:
+        print("警告: 未安装 matplotlib，跳过绘图。", file=sys.stderr)
+        return []
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from viz.center_line import zxpm
+    from viz.plot_flow import plot_results
+
+    x_face, y_face = coords["x_face"], coords["y_face"]
+    files = [f"cavity_flow_results_Re{Re:g}.png", f"centerline_Re{Re:g}.png"]
+    plot_results(u, v, p, Re=Re, filename=os.path.join(out_dir, files[0]), x_face=x_face, y_face=y_face)
+    zxpm(u, v, x_face, y_face, Re, filename=os.path.join(out_dir, files[1]))
+    plt.close("all")
+    return files
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return [_jsonable(x) for x in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(x) for k, x in value.items()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def run(params, settings, log=None, progress="tqdm"):
+    """
+    按 params 求解一个算例并写出结果，返回结果字典（即 result.json 的内容）。
+    progress 为默认的进度显示方式（命令行下不检测 Streamlit），params 中给出时以 params 为准。
+    """
+    out_dir = settings["dir"]
+    os.makedirs(out_dir, exist_ok=True)
+    log = log or sys.stdout
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        u_list, v_list, p_list, info = lid_driven_cavity_mac(**{"progress": progress, **params}, return_info=True)
+    wall_time = time.perf_counter() - t0
+    u, v, p = u_list[-1], v_list[-1], p_list[-1]
+    coords = info["coords"]
+
+    steps = _steps_taken(info)
+    if info["converged"]:
+        status = "converged"
+    elif info["diverged"]:
+        status = "diverged"
+    elif info["canceled"]:
+        status = "canceled"
+    else:
+        status = "max_iter"
+    Re = float(params.get("Re", inspect.signature(lid_driven_cavity_mac).parameters["Re"].default))
+
+    files = []
+    if settings["fields"]:
+        np.savez_compressed(os.path.join(out_dir, "fields.npz"), u=u, v=v, p=p, **coords)
+        files.append("fields.npz")
+    if settings["plots"] and status != "diverged":
+        with contextlib.redirect_stdout(log):
+            files += save_plots(u, v, p, Re, coords, out_dir)
+
+    result = {
+        "params": params,
+        "status": status,
+        "converged": info["converged"],
+        "converged_step": info["converged_step"],
+        "diverged_step": info["diverged_step"],
+        "steps": steps,
+        "wall_time": wall_time,
+        "steps_per_s": steps / wall_time if wall_time > 0 else None,
+        "final_dt": info["dt_history"][-1][1],
+        "ghia_error": ghia_error(u, v, Re, coords["x_face"], coords["y_face"]) if status != "diverged" else None,
+        "files": files + ["result.json"],
+    }
+    for key in ("mlups", "ppe_residual", "timings", "newton_iterations", "levels", "resumed_from_step",
+                "checkpoints_written"):
+        if info.get(key) is not None:
+            result[key] = info[key]
+    result = _jsonable(result)
+    with open(os.path.join(out_dir, "result.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "sweep":
+        from .sweep import main as sweep_main
+        return sweep_main(argv[1:])
+    if argv and argv[0] == "run":
+        argv = argv[1:]
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        params, settings = resolve_settings(args)
+    except (OSError, ValueError) as exc:
+        print(f"错误: {exc}", file=sys.stderr)
+        return 1
+
+    # --json 时 stdout 只输出结果；求解过程的信息改到 stderr（--quiet 时丢弃）
+    log = open(os.devnull, "w") if args.quiet else (sys.stderr if args.json else sys.stdout)
+    try:
+        with contextlib.redirect_stderr(log) if args.quiet else contextlib.nullcontext():
+            result = run(params, settings, log=log, progress=None if args.quiet else "tqdm")
+    except ValueError as exc:
+        print(f"错误: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if args.quiet:
+            log.close()
+
+    if args.json:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    elif not args.quiet:
+        print(f"结果已写入 {os.path.abspath(settings['dir'])} ({result['status']}，{result['steps']} 步，"
+              f"{result['wall_time']:.2f} s)")
+    return 3 if result["status"] == "diverged" else 0
@@ -0,0 +1,222 @@
+"""
+快照编码：降精度、时间增量与字节重排压缩。
+
+SnapshotCodec 描述每个场的编码方式，EncodedFrames 是按该方式压缩保存的帧序列
+（与 list 一样支持 len() 与下标访问，下标访问时才解码）。编码流程：
+
+1. 取值
+   - max_abs_error 给出该场的误差上限 eps 时：量化为整数 q = rint(x / (2 eps))，
+     解码 x' = 2 eps q，逐点满足 |x - x'| <= eps（有损，误差有保证）；
+   - 否则按 dtype (float64 / float32 / float16) 存储，float64 为无损，
+     降精度时的实际最大误差在编码时逐帧统计。
+2. 时间增量 (delta=True)
+   相对上一帧编码：量化整数取差值，浮点数取位模式的异或 (XOR)。两者都是精确可逆的，
+   误差不会随帧数累积；每 keyframe_interval 帧存一个完整关键帧，限制随机访问的解码长度。
+3. 字节重排 + 压缩
+   把每个元素的第 k 个字节排在一起 (byte shuffle)，使高位字节的长串相同值连续出现，
+   再用 zlib 或 lzma 压缩（compression=None 时只做前两步）。
+"""
+import lzma
+import zlib
+
+import numpy as np
+
+_FIELDS = ("u", "v", "p")
+_FLOAT_DTYPES = {"float64": np.float64, "float32": np.float32, "float16": np.float16}
+_UINT_OF = {2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+def _shuffle(arr):
+    b = arr.view(np.uint8).reshape(-1, arr.dtype.itemsize)
+    return np.ascontiguousarray(b.T).tobytes()
+
+
+def _unshuffle(data, dtype, count):
+    itemsize = np.dtype(dtype).itemsize
+    b = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, count)
+    return np.ascontiguousarray(b.T).view(dtype).reshape(count)
+
+
+class SnapshotCodec:
+    """
+    快照编码参数。
+
+    参数:
+        dtype: 'float64' / 'float32' / 'float16'，未设定误差上限的场的存储精度。
+        delta: 是否做相邻帧的时间增量编码。
+        compression: None、'zlib' 或 'lzma'。
+        level: 压缩等级 (zlib 1-9，lzma 0-9)。
+        max_abs_error: 误差上限。None 表示不量化；一个数表示所有场共用；
+                       字典 {'u': eps_u, 'v': eps_v, 'p': eps_p} 可按场分别给出（缺省的场不量化）。
+        keyframe_interval: delta 编码时每隔多少帧存一个完整关键帧。
+    """
+
+    def __init__(self, dtype="float32", delta=True, compression="zlib", level=6,
+                 max_abs_error=None, keyframe_interval=16):
+        if dtype not in _FLOAT_DTYPES:
+            raise ValueError(f"不支持的快照精度: {dtype}")
+        if compression not in (None, "zlib", "lzma"):
+            raise ValueError(f"不支持的压缩方式: {compression}")
+        if isinstance(max_abs_error, dict):
+            unknown = set(max_abs_error) - set(_FIELDS)
+            if unknown:
+                raise ValueError(f"max_abs_error 中有未知的场: {', '.join(sorted(unknown))}")
+            eps = {name: max_abs_error.get(name) for name in _FIELDS}
+        else:
+            eps = {name: max_abs_error for name in _FIELDS}
+        for name, value in eps.items():
+            if value is not None and not value > 0:
+                raise ValueError(f"{name} 的误差上限必须为正数")
+        if int(keyframe_interval) <= 0:
+            raise ValueError("keyframe_interval 必须是正整数")
+
+        self.dtype = dtype
+        self.delta = bool(delta)
+        self.compression = compression
+        self.level = int(level)
+        self.max_abs_error = eps
+        self.keyframe_interval = int(keyframe_interval)
+
+    def _compress(self, data):
+        if self.compression == "zlib":
+            return zlib.compress(data, self.level)
+        if self.compression == "lzma":
+            return lzma.compress(data, preset=self.level)
+        return data
+
+    def _decompress(self, data):
+        if self.compression == "zlib":
+            return zlib.decompress(data)
+        if self.compression == "lzma":
+            return lzma.decompress(data)
+        return data
+
+    def new_frames(self, name, shape):
+        """为场 name 创建空的编码帧序列。"""
+        return EncodedFrames(self, name, shape)
+
+
+class EncodedFrames:
+    """单个场的编码帧序列。"""
+
+    def __init__(self, codec, name, shape):
+        self.codec = codec
+        self.name = name
+        self.shape = tuple(shape)
+        self.eps = codec.max_abs_error[name]
+        if self.eps is None:
+            self.dtype = np.dtype(_FLOAT_DTYPES[codec.dtype])
+        else:
+            self.dtype = np.dtype(np.int64)
+        self.frames = []        # 压缩后的字节串
+        self.raw_bytes = 0      # 原始 float64 字节数
+        self.max_error = 0.0    # 编码引入的最大绝对误差
+        self._prev = None       # 上一帧的编码值（整数或浮点数组），供 delta 编码
+        self._cache = (None, None)
+
+    # ---------------- 编码 ----------------
+    def _values(self, field):
+        """场 -> 编码值（量化整数或降精度浮点），同时更新误差统计。"""
+        x = np.asarray(field, dtype=np.float64).ravel()
+        if self.eps is not None:
+            values = np.rint(x / (2.0 * self.eps)).astype(np.int64)
+            decoded = values * (2.0 * self.eps)
+        else:
+            values = x.astype(self.dtype)
+            decoded = values.astype(np.float64)
+        if self.eps is not None or self.dtype != np.float64:
+            self.max_error = max(self.max_error, float(np.abs(decoded - x).max(initial=0.0)))
+        return values
+
+    def _diff(self, cur, prev):
+        if self.eps is not None:
+            return cur - prev
+        uint = _UINT_OF[self.dtype.itemsize]
+        return (cur.view(uint) ^ prev.view(uint)).view(self.dtype)
+
+    def _undiff(self, d, prev):
+        if self.eps is not None:
+            return prev + d
+        uint = _UINT_OF[self.dtype.itemsize]
+        return (d.view(uint) ^ prev.view(uint)).view(self.dtype)
+
+    def _is_key(self, index):
+        return not self.codec.delta or index % self.codec.keyframe_interval == 0
+
+    def append(self, field):
+        values = self._values(field)
+        payload = values if self._is_key(len(self.frames)) else self._diff(values, self._prev)
+        self.frames.append(self.codec._compress(_shuffle(payload)))
+        self.raw_bytes += values.size * 8
+        self._prev = values
+
+    # ---------------- 解码 ----------------
+    def _payload(self, index):
+        count = int(np.prod(self.shape))
+        return _unshuffle(self.codec._decompress(self.frames[index]), self.dtype, count)
+
+    def _decode_values(self, index):
+        cached_index, cached = self._cache
+        if cached_index == index:
+            return cached
+        if self._is_key(index):
+            values = self._payload(index)
+        else:
+            # 从最近的关键帧（或缓存的上一帧）逐帧还原
+            if cached_index is not None and cached_index < index and \
+                    cached_index >= index - index % self.codec.keyframe_interval:
+                start, values = cached_index + 1, cached
+            else:
+                start = index - index % self.codec.keyframe_interval
+                values = self._payload(start)
+                start += 1
+            for k in range(start, index + 1):
+                values = self._undiff(self._payload(k), values)
+        self._cache = (index, values)
+        return values
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("快照下标越界")
+        values = self._decode_values(index)
+        if self.eps is not None:
+            out = values * (2.0 * self.eps)
+        else:
+            out = values.astype(np.float64)
+        return out.reshape(self.shape)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self):
+        """压缩后占用的字节数。"""
+        return sum(len(f) for f in self.frames)
+
+
+def encoded_snapshots(codec, nx, ny):
+    """按 MAC 网格形状为 u / v / p 创建三个编码帧序列。"""
+    shapes = {"u": (ny, nx + 1), "v": (ny + 1, nx), "p": (ny, nx)}
+    return tuple(codec.new_frames(name, shapes[name]) for name in _FIELDS)
+
+
+def snapshot_report(frames):
+    """编码统计：各场的误差上限 / 实际最大误差与整体压缩比。"""
+    raw = sum(f.raw_bytes for f in frames)
+    packed = sum(f.nbytes for f in frames)
+    return {
+        "error_bound": {f.name: f.eps for f in frames},
+        "max_abs_error": {f.name: f.max_error for f in frames},
+        "raw_bytes": raw,
+        "encoded_bytes": packed,
+        "ratio": raw / packed if packed else None,
+    }
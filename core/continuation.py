@@ -0,0 +1,68 @@
+"""
+Reynolds 数延拓 (continuation)。
+
+沿 Re 阶梯 (如 100 -> 400 -> 1000 -> 3200) 依次求解，每一级以上一级的最终场
+(u, v, p) 作为初值。高 Re 下的主涡与角涡结构大部分已在低 Re 解中形成，
+因此各级只需修正差异，比从静止开始计算少得多的时间步。
+"""
+import time
+
+from .solver import _steps_taken, lid_driven_cavity_mac
+
+
+def continuation(re_ladder, nx=60, ny=60, u0=None, v0=None, p0=None,
+                 return_info=False, on_solution=None, **kwargs):
+    """
+    按 re_ladder 依次调用 lid_driven_cavity_mac，返回最后一级的结果。
+
+    参数:
+        re_ladder: Reynolds 数序列，按给定顺序求解。
+        u0, v0, p0: 第一级的初始场（默认全零）。
+        on_solution: 可选回调 on_solution(Re, u, v, p, info)，每级结束后以该级最终场调用，
+                     可用于逐级保存结果或与 Ghia 数据对比。
+        其余参数 (dt、Vtol、pressure_solver、save_interval 等) 原样传给每一级的求解器；
+        save_interval、snapshot_dir 与 snapshot_codec 只作用于最后一级；grid_sequence 只作用于第一级（之后各级已有细网格初值）。
+
+    返回值与 lid_driven_cavity_mac 相同；return_info=True 时 info["ladder"] 给出
+    各级的 Re、步数、耗时与收敛状态。某一级被停止或发散时不再继续后续各级。
+    """
+    re_ladder = [float(Re) for Re in re_ladder]
+    if not re_ladder:
+        raise ValueError("re_ladder 不能为空")
+    if any(Re <= 0 for Re in re_ladder):
+        raise ValueError("re_ladder 中的 Reynolds 数必须为正")
+    save_interval = kwargs.pop("save_interval", None)
+    snapshot_dir = kwargs.pop("snapshot_dir", None)
+    snapshot_codec = kwargs.pop("snapshot_codec", None)
+    grid_sequence = kwargs.pop("grid_sequence", None)
+
+    stats = []
+    state = (u0, v0, p0)
+    for k, Re in enumerate(re_ladder):
+        last = k == len(re_ladder) - 1
+        print(f"=== Re 延拓 {k + 1}/{len(re_ladder)}: Re={Re:g} ===")
+
+        t0 = time.perf_counter()
+        u_list, v_list, p_list, info = lid_driven_cavity_mac(
+            Re=Re, nx=nx, ny=ny, u0=state[0], v0=state[1], p0=state[2],
+            save_interval=save_interval if last else None,
+            snapshot_dir=snapshot_dir if last else None,
+            snapshot_codec=snapshot_codec if last else None,
+            grid_sequence=grid_sequence if k == 0 else None, return_info=True, **kwargs,
+        )
+        stats.append({
+            "Re": Re,
+            "steps": _steps_taken(info),
+            "time": time.perf_counter() - t0,
+            "converged": info["converged"],
+        })
+        state = (u_list[-1], v_list[-1], p_list[-1])
+        if on_solution is not None:
+            on_solution(Re, *state, info)
+        if info["canceled"] or info["diverged"]:
+            break
+
+    info["ladder"] = stats
+    if return_info:
+        return u_list, v_list, p_list, info
+    return u_list, v_list, p_list
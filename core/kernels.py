@@ -0,0 +1,367 @@
+"""
+MAC 网格时间步内核 (NumPy 实现)。
+
+所有场与中间量都保存在 MACWorkspace 的持久化数组中，内核只通过 out= 形式的 ufunc
+和预先构造的切片视图原地计算，时间循环内不再分配新数组。
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy.linalg.lapack import get_lapack_funcs
+
+
+@lru_cache(maxsize=None)
+def thread_pool(threads):
+    """按线程数缓存的持久化线程池，同一进程内的多次计算复用同一组线程。"""
+    return ThreadPoolExecutor(max_workers=threads, thread_name_prefix="cavity")
+
+
+def row_bands(n, parts):
+    """把 n 行尽量均匀地分成 parts 段，返回 [(start, stop), ...]。"""
+    parts = max(1, min(int(parts), n))
+    edges = [n * k // parts for k in range(parts + 1)]
+    return [(edges[k], edges[k + 1]) for k in range(parts)]
+
+
+def momentum_views(u_pad, v_pad):
+    """
+    预测步所需的全部切片视图。
+
+    返回 (u_views, v_views)：u_views 的行方向与 u 的内部面 (ny 行) 对齐，
+    v_views 的行方向与 v 的内部面 (ny-1 行) 对齐，因此按行切片即可得到任意行带的视图。
+    切片只作用于最后两个轴，带前导批量轴的数组 (见 core.batch) 同样适用。
+    """
+    u = u_pad[..., 1:-1, :]
+    v = v_pad[..., :, 1:-1]
+    u_views = (
+        u[..., :, 1:-1],                              # u_c
+        u[..., :, 2:], u[..., :, :-2],                # 东 / 西
+        u_pad[..., 2:, 1:-1], u_pad[..., :-2, 1:-1],  # 北 / 南（含 ghost）
+        v[..., 1:, 1:], v[..., 1:, :-1],              # v 东北 / 西北
+        v[..., :-1, 1:], v[..., :-1, :-1],            # v 东南 / 西南
+    )
+    v_views = (
+        v[..., 1:-1, :],                              # v_c
+        v_pad[..., 1:-1, 2:], v_pad[..., 1:-1, :-2],  # 东 / 西（含 ghost）
+        v[..., 2:, :], v[..., :-2, :],                # 北 / 南
+        u[..., 1:, 1:], u[..., :-1, 1:],              # u 东北 / 东南
+        u[..., 1:, :-1], u[..., :-1, :-1],            # u 西北 / 西南
+    )
+    return u_views, v_views
+
+
+class MACWorkspace:
+    """
+    MAC 网格时间步的持久化工作区。
+
+    场变量存放在带 ghost cells 的数组中，u / v / p 为其内部视图：
+        u_pad: (ny+2, nx+1)，上下各一行 ghost（壁面无滑移 / 顶盖 Dirichlet）
+        v_pad: (ny+1, nx+2)，左右各一列 ghost（壁面无滑移）
+        p_pad: (ny+2, nx+2)，四周 ghost（Neumann）
+    u_star / v_star 的壁面法向分量始终为 0，只在初始化时写入一次。
+
+    dtype 为全部场与临时数组的浮点类型 (float64 或 float32)。
+
+    threads > 1 时预测步按行分带 (row bands) 在持久化线程池上并行：每个带读取
+    上下一行 halo，只写自己的行，临时数组取全尺寸临时数组中对应的行切片，互不重叠。
+    NumPy ufunc 在大切片上会释放 GIL，因此各带可真正并行执行。
+    """
+
+    def __init__(self, nx, ny, dx, dy, threads=1, dtype=np.float64):
+        self.nx, self.ny = nx, ny
+        self.dx, self.dy = dx, dy
+        self.dtype = np.dtype(dtype)
+        self.threads = max(1, int(threads))
+        self.pool = thread_pool(self.threads) if self.threads > 1 else None
+
+        self.u_pad = np.zeros((ny + 2, nx + 1), dtype=dtype)
+        self.v_pad = np.zeros((ny + 1, nx + 2), dtype=dtype)
+        self.p_pad = np.zeros((ny + 2, nx + 2), dtype=dtype)
+        self.u = self.u_pad[1:-1, :]
+        self.v = self.v_pad[:, 1:-1]
+        self.p = self.p_pad[1:-1, 1:-1]
+
+        self.u_star = np.zeros((ny, nx + 1), dtype=dtype)
+        self.v_star = np.zeros((ny + 1, nx), dtype=dtype)
+        self.b = np.zeros((ny, nx), dtype=dtype)
+
+        # 收敛检查用的上一时刻速度（仅在检查步拷贝）
+        self.u_old = np.zeros_like(self.u)
+        self.v_old = np.zeros_like(self.v)
+
+        # 临时数组：u 内部面 (ny, nx-1)，v 内部面 (ny-1, nx)，单元中心 (ny, nx)
+        self.tu = [np.empty((ny, nx - 1), dtype=dtype) for _ in range(4)]
+        self.tv = [np.empty((ny - 1, nx), dtype=dtype) for _ in range(4)]
+        self.tp = [np.empty((ny, nx), dtype=dtype) for _ in range(2)]
+
+        u_views, v_views = momentum_views(self.u_pad, self.v_pad)
+
+        # 按行分带：(视图, 输出, 临时数组)，均为全尺寸数组的行切片
+        self.u_bands = [
+            tuple(a[j0:j1] for a in u_views) + (self.u_star[j0:j1, 1:-1],) + tuple(t[j0:j1] for t in self.tu)
+            for j0, j1 in row_bands(ny, self.threads)
+        ]
+        self.v_bands = [
+            tuple(a[j0:j1] for a in v_views) + (self.v_star[1 + j0:1 + j1, :],) + tuple(t[j0:j1] for t in self.tv)
+            for j0, j1 in row_bands(ny - 1, self.threads)
+        ]
+
+    def run(self, func, tasks):
+        """对每组参数调用 func；有线程池时并行执行并等待全部完成。"""
+        if self.pool is None:
+            for args in tasks:
+                func(*args)
+        else:
+            for _ in self.pool.map(lambda args: func(*args), tasks):
+                pass
+
+
+def apply_velocity_ghosts(ws, u_top):
+    """写入速度 ghost cells：下壁面 / 左右壁面无滑移，顶盖 Dirichlet（批量工作区同样适用）。"""
+    u_pad, v_pad = ws.u_pad, ws.v_pad
+    np.negative(u_pad[..., 1, :], out=u_pad[..., 0, :])                # 下壁面无滑移
+    np.subtract(2 * u_top, u_pad[..., -2, :], out=u_pad[..., -1, :])   # 顶盖 Dirichlet
+    np.negative(v_pad[..., :, 1], out=v_pad[..., :, 0])
+    np.negative(v_pad[..., :, -2], out=v_pad[..., :, -1])
+
+
+def _predict_u(u_c, u_e, u_w, u_n, u_s, v_ne, v_nw, v_se, v_sw, out, acc, t1, t2, t3,
+               dx, dy, dt, inv_Re):
+    """U 动量方程 (内部垂直面)，可作用于任意行带。"""
+    # -d(u^2)/dx
+    np.add(u_c, u_e, out=t1)
+    np.multiply(t1, t1, out=t1)
+    np.add(u_c, u_w, out=t2)
+    np.multiply(t2, t2, out=t2)
+    np.subtract(t2, t1, out=acc)
+    acc *= 0.25 / dx
+    # -d(uv)/dy
+    np.add(u_n, u_c, out=t1)
+    np.add(v_ne, v_nw, out=t2)
+    t1 *= t2
+    np.add(u_c, u_s, out=t2)
+    np.add(v_se, v_sw, out=t3)
+    t2 *= t3
+    t1 -= t2
+    t1 *= 0.25 / dy
+    acc -= t1
+    # 扩散项
+    np.multiply(u_c, 2.0, out=t3)
+    np.add(u_e, u_w, out=t1)
+    t1 -= t3
+    t1 *= inv_Re / dx ** 2
+    acc += t1
+    np.add(u_n, u_s, out=t1)
+    t1 -= t3
+    t1 *= inv_Re / dy ** 2
+    acc += t1
+
+    acc *= dt
+    np.add(u_c, acc, out=out)
+
+
+def _predict_v(v_c, v_e, v_w, v_n, v_s, u_ne, u_se, u_nw, u_sw, out, acc, t1, t2, t3,
+               dx, dy, dt, inv_Re):
+    """V 动量方程 (内部水平面)，可作用于任意行带。"""
+    # -d(v^2)/dy
+    np.add(v_c, v_n, out=t1)
+    np.multiply(t1, t1, out=t1)
+    np.add(v_c, v_s, out=t2)
+    np.multiply(t2, t2, out=t2)
+    np.subtract(t2, t1, out=acc)
+    acc *= 0.25 / dy
+    # -d(uv)/dx
+    np.add(v_e, v_c, out=t1)
+    np.add(u_ne, u_se, out=t2)
+    t1 *= t2
+    np.add(v_w, v_c, out=t2)
+    np.add(u_nw, u_sw, out=t3)
+    t2 *= t3
+    t1 -= t2
+    t1 *= 0.25 / dx
+    acc -= t1
+    # 扩散项
+    np.multiply(v_c, 2.0, out=t3)
+    np.add(v_e, v_w, out=t1)
+    t1 -= t3
+    t1 *= inv_Re / dx ** 2
+    acc += t1
+    np.add(v_n, v_s, out=t1)
+    t1 -= t3
+    t1 *= inv_Re / dy ** 2
+    acc += t1
+
+    acc *= dt
+    np.add(v_c, acc, out=out)
+
+
+def _predict_band(func, band, coeffs):
+    func(*band, *coeffs)
+
+
+def predict(ws, dt, inv_Re, u_top):
+    """
+    预测步：显式求解动量方程，结果写入 ws.u_star / ws.v_star 的内部面。
+
+    对流项采用 MAC 平均-差分格式，扩散项为 5 点 Laplace 算子。
+    u / v 两个方程只读取上一时刻速度，所有行带可在同一阶段并行计算。
+    """
+    apply_velocity_ghosts(ws, u_top)
+    coeffs = (ws.dx, ws.dy, dt, inv_Re)
+    tasks = [(_predict_u, band, coeffs) for band in ws.u_bands] + \
+            [(_predict_v, band, coeffs) for band in ws.v_bands]
+    ws.run(_predict_band, tasks)
+
+
+def ppe_source(ws, dt):
+    """PPE 源项 b = div(u*) / dt，并投影到零均值（相容）子空间。"""
+    b, tmp = ws.b, ws.tp[0]
+    u_star, v_star = ws.u_star, ws.v_star
+    np.subtract(u_star[:, 1:], u_star[:, :-1], out=b)
+    b *= 1.0 / (ws.dx * dt)
+    np.subtract(v_star[1:, :], v_star[:-1, :], out=tmp)
+    tmp *= 1.0 / (ws.dy * dt)
+    b += tmp
+    b -= b.mean()
+    return b
+
+
+def project(ws, dt, u_top):
+    """速度修正：u = u* - dt * grad(p)，并强制壁面与顶盖边界条件。"""
+    u, v, p = ws.u, ws.v, ws.p
+    gx = ws.tu[0]
+    gy = ws.tv[0]
+
+    np.subtract(p[:, 1:], p[:, :-1], out=gx)
+    gx *= dt / ws.dx
+    np.subtract(ws.u_star[:, 1:-1], gx, out=u[:, 1:-1])
+
+    np.subtract(p[1:, :], p[:-1, :], out=gy)
+    gy *= dt / ws.dy
+    np.subtract(ws.v_star[1:-1, :], gy, out=v[1:-1, :])
+
+    u[:, 0] = 0.0
+    u[:, -1] = 0.0
+    v[0, :] = 0.0
+    v[-1, :] = 0.0
+    u[-1, :] = u_top  # 恢复驱动速度
+
+
+def _tridiag_factor(n, c, reflect, dtype=np.float64):
+    """
+    三对角矩阵 I - c * D2 的 LU 分解（LAPACK gttrf，按 dtype 选择单 / 双精度版本），D2 为二阶差分。
+
+    reflect = (下端, 上端)：True 表示该端为 ghost 反射边界 (ghost = -边界值)，端点对角元为 1 + 3c；
+    False 表示该端外侧为已知值 (壁面或固定行，增量为 0)，端点对角元为 1 + 2c。
+    """
+    d = np.full(n, 1.0 + 2.0 * c, dtype=dtype)
+    d[0] += c * reflect[0]
+    d[-1] += c * reflect[1]
+    off = np.full(n - 1, -c, dtype=dtype)
+    gttrf, = get_lapack_funcs(("gttrf",), dtype=np.dtype(dtype))
+    dl, d, du, du2, ipiv, info = gttrf(off, d, off.copy())
+    if info != 0:
+        raise RuntimeError("三对角矩阵分解失败")
+    return dl, d, du, du2, ipiv
+
+
+class ADIDiffusion:
+    """
+    粘性项的 Crank-Nicolson ADI 隐式处理 (delta 形式，近似因式分解)。
+
+    显式预测得到 u* = u + dt (C(u) + nu L u) 后，记 R = u* - u - dt G p（p 为上一步压力），求解
+
+        (I - a Lx)(I - a Ly) du = R,   a = nu dt / 2,
+
+    并令 u* = u + du + dt G p。先扣除再加回上一步的压力梯度，定常时 R = 0，隐式修正本身不引入
+    O(nu dt) 的定常误差（直接对 u* - u 做隐式修正则会）。但 u 的最上一行每步被强制为顶盖速度
+    （见 project），该行的时间推进并不满足动量方程，因此定常场仍随 dt 变化（与显式格式相同）。
+    每个因子是沿网格线的三对角方程组，系数矩阵对所有线相同，因此只分解一次 (gttrf)，
+    每步以全部网格线为多右端项一次回代 (gttrs)。
+    边界与显式格式一致：壁面法向为 Dirichlet，切向 ghost 为反射（顶盖速度在 delta 形式中消去）；
+    u 的最上一行每步由速度修正强制为顶盖速度，按 Dirichlet 边界处理：不参与隐式求解，u* 直接取顶盖速度。
+    扩散项因此无条件稳定，时间步长只受对流 (CFL) 限制。
+    """
+
+    def __init__(self, nx, ny, dx, dy, dtype=np.float64):
+        self.nx, self.ny = nx, ny
+        self.dx, self.dy = dx, dy
+        self.dtype = np.dtype(dtype)
+        self.gttrs, = get_lapack_funcs(("gttrs",), dtype=self.dtype)
+        self.a = None
+        # gttrs 要求右端项按列连续 (Fortran 顺序)；y 方向回代使用的持久化数组
+        self.fu = np.empty((ny - 1, nx - 1), dtype=dtype, order="F")
+        self.fv = np.empty((ny - 1, nx), dtype=dtype, order="F")
+
+    def update(self, dt, inv_Re):
+        """按时间步长 (重新) 分解四个三对角矩阵；dt 不变时直接返回。"""
+        a = 0.5 * dt * inv_Re
+        if a == self.a:
+            return
+        self.a = a
+        cx, cy = a / self.dx ** 2, a / self.dy ** 2
+        nx, ny = self.nx, self.ny
+        self.u_x = _tridiag_factor(nx - 1, cx, reflect=(False, False), dtype=self.dtype)
+        self.u_y = _tridiag_factor(ny - 1, cy, reflect=(True, False), dtype=self.dtype)
+        self.v_x = _tridiag_factor(nx, cx, reflect=(True, True), dtype=self.dtype)
+        self.v_y = _tridiag_factor(ny - 1, cy, reflect=(False, False), dtype=self.dtype)
+
+    def _sweep(self, delta, fbuf, fx, fy):
+        # x 方向：delta.T 为 Fortran 连续的 (nx 方向长度, 行数)，原地回代
+        self.gttrs(*fx, delta.T, overwrite_b=1)
+        # y 方向：拷贝到 Fortran 顺序的持久化数组后原地回代
+        np.copyto(fbuf, delta)
+        self.gttrs(*fy, fbuf, overwrite_b=1)
+        return fbuf
+
+    def apply(self, ws, dt):
+        """对 ws.u_star / ws.v_star 的内部面做隐式扩散修正（ws.p 为上一步压力）。"""
+        p = ws.p
+        u_in, us_in = ws.u[:-1, 1:-1], ws.u_star[:-1, 1:-1]
+        du, gx = ws.tu[0][:-1], ws.tu[1][:-1]
+        np.subtract(p[:-1, 1:], p[:-1, :-1], out=gx)
+        gx *= dt / ws.dx
+        np.subtract(us_in, u_in, out=du)
+        du -= gx
+        gx += u_in
+        np.add(gx, self._sweep(du, self.fu, self.u_x, self.u_y), out=us_in)
+        # 最上一行按 Dirichlet 边界处理：u* 取顶盖速度，避免显式扩散在大 dt 下失稳
+        np.copyto(ws.u_star[-1, 1:-1], ws.u[-1, 1:-1])
+
+        v_in, vs_in = ws.v[1:-1, :], ws.v_star[1:-1, :]
+        dv, gy = ws.tv[0], ws.tv[1]
+        np.subtract(p[1:, :], p[:-1, :], out=gy)
+        gy *= dt / ws.dy
+        np.subtract(vs_in, v_in, out=dv)
+        dv -= gy
+        gy += v_in
+        np.add(gy, self._sweep(dv, self.fv, self.v_x, self.v_y), out=vs_in)
+
+
+def stable_dt(ws, Re):
+    """
+    由当前速度场计算稳定时间步长上限 (dt_cfl, dt_diff)。
+
+    dt_cfl = 1 / (max|u|/dx + max|v|/dy)，dt_diff = Re * min(dx, dy)^2 / 4。
+    """
+    u_max = float(max(ws.u.max(), -ws.u.min()))
+    v_max = float(max(ws.v.max(), -ws.v.min()))
+    rate = u_max / ws.dx + v_max / ws.dy
+    dt_cfl = 1.0 / rate if rate > 0 else np.inf
+    dt_diff = 0.25 * Re * min(ws.dx, ws.dy) ** 2
+    return dt_cfl, dt_diff
+
+
+def velocity_change(ws):
+    """
+    相对速度变化 (err_u, err_v)，与检查步开始时拷贝的 ws.u_old / ws.v_old 比较。
+
+    差值直接写回 u_old / v_old，调用后二者不再保存旧速度。
+    """
+    err = []
+    for cur, old in ((ws.u, ws.u_old), (ws.v, ws.v_old)):
+        old_norm = np.linalg.norm(old)
+        np.subtract(cur, old, out=old)
+        err.append(np.linalg.norm(old) / (old_norm + 1e-12))
+    return err[0], err[1]
@@ -0,0 +1,168 @@
+"""
+MAC 网格时间步内核 (Numba 实现)。
+
+与 core.kernels 的 NumPy 内核一一对应：预测步、PPE 源项、红黑 SOR 扫描与速度修正
+各自融合为一个 @njit(parallel=True) 循环，按行 prange 并行，不产生任何临时数组。
+运算顺序与 NumPy 内核保持一致，两者结果在舍入误差范围内相同。
+
+未安装 numba 时模块仍可导入（NUMBA_AVAILABLE = False），由调用方回退到 NumPy 后端。
+"""
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+from .kernels import apply_velocity_ghosts
+
+
+@njit(parallel=True, cache=True)
+def _predict_u(u_pad, v_pad, u_star, dx, dy, dt, inv_Re):
+    ny = u_pad.shape[0] - 2
+    nx = u_pad.shape[1] - 1
+    cx = 0.25 / dx
+    cy = 0.25 / dy
+    kx = inv_Re / dx ** 2
+    ky = inv_Re / dy ** 2
+    for j in prange(ny):
+        jj = j + 1
+        for i in range(1, nx):
+            u_c = u_pad[jj, i]
+            u_e = u_pad[jj, i + 1]
+            u_w = u_pad[jj, i - 1]
+            u_n = u_pad[jj + 1, i]
+            u_s = u_pad[jj - 1, i]
+            # v 位于 v_pad 的第 i+1 列（左侧有一列 ghost）
+            v_ne = v_pad[j + 1, i + 1]
+            v_nw = v_pad[j + 1, i]
+            v_se = v_pad[j, i + 1]
+            v_sw = v_pad[j, i]
+
+            acc = ((u_c + u_w) * (u_c + u_w) - (u_c + u_e) * (u_c + u_e)) * cx
+            acc -= ((u_n + u_c) * (v_ne + v_nw) - (u_c + u_s) * (v_se + v_sw)) * cy
+            acc += (u_e + u_w - 2.0 * u_c) * kx
+            acc += (u_n + u_s - 2.0 * u_c) * ky
+            u_star[j, i] = u_c + acc * dt
+
+
+@njit(parallel=True, cache=True)
+def _predict_v(u_pad, v_pad, v_star, dx, dy, dt, inv_Re):
+    ny = v_pad.shape[0] - 1
+    nx = v_pad.shape[1] - 2
+    cx = 0.25 / dx
+    cy = 0.25 / dy
+    kx = inv_Re / dx ** 2
+    ky = inv_Re / dy ** 2
+    for j in prange(1, ny):
+        for i in range(nx):
+            ii = i + 1
+            v_c = v_pad[j, ii]
+            v_e = v_pad[j, ii + 1]
+            v_w = v_pad[j, ii - 1]
+            v_n = v_pad[j + 1, ii]
+            v_s = v_pad[j - 1, ii]
+            # u 位于 u_pad 的第 j+1 行（下方有一行 ghost）
+            u_ne = u_pad[j + 1, i + 1]
+            u_se = u_pad[j, i + 1]
+            u_nw = u_pad[j + 1, i]
+            u_sw = u_pad[j, i]
+
+            acc = ((v_c + v_s) * (v_c + v_s) - (v_c + v_n) * (v_c + v_n)) * cy
+            acc -= ((v_e + v_c) * (u_ne + u_se) - (v_w + v_c) * (u_nw + u_sw)) * cx
+            acc += (v_e + v_w - 2.0 * v_c) * kx
+            acc += (v_n + v_s - 2.0 * v_c) * ky
+            v_star[j, i] = v_c + acc * dt
+
+
+@njit(parallel=True, cache=True)
+def _ppe_source(u_star, v_star, b, dx, dy, dt):
+    ny, nx = b.shape
+    cx = 1.0 / (dx * dt)
+    cy = 1.0 / (dy * dt)
+    for j in prange(ny):
+        for i in range(nx):
+            b[j, i] = (u_star[j, i + 1] - u_star[j, i]) * cx + (v_star[j + 1, i] - v_star[j, i]) * cy
+
+
+@njit(cache=True)
+def _neumann_ghosts(p_pad):
+    ny = p_pad.shape[0] - 2
+    nx = p_pad.shape[1] - 2
+    for i in range(1, nx + 1):
+        p_pad[0, i] = p_pad[1, i]
+        p_pad[ny + 1, i] = p_pad[ny, i]
+    for j in range(1, ny + 1):
+        p_pad[j, 0] = p_pad[j, 1]
+        p_pad[j, nx + 1] = p_pad[j, nx]
+
+
+@njit(parallel=True, cache=True)
+def _rb_half_sweep(p_pad, b, color, c_x, c_y, c_b, omega):
+    ny, nx = b.shape
+    for j in prange(ny):
+        jj = j + 1
+        for i in range((j + color) % 2, nx, 2):
+            ii = i + 1
+            p_gs = (p_pad[jj, ii + 1] + p_pad[jj, ii - 1]) * c_x + \
+                   (p_pad[jj + 1, ii] + p_pad[jj - 1, ii]) * c_y - b[j, i] * c_b
+            if omega != 1.0:
+                p_pad[jj, ii] = p_pad[jj, ii] * (1.0 - omega) + p_gs
+            else:
+                p_pad[jj, ii] = p_gs
+
+
+@njit(parallel=True, cache=True)
+def _project(u_pad, v_pad, p_pad, u_star, v_star, dx, dy, dt):
+    ny = p_pad.shape[0] - 2
+    nx = p_pad.shape[1] - 2
+    gx = dt / dx
+    gy = dt / dy
+    for j in prange(ny):
+        for i in range(1, nx):
+            u_pad[j + 1, i] = u_star[j, i] - (p_pad[j + 1, i + 1] - p_pad[j + 1, i]) * gx
+    for j in prange(1, ny):
+        for i in range(nx):
+            v_pad[j, i + 1] = v_star[j, i] - (p_pad[j + 1, i + 1] - p_pad[j, i + 1]) * gy
+
+
+def predict(ws, dt, inv_Re, u_top):
+    """预测步（融合循环），结果写入 ws.u_star / ws.v_star 的内部面。"""
+    apply_velocity_ghosts(ws, u_top)
+    _predict_u(ws.u_pad, ws.v_pad, ws.u_star, ws.dx, ws.dy, dt, inv_Re)
+    _predict_v(ws.u_pad, ws.v_pad, ws.v_star, ws.dx, ws.dy, dt, inv_Re)
+
+
+def ppe_source(ws, dt):
+    """PPE 源项 b = div(u*) / dt，并投影到零均值（相容）子空间。"""
+    b = ws.b
+    _ppe_source(ws.u_star, ws.v_star, b, ws.dx, ws.dy, dt)
+    b -= b.mean()
+    return b
+
+
+def rb_sweep(p_pad, b, dx2, dy2, omega):
+    """一次红黑排序 SOR 扫描（先红后黑），原地更新 p_pad 的内部单元。"""
+    denom = 2 * (dx2 + dy2)
+    c_x = omega * dy2 / denom
+    c_y = omega * dx2 / denom
+    c_b = omega * dx2 * dy2 / denom
+    for color in (0, 1):
+        _neumann_ghosts(p_pad)
+        _rb_half_sweep(p_pad, b, color, c_x, c_y, c_b, omega)
+
+
+def project(ws, dt, u_top):
+    """速度修正：u = u* - dt * grad(p)，并强制壁面与顶盖边界条件。"""
+    _project(ws.u_pad, ws.v_pad, ws.p_pad, ws.u_star, ws.v_star, ws.dx, ws.dy, dt)
+    u, v = ws.u, ws.v
+    u[:, 0] = 0.0
+    u[:, -1] = 0.0
+    v[0, :] = 0.0
+    v[-1, :] = 0.0
+    u[-1, :] = u_top  # 恢复驱动速度
@@ -0,0 +1,112 @@
+"""
+MAC 网格时间步内核 (拉伸网格，变系数 NumPy 实现)。
+
+与 core.kernels 的接口相同 (predict / ppe_source / project)，度量取自 attach 时给出的
+core.grid.MACGrid。离散为有限体积形式，在均匀网格上与 core.kernels 完全一致：
+- 对流项：单元中心速度取两侧面的平均（面位于单元中点，平均即线性插值）；
+  控制体角点上的速度按到两侧节点的距离线性插值。通量差除以控制体宽度，保持守恒。
+- 扩散项：梯度为相邻节点差除以节点间距，再对控制体做差分（变系数 5 点格式）。
+  壁面与顶盖 ghost 位于镜像位置，到边界节点的距离等于边界单元宽度。
+- PPE：散度 / 梯度分别除以单元宽度 / 单元中心间距，二者组成的 Laplace 算子与
+  pressure.stretched_laplacian 一致；源项按单元面积加权投影到相容子空间。
+拉伸网格上的中间量按表达式直接计算（会分配临时数组），不做行带划分。
+"""
+import numpy as np
+
+from .kernels import apply_velocity_ghosts
+
+
+class StretchedMetrics:
+    """预先按广播形状整理好的度量数组（u 内部面、v 内部面、单元中心各一组）。"""
+
+    def __init__(self, grid, dtype=np.float64):
+        hx, hy, dxc, dyc = grid.hx, grid.hy, grid.dxc, grid.dyc
+        hx_pad = np.concatenate([hx[:1], hx, hx[-1:]])
+        hy_pad = np.concatenate([hy[:1], hy, hy[-1:]])
+
+        def col(a):
+            return np.asarray(a, dtype=dtype)
+
+        def row(a):
+            return np.asarray(a, dtype=dtype)[:, None]
+
+        # 单元中心 (ny, nx)
+        self.inv_hx = col(1.0 / hx)
+        self.inv_hy = row(1.0 / hy)
+        self.vol = np.asarray(grid.vol, dtype=dtype)
+        # u 内部面 (ny, nx-1)
+        self.inv_dxu = col(1.0 / dxc[1:-1])
+        self.u_inv_w, self.u_inv_e = col(1.0 / hx[:-1]), col(1.0 / hx[1:])
+        self.u_inv_s, self.u_inv_n = row(1.0 / dyc[:-1]), row(1.0 / dyc[1:])
+        self.u_wy = row(hy_pad[1:] / (hy_pad[:-1] + hy_pad[1:]))   # u 插值到水平面：下侧权重 (ny+1, 1)
+        self.v_wx = col(hx[1:] / (hx[:-1] + hx[1:]))               # v 插值到 u 面所在 x：左侧权重 (nx-1,)
+        # v 内部面 (ny-1, nx)
+        self.inv_dyv = row(1.0 / dyc[1:-1])
+        self.v_inv_s, self.v_inv_n = row(1.0 / hy[:-1]), row(1.0 / hy[1:])
+        self.v_inv_w, self.v_inv_e = col(1.0 / dxc[:-1]), col(1.0 / dxc[1:])
+        self.v_wx_pad = col(hx_pad[1:] / (hx_pad[:-1] + hx_pad[1:]))  # v 插值到竖直面：左侧权重 (nx+1,)
+        self.u_wy_in = row(hy[1:] / (hy[:-1] + hy[1:]))                # u 插值到 v 面所在 y：下侧权重 (ny-1, 1)
+
+
+def attach(ws, grid):
+    """把拉伸网格的度量挂到工作区上（ws.grid / ws.metrics）。"""
+    ws.grid = grid
+    ws.metrics = StretchedMetrics(grid, ws.dtype)
+
+
+def predict(ws, dt, inv_Re, u_top):
+    """预测步：显式求解动量方程，结果写入 ws.u_star / ws.v_star 的内部面。"""
+    apply_velocity_ghosts(ws, u_top)
+    m = ws.metrics
+    u_pad, v_pad = ws.u_pad, ws.v_pad
+    u, v = ws.u, ws.v
+
+    # ---------------- U 动量方程 ----------------
+    u_c, u_e, u_w = u[:, 1:-1], u[:, 2:], u[:, :-2]
+    u_n, u_s = u_pad[2:, 1:-1], u_pad[:-2, 1:-1]
+    u_cell = 0.5 * (u[:, 1:] + u[:, :-1])
+    conv = (u_cell[:, 1:] ** 2 - u_cell[:, :-1] ** 2) * m.inv_dxu
+    flux = (m.u_wy * u_pad[:-1, 1:-1] + (1.0 - m.u_wy) * u_pad[1:, 1:-1]) * \
+           (m.v_wx * v[:, :-1] + (1.0 - m.v_wx) * v[:, 1:])
+    conv += (flux[1:] - flux[:-1]) * m.inv_hy
+    diff = ((u_e - u_c) * m.u_inv_e - (u_c - u_w) * m.u_inv_w) * m.inv_dxu + \
+           ((u_n - u_c) * m.u_inv_n - (u_c - u_s) * m.u_inv_s) * m.inv_hy
+    np.add(u_c, dt * (inv_Re * diff - conv), out=ws.u_star[:, 1:-1])
+
+    # ---------------- V 动量方程 ----------------
+    v_c, v_n, v_s = v[1:-1, :], v[2:, :], v[:-2, :]
+    v_e, v_w = v_pad[1:-1, 2:], v_pad[1:-1, :-2]
+    v_cell = 0.5 * (v[1:] + v[:-1])
+    conv = (v_cell[1:] ** 2 - v_cell[:-1] ** 2) * m.inv_dyv
+    flux = (m.v_wx_pad * v_pad[1:-1, :-1] + (1.0 - m.v_wx_pad) * v_pad[1:-1, 1:]) * \
+           (m.u_wy_in * u[:-1, :] + (1.0 - m.u_wy_in) * u[1:, :])
+    conv += (flux[:, 1:] - flux[:, :-1]) * m.inv_hx
+    diff = ((v_n - v_c) * m.v_inv_n - (v_c - v_s) * m.v_inv_s) * m.inv_dyv + \
+           ((v_e - v_c) * m.v_inv_e - (v_c - v_w) * m.v_inv_w) * m.inv_hx
+    np.add(v_c, dt * (inv_Re * diff - conv), out=ws.v_star[1:-1, :])
+
+
+def ppe_source(ws, dt):
+    """PPE 源项 b = div(u*) / dt，并按单元面积加权投影到相容子空间。"""
+    m = ws.metrics
+    b = ws.b
+    u_star, v_star = ws.u_star, ws.v_star
+    np.multiply(u_star[:, 1:] - u_star[:, :-1], m.inv_hx, out=b)
+    b += (v_star[1:, :] - v_star[:-1, :]) * m.inv_hy
+    b *= 1.0 / dt
+    b -= np.sum(b * m.vol) / np.sum(m.vol)
+    return b
+
+
+def project(ws, dt, u_top):
+    """速度修正：u = u* - dt * grad(p)（梯度除以单元中心间距），并强制边界条件。"""
+    m = ws.metrics
+    u, v, p = ws.u, ws.v, ws.p
+    np.subtract(ws.u_star[:, 1:-1], dt * (p[:, 1:] - p[:, :-1]) * m.inv_dxu, out=u[:, 1:-1])
+    np.subtract(ws.v_star[1:-1, :], dt * (p[1:, :] - p[:-1, :]) * m.inv_dyv, out=v[1:-1, :])
+
+    u[:, 0] = 0.0
+    u[:, -1] = 0.0
+    v[0, :] = 0.0
+    v[-1, :] = 0.0
+    u[-1, :] = u_top  # 恢复驱动速度
@@ -0,0 +1,437 @@
+"""
+共享内存区域分解求解器 (多进程)。
+
+lid_driven_cavity_mac_mp 与 lid_driven_cavity_mac 的调用方式和返回值 (u_list, v_list, p_list[, info])
+相同，适用于远超界面 400x400 上限的大网格：
+
+- u / v / p 及 u* / v* / b 等全局数组放在 multiprocessing.shared_memory 中；
+- 按压力单元的行把区域分成若干条带，每个进程只写自己的行，相邻条带的一行 halo
+  直接从共享数组读取，各阶段之间用 Barrier 同步（即通过共享缓冲区交换 halo）；
+- PPE 源项 / 压力的均值、SOR 收敛判据 (max|dp|) 与速度收敛判据 (err_u / err_v)
+  通过共享归约数组做全局归约，所有进程得到一致的结论；
+- 主进程本身作为 0 号进程参与计算，并负责快照保存、进度显示与停止请求 (见 core.progress)；
+  收敛检查步上由归约得到的速度变化不是有限值时判定为发散，所有进程随之停止。
+
+压力方程采用按行带划分的红黑 SOR / Gauss-Seidel。
+"""
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from .grid import mac_coordinates
+from .kernels import _predict_u, _predict_v, momentum_views, row_bands
+from .pressure import _sor_update, red_black_views
+from .progress import make_progress
+
+# 共享数组：名称 -> 形状构造函数
+_SHARED_SHAPES = {
+    "u_pad": lambda nx, ny: (ny + 2, nx + 1),
+    "v_pad": lambda nx, ny: (ny + 1, nx + 2),
+    "p_pad": lambda nx, ny: (ny + 2, nx + 2),
+    "u_star": lambda nx, ny: (ny, nx + 1),
+    "v_star": lambda nx, ny: (ny + 1, nx),
+    "b": lambda nx, ny: (ny, nx),
+}
+
+# 归约数组的列
+_R_SUM_B, _R_SUM_P, _R_DP, _R_DU, _R_U, _R_DV, _R_V = range(7)
+
+# 控制标志
+_CTRL_STOP = 0
+
+
+def _attach(spec):
+    """按 spec 打开共享内存块，返回 (shm 列表, 数组字典)。"""
+    blocks, arrays = [], {}
+    for key, (name, shape) in spec["shared"].items():
+        shm = shared_memory.SharedMemory(name=name)
+        blocks.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    return blocks, arrays
+
+
+class _Strip:
+    """一个进程负责的行带：视图、临时数组与局部计算。"""
+
+    def __init__(self, spec, arrays, rank):
+        nx, ny = spec["nx"], spec["ny"]
+        self.nx, self.ny = nx, ny
+        self.dx, self.dy = spec["dx"], spec["dy"]
+        self.rank = rank
+        self.first = rank == 0
+        self.last = rank == spec["nprocs"] - 1
+        j0, j1 = spec["strips"][rank]
+        self.j0, self.j1 = j0, j1
+
+        self.u_pad, self.v_pad, self.p_pad = arrays["u_pad"], arrays["v_pad"], arrays["p_pad"]
+        self.u_star, self.v_star, self.b = arrays["u_star"], arrays["v_star"], arrays["b"]
+        self.red, self.ctrl = arrays["red"], arrays["ctrl"]
+
+        # 本进程拥有的各类行：压力 / u 行 [j0, j1)，v 内部面 [max(j0, 1), j1)
+        self.k0, self.k1 = max(j0, 1), j1
+        self.u_own = self.u_pad[1 + j0:1 + j1, :]
+        self.v_own = self.v_pad[j0:j1 + (1 if self.last else 0), 1:-1]  # 含上下壁面行
+        self.p_own = self.p_pad[1 + j0:1 + j1, 1:-1]
+        self.b_own = self.b[j0:j1, :]
+
+        u_views, v_views = momentum_views(self.u_pad, self.v_pad)
+        n_u, n_v = j1 - j0, self.k1 - self.k0
+        self.u_band = tuple(a[j0:j1] for a in u_views) + (self.u_star[j0:j1, 1:-1],) + \
+            tuple(np.empty((n_u, nx - 1)) for _ in range(4))
+        self.v_band = tuple(a[self.k0 - 1:self.k1 - 1] for a in v_views) + (self.v_star[self.k0:self.k1, :],) + \
+            tuple(np.empty((n_v, nx)) for _ in range(4))
+        self.colors = red_black_views(self.p_pad, self.b, bands=[(j0, j1)])
+
+        self.u_old = np.empty_like(self.u_own)
+        self.v_old = np.empty_like(self.v_own)
+        self.p_old = np.empty_like(self.p_own)
+        self.tmp = np.empty_like(self.b_own)
+
+    def velocity_ghosts(self, u_top):
+        """写入本条带负责的速度 ghost cells。"""
+        v_pad = self.v_pad
+        rows = slice(self.k0, self.k1)
+        np.negative(v_pad[rows, 1], out=v_pad[rows, 0])
+        np.negative(v_pad[rows, -2], out=v_pad[rows, -1])
+        if self.first:
+            np.negative(self.u_pad[1, :], out=self.u_pad[0, :])
+        if self.last:
+            np.subtract(2 * u_top, self.u_pad[-2, :], out=self.u_pad[-1, :])
+
+    def predict(self, dt, inv_Re):
+        coeffs = (self.dx, self.dy, dt, inv_Re)
+        _predict_u(*self.u_band, *coeffs)
+        if self.k1 > self.k0:
+            _predict_v(*self.v_band, *coeffs)
+
+    def ppe_source(self, dt):
+        """本条带的 b = div(u*) / dt（需要相邻条带的 v* 已完成），返回局部和。"""
+        j0, j1 = self.j0, self.j1
+        b, tmp = self.b_own, self.tmp
+        np.subtract(self.u_star[j0:j1, 1:], self.u_star[j0:j1, :-1], out=b)
+        b *= 1.0 / (self.dx * dt)
+        np.subtract(self.v_star[j0 + 1:j1 + 1, :], self.v_star[j0:j1, :], out=tmp)
+        tmp *= 1.0 / (self.dy * dt)
+        b += tmp
+        return b.sum()
+
+    def pressure_ghosts(self):
+        """写入本条带负责的 Neumann ghost cells。"""
+        p_pad = self.p_pad
+        rows = slice(1 + self.j0, 1 + self.j1)
+        p_pad[rows, 0] = p_pad[rows, 1]
+        p_pad[rows, -1] = p_pad[rows, -2]
+        if self.first:
+            p_pad[0, 1:-1] = p_pad[1, 1:-1]
+        if self.last:
+            p_pad[-1, 1:-1] = p_pad[-2, 1:-1]
+
+    def sor_half(self, group, coeffs):
+        self.pressure_ghosts()
+        for item in group:
+            _sor_update(*item, *coeffs)
+
+    def project(self, dt, u_top):
+        """本条带的速度修正（v 面需要下方相邻条带的最终压力）。"""
+        j0, j1, k0, k1 = self.j0, self.j1, self.k0, self.k1
+        p = self.p_pad[1:-1, 1:-1]
+        u = self.u_pad[1:-1, :]
+        v = self.v_pad[:, 1:-1]
+
+        gx = self.u_band[-4]
+        np.subtract(p[j0:j1, 1:], p[j0:j1, :-1], out=gx)
+        gx *= dt / self.dx
+        np.subtract(self.u_star[j0:j1, 1:-1], gx, out=u[j0:j1, 1:-1])
+        if k1 > k0:
+            gy = self.v_band[-4]
+            np.subtract(p[k0:k1, :], p[k0 - 1:k1 - 1, :], out=gy)
+            gy *= dt / self.dy
+            np.subtract(self.v_star[k0:k1, :], gy, out=v[k0:k1, :])
+
+        u[j0:j1, 0] = 0.0
+        u[j0:j1, -1] = 0.0
+        if self.first:
+            v[0, :] = 0.0
+        if self.last:
+            v[-1, :] = 0.0
+            u[-1, :] = u_top  # 恢复驱动速度
+
+
+def _needs_sync(n, spec):
+    """该步结束时是否需要 0 号进程做收敛判断 / 快照 / 进度处理。"""
+    save_interval, every = spec["save_interval"], spec["progress_every"]
+    return (n % 100 == 0) or (every is not None and (n + 1) % every == 0) or \
+        (save_interval is not None and n > 0 and n % save_interval == 0)
+
+
+def _run_strip(spec, arrays, rank, barrier, on_step_end=None):
+    """
+    一个进程的时间推进主循环。
+
+    on_step_end(n, strip) 仅由 0 号进程提供：在需要同步的步结束时调用，
+    返回 True 表示所有进程应停止。
+    """
+    strip = _Strip(spec, arrays, rank)
+    red, ctrl = strip.red, strip.ctrl
+    dt, inv_Re, u_top = spec["dt"], 1.0 / spec["Re"], 1.0
+    n_cells = spec["nx"] * spec["ny"]
+
+    dx2, dy2 = strip.dx ** 2, strip.dy ** 2
+    omega = spec["omega"]
+    denom = 2 * (dx2 + dy2)
+    sor_coeffs = (omega * dy2 / denom, omega * dx2 / denom, omega * dx2 * dy2 / denom, omega)
+    max_ppe_iter = 2000
+
+    for n in range(spec["max_iter"]):
+        check_step = (n % 100 == 0)
+        if check_step:
+            np.copyto(strip.u_old, strip.u_own)
+            np.copyto(strip.v_old, strip.v_own)
+
+        # ==================== A. 预测步 ====================
+        strip.velocity_ghosts(u_top)
+        strip.predict(dt, inv_Re)
+        barrier.wait()
+
+        # ==================== B. PPE ====================
+        red[rank, _R_SUM_B] = strip.ppe_source(dt)
+        barrier.wait()
+        strip.b_own -= red[:, _R_SUM_B].sum() / n_cells
+
+        for it_ppe in range(max_ppe_iter):
+            check_ppe = (it_ppe % 10 == 0)
+            if check_ppe:
+                np.copyto(strip.p_old, strip.p_own)
+            for group in strip.colors:
+                strip.sor_half(group, sor_coeffs)
+                barrier.wait()
+            if check_ppe:
+                np.subtract(strip.p_own, strip.p_old, out=strip.tmp)
+                np.abs(strip.tmp, out=strip.tmp)
+                red[rank, _R_DP] = strip.tmp.max()
+                barrier.wait()
+                if red[:, _R_DP].max() < spec["Ptol"]:
+                    break
+
+        red[rank, _R_SUM_P] = strip.p_own.sum()
+        barrier.wait()
+        strip.p_own -= red[:, _R_SUM_P].sum() / n_cells
+        barrier.wait()
+
+        # ==================== C. 速度修正 ====================
+        strip.project(dt, u_top)
+
+        if check_step:
+            np.subtract(strip.u_own, strip.u_old, out=strip.u_old)
+            np.subtract(strip.v_own, strip.v_old, out=strip.v_old)
+            red[rank, _R_DU] = np.vdot(strip.u_old, strip.u_old)
+            red[rank, _R_DV] = np.vdot(strip.v_old, strip.v_old)
+            # 旧速度的范数：u_old 此时保存差值，因此用 cur - diff 还原
+            np.subtract(strip.u_own, strip.u_old, out=strip.u_old)
+            np.subtract(strip.v_own, strip.v_old, out=strip.v_old)
+            red[rank, _R_U] = np.vdot(strip.u_old, strip.u_old)
+            red[rank, _R_V] = np.vdot(strip.v_old, strip.v_old)
+        barrier.wait()
+
+        # ==================== D. 全局判断 (0 号进程) ====================
+        if _needs_sync(n, spec):
+            if on_step_end is not None and on_step_end(n, strip):
+                ctrl[_CTRL_STOP] = 1
+            barrier.wait()
+            if ctrl[_CTRL_STOP]:
+                return n
+    return spec["max_iter"] - 1
+
+
+def _worker_main(spec, rank, barrier):
+    blocks, arrays = _attach(spec)
+    try:
+        _run_strip(spec, arrays, rank, barrier)
+    except BrokenBarrierError:
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del arrays
+        for shm in blocks:
+            shm.close()
+
+
+def lid_driven_cavity_mac_mp(
+        Re=100, nx=60, ny=60, max_iter=20000, dt=0.001, Vtol=1e-6, Ptol=1e-6,
+        pressure_solver="sor", omega=1.8,
+        save_interval=None,
+        processes=None, barrier_timeout=600.0,
+        progress="auto", progress_every=None, on_progress=None, should_cancel=None,
+    return_info: bool = False,
+):
+    """
+    多进程共享内存区域分解版本的方腔流求解器，返回值与 lid_driven_cavity_mac 相同。
+
+    参数 (其余同 lid_driven_cavity_mac):
+        pressure_solver: 'sor' 或 'gauss_seidel'（按行带分解的红黑排序迭代）。
+        processes: 进程数（含主进程），默认取 CPU 核数；每个条带至少 2 行。
+        barrier_timeout: 单次同步等待的最长时间（秒）。某个进程异常退出时，
+                         其余进程在超时后报错而不是永久阻塞。
+
+    info 含与串行版本相同的状态键 (converged / diverged / canceled 及对应步数)、dt_history、
+    coords、steps_per_s 与 mlups；timings 只有 total，另有 processes 为实际进程数。
+    """
+    if pressure_solver not in ("sor", "gauss_seidel"):
+        raise ValueError("多进程引擎仅支持 sor / gauss_seidel 压力求解器")
+    if save_interval is not None:
+        try:
+            save_interval = int(save_interval)
+        except (TypeError, ValueError):
+            raise ValueError("save_interval 必须是 None 或正整数")
+        if save_interval <= 0:
+            raise ValueError("save_interval 必须是 None 或正整数")
+
+    sink = make_progress(progress, progress_every, on_progress, should_cancel)
+    every = sink.every
+
+    nprocs = int(processes) if processes is not None else (os.cpu_count() or 1)
+    if nprocs <= 0:
+        raise ValueError("processes 必须是正整数")
+    nprocs = max(1, min(nprocs, ny // 2))
+
+    dx, dy = 1.0 / nx, 1.0 / ny
+    spec = {
+        "Re": float(Re), "nx": int(nx), "ny": int(ny), "dx": dx, "dy": dy,
+        "dt": float(dt), "Ptol": float(Ptol), "max_iter": int(max_iter),
+        "omega": 1.0 if pressure_solver == "gauss_seidel" else float(omega),
+        "save_interval": save_interval, "progress_every": every,
+        "nprocs": nprocs, "strips": row_bands(ny, nprocs),
+        "shared": {},
+    }
+
+    print(f"开始计算 (多进程): Re={Re}, Grid={nx}x{ny}, Solver={pressure_solver}, Processes={nprocs}")
+
+    blocks = []
+    ctx = mp.get_context("spawn")
+    procs = []
+    try:
+        shapes = {key: f(nx, ny) for key, f in _SHARED_SHAPES.items()}
+        shapes["red"] = (nprocs, 8)
+        shapes["ctrl"] = (4,)
+        for key, shape in shapes.items():
+            shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+            blocks.append(shm)
+            np.ndarray(shape, dtype=np.float64, buffer=shm.buf).fill(0.0)
+            spec["shared"][key] = (shm.name, shape)
+
+        _, arrays = _attach({"shared": spec["shared"]})
+        u = arrays["u_pad"][1:-1, :]
+        v = arrays["v_pad"][:, 1:-1]
+        p = arrays["p_pad"][1:-1, 1:-1]
+
+        barrier = ctx.Barrier(nprocs, timeout=barrier_timeout)
+        for rank in range(1, nprocs):
+            proc = ctx.Process(target=_worker_main, args=(spec, rank, barrier), daemon=True)
+            proc.start()
+            procs.append(proc)
+
+        sink.start(0, max_iter)
+
+        u_list, v_list, p_list = [], [], []
+        state = {"converged_step": None, "canceled_step": None, "diverged_step": None, "last_saved_step": None}
+
+        def on_step_end(n, strip):
+            red = strip.red
+            stop = False
+            if every is not None and (n + 1) % every == 0:
+                sink.on_progress(n + 1, {"phase": "march", "total": max_iter, "dt": dt})
+                if sink.should_cancel():
+                    state["canceled_step"] = n + 1
+                    stop = True
+
+            if n % 100 == 0:
+                err_u = np.sqrt(red[:, _R_DU].sum()) / (np.sqrt(red[:, _R_U].sum()) + 1e-12)
+                err_v = np.sqrt(red[:, _R_DV].sum()) / (np.sqrt(red[:, _R_V].sum()) + 1e-12)
+                # 数值发散：任一条带出现 inf / nan 时归约结果不是有限值
+                if not (np.isfinite(err_u) and np.isfinite(err_v)):
+                    state["diverged_step"] = n + 1
+                    print(f"计算发散于第 {n + 1} 步，请减小 dt。")
+                    return True
+                if err_u < Vtol and err_v < Vtol:
+                    state["converged_step"] = n + 1
+                    print(f"收敛于第 {n + 1} 步 (Error: {max(err_u, err_v):.2e})")
+                    stop = True
+
+            if save_interval is not None and n > 0 and n % save_interval == 0:
+                u_list.append(u.copy())
+                v_list.append(v.copy())
+                p_list.append(p.copy())
+                state["last_saved_step"] = n + 1
+            return stop
+
+        t0 = time.perf_counter()
+        try:
+            last_n = _run_strip(spec, arrays, 0, barrier, on_step_end=on_step_end)
+        except BrokenBarrierError:
+            raise RuntimeError("多进程计算中断：有工作进程异常退出或同步超时")
+
+        for proc in procs:
+            proc.join()
+        wall_time = time.perf_counter() - t0
+
+        converged_step = state["converged_step"]
+        canceled_step = state["canceled_step"]
+        diverged_step = state["diverged_step"]
+        if converged_step is None and canceled_step is None and diverged_step is None:
+            print(f"达到最大迭代次数 {max_iter}，未完全收敛。")
+
+        final_step = converged_step if converged_step is not None else last_n + 1
+        if save_interval is None or state["last_saved_step"] != final_step:
+            u_list.append(u.copy())
+            v_list.append(v.copy())
+            p_list.append(p.copy())
+
+        if canceled_step is not None:
+            sink.finish(canceled_step, "canceled")
+        elif diverged_step is not None:
+            sink.finish(diverged_step, "diverged")
+        elif converged_step is not None:
+            sink.finish(converged_step, "converged")
+        else:
+            sink.finish(final_step, "max_iter")
+
+        del u, v, p, arrays
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    if return_info:
+        info = {
+            "converged": converged_step is not None,
+            "converged_step": converged_step,
+            "canceled": canceled_step is not None,
+            "canceled_step": canceled_step,
+            "diverged": diverged_step is not None,
+            "diverged_step": diverged_step,
+            "max_iter": int(max_iter),
+            "mode": "transient",
+            "dt_history": [(0, float(dt))],
+            "time_scheme": "euler",
+            "resumed_from_step": None,
+            "checkpoints_written": 0,
+            "coords": mac_coordinates(nx, ny),
+            # 各进程同步推进，只记录总墙钟时间
+            "timings": {"total": wall_time},
+            "steps_per_s": final_step / wall_time if wall_time > 0 else None,
+            "mlups": nx * ny * final_step / wall_time * 1e-6 if wall_time > 0 else None,
+            "processes": nprocs,
+        }
+        return u_list, v_list, p_list, info
+
+    return u_list, v_list, p_list
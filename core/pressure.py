@@ -0,0 +1,641 @@
+"""
+压力泊松方程 (PPE) 求解器。
+
+MAC 网格上压力位于单元中心，四周壁面为齐次 Neumann 条件 (dp/dn = 0)。
+离散后为 5 点 Laplace 算子：
+    (p[j, i+1] - 2 p[j, i] + p[j, i-1]) / dx^2
+  + (p[j+1, i] - 2 p[j, i] + p[j-1, i]) / dy^2 = b[j, i]
+越界的邻点取 ghost cell，其值等于相邻的边界单元（与 SOR 分支的 p_pad 处理一致）。
+"""
+from functools import lru_cache
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.fft import dctn, idctn
+from scipy.sparse.linalg import factorized
+
+from .grid import mac_grid
+
+
+def _laplacian_1d(n, h):
+    """一维 Neumann 二阶差分矩阵 (n, n)。"""
+    main = -2.0 * np.ones(n)
+    main[0] += 1.0
+    main[-1] += 1.0
+    off = np.ones(n - 1)
+    return sp.diags([off, main, off], [-1, 0, 1]) / h ** 2
+
+
+def neumann_laplacian(nx, ny, dx, dy):
+    """
+    组装 Neumann 5 点 Laplace 稀疏矩阵 (ny*nx, ny*nx)。
+
+    未知量按 p[j, i] 的行优先 (C 序) 展开，即 k = j * nx + i。
+    """
+    A = sp.kron(sp.identity(ny), _laplacian_1d(nx, dx)) + \
+        sp.kron(_laplacian_1d(ny, dy), sp.identity(nx))
+    return A.tocsc()
+
+
+# LU 分解的缓存只保留最近两种网格：400^2 以上的分解占用数百 MB，长期运行的进程
+# （Streamlit 会话、参数扫描）中不应无界累积；两项足够直接法与多重网格最粗层共存。
+@lru_cache(maxsize=2)
+def direct_factor(nx, ny, dx, dy):
+    """
+    组装并分解 PPE 算子，返回回代函数 solve(rhs) -> p (一维)。
+
+    Neumann 算子奇异（零空间为常数），这里钉住第 0 个单元 (p[0, 0] = 0)：
+    将其所在行、列替换为单位行/列，矩阵保持对称且非奇异。
+    只要右端项满足相容条件 (sum(b) = 0)，钉住后的解与原问题只差一个常数。
+
+    结果按 (nx, ny, dx, dy) 缓存（最近两种网格），同一进程（如 Streamlit 会话）中重复计算可直接复用。
+    """
+    A = neumann_laplacian(nx, ny, dx, dy).tolil()
+    A[0, :] = 0.0
+    A[:, 0] = 0.0
+    A[0, 0] = 1.0
+    return factorized(A.tocsc())
+
+
+def solve_direct(b, dx, dy):
+    """直接法求解 PPE：一次回代即得压力场 (ny, nx)。"""
+    ny, nx = b.shape
+    solve = direct_factor(nx, ny, dx, dy)
+    rhs = b.ravel() - np.mean(b)  # 投影到相容子空间
+    rhs[0] = 0.0
+    return solve(rhs).reshape(ny, nx)
+
+
+@lru_cache(maxsize=8)
+def dct_eigenvalues(nx, ny, dx, dy):
+    """
+    Neumann 5 点 Laplace 算子在 DCT-II 基下的特征值 (ny, nx)。
+
+    ghost cell 等于边界单元相当于半点对称延拓，DCT-II 的基函数
+    cos(pi * k * (i + 1/2) / n) 恰好是其特征向量，特征值为 (2 cos(pi k / n) - 2) / h^2。
+    零模态 (0, 0) 对应常数零空间，置 1 仅为避免除零，求解时该模态直接置 0。
+    """
+    lam_x = (2.0 * np.cos(np.pi * np.arange(nx) / nx) - 2.0) / dx ** 2
+    lam_y = (2.0 * np.cos(np.pi * np.arange(ny) / ny) - 2.0) / dy ** 2
+    lam = lam_y[:, None] + lam_x[None, :]
+    lam[0, 0] = 1.0
+    return lam
+
+
+def solve_fft(b, dx, dy):
+    """DCT 快速泊松求解：O(N log N)，无迭代，不依赖 Ptol。仅适用于均匀网格。"""
+    ny, nx = b.shape
+    b_hat = dctn(b, type=2, norm="ortho")
+    b_hat /= dct_eigenvalues(nx, ny, dx, dy)
+    b_hat[0, 0] = 0.0  # 去掉常数模态，等价于投影到相容子空间
+    return idctn(b_hat, type=2, norm="ortho")
+
+
+# -----------------------------------------------------------------------------
+# 拉伸网格：变系数 Laplace 算子
+# -----------------------------------------------------------------------------
+
+def _variable_laplacian_1d(h, dc):
+    """
+    一维变系数 Neumann 算子：(L p)_i = ((p_{i+1} - p_i) / dc_{i+1} - (p_i - p_{i-1}) / dc_i) / h_i。
+
+    h 为单元宽度 (n,)，dc 为相邻单元中心距离 (n+1,)；边界面上的梯度为 0。
+    """
+    a_w = 1.0 / (h * dc[:-1])
+    a_e = 1.0 / (h * dc[1:])
+    a_w[0] = 0.0
+    a_e[-1] = 0.0
+    return sp.diags([a_w[1:], -(a_w + a_e), a_e[:-1]], [-1, 0, 1])
+
+
+def stretched_laplacian(grid):
+    """组装拉伸网格上的 Neumann 5 点 Laplace 稀疏矩阵（按单元面积加权后对称）。"""
+    A = sp.kron(sp.identity(grid.ny), _variable_laplacian_1d(grid.hx, grid.dxc)) + \
+        sp.kron(_variable_laplacian_1d(grid.hy, grid.dyc), sp.identity(grid.nx))
+    return A.tocsc()
+
+
+@lru_cache(maxsize=2)
+def stretched_direct_factor(nx, ny, stretch, factor):
+    """拉伸网格 PPE 算子的分解（钉住 p[0, 0]，同 direct_factor），按网格参数缓存。"""
+    A = stretched_laplacian(mac_grid(nx, ny, stretch, factor)).tolil()
+    A[0, :] = 0.0
+    A[:, 0] = 0.0
+    A[0, 0] = 1.0
+    return factorized(A.tocsc())
+
+
+def solve_direct_stretched(b, grid):
+    """拉伸网格上的直接法：b 须已按单元面积加权投影到相容子空间（见 kernels_stretched.ppe_source）。"""
+    solve = stretched_direct_factor(grid.nx, grid.ny, grid.stretch, grid.factor)
+    rhs = np.array(b, dtype=np.float64).ravel()
+    rhs[0] = 0.0
+    return solve(rhs).reshape(grid.ny, grid.nx)
+
+
+def stretched_red_black_views(p_pad, b, grid):
+    """
+    拉伸网格上的红黑子格点视图，每个子格点保存
+    (本体, 东, 西, 北, 南, 源项, c_E, c_W, c_N, c_S, c_b, 临时数组, 临时数组)，
+    c_k = a_k / a_P、c_b = 1 / a_P 为该子格点上的变系数；边界面的系数为 0（Neumann）。
+    """
+    ny, nx = b.shape
+    a_e = np.broadcast_to(1.0 / (grid.hx * grid.dxc[1:]), (ny, nx)).copy()
+    a_w = np.broadcast_to(1.0 / (grid.hx * grid.dxc[:-1]), (ny, nx)).copy()
+    a_n = np.broadcast_to((1.0 / (grid.hy * grid.dyc[1:]))[:, None], (ny, nx)).copy()
+    a_s = np.broadcast_to((1.0 / (grid.hy * grid.dyc[:-1]))[:, None], (ny, nx)).copy()
+    a_e[:, -1] = a_w[:, 0] = a_n[-1, :] = a_s[0, :] = 0.0
+    a_p = a_e + a_w + a_n + a_s
+    coeffs = [(a / a_p).astype(p_pad.dtype) for a in (a_e, a_w, a_n, a_s)] + [(1.0 / a_p).astype(p_pad.dtype)]
+
+    colors = []
+    for parities in (((0, 0), (1, 1)), ((0, 1), (1, 0))):
+        group = []
+        for pj, pi in parities:
+            sj, si = 1 + pj, 1 + pi
+            center = p_pad[sj:ny + 1:2, si:nx + 1:2]
+            if center.size == 0:
+                continue
+            group.append((
+                center,
+                p_pad[sj:ny + 1:2, si + 1:nx + 2:2],  # 东
+                p_pad[sj:ny + 1:2, si - 1:nx:2],      # 西
+                p_pad[sj + 1:ny + 2:2, si:nx + 1:2],  # 北
+                p_pad[sj - 1:ny:2, si:nx + 1:2],      # 南
+                b[pj::2, pi::2],
+                *(c[pj::2, pi::2] for c in coeffs),
+                np.empty(center.shape, dtype=p_pad.dtype),
+                np.empty(center.shape, dtype=p_pad.dtype),
+            ))
+        colors.append(group)
+    return colors
+
+
+def _sor_update_stretched(center, east, west, north, south, src, c_e, c_w, c_n, c_s, c_b, t1, t2, omega):
+    """变系数子格点更新：p = (1 - omega) p + omega (sum_k c_k p_k - c_b b)。"""
+    np.multiply(east, c_e, out=t1)
+    np.multiply(west, c_w, out=t2)
+    t1 += t2
+    np.multiply(north, c_n, out=t2)
+    t1 += t2
+    np.multiply(south, c_s, out=t2)
+    t1 += t2
+    np.multiply(src, c_b, out=t2)
+    t1 -= t2
+    if omega != 1.0:
+        center *= 1.0 - omega
+        t1 *= omega
+        center += t1
+    else:
+        center[...] = t1
+
+
+def rb_sweep_stretched(p_pad, colors, omega):
+    """拉伸网格上的一次红黑 SOR 扫描（colors 由 stretched_red_black_views 构造）。"""
+    for group in colors:
+        for item in group:
+            _sor_update_stretched(*item, omega)
+
+
+# -----------------------------------------------------------------------------
+# 红黑 SOR 松弛与几何多重网格
+# -----------------------------------------------------------------------------
+
+def apply_neumann_ghosts(p_pad):
+    """将 Neumann 边界条件写入 ghost cells：ghost = 相邻的边界单元。"""
+    p_pad[0, 1:-1] = p_pad[1, 1:-1]    # Bottom
+    p_pad[-1, 1:-1] = p_pad[-2, 1:-1]  # Top
+    p_pad[1:-1, 0] = p_pad[1:-1, 1]    # Left
+    p_pad[1:-1, -1] = p_pad[1:-1, -2]  # Right
+
+
+def red_black_views(p_pad, b, bands=None):
+    """
+    预先构造红黑子格点的跨步视图，供 rb_sweep 原地更新。
+
+    红色单元 (j + i 为偶数) 与黑色单元各由两个 [::2] 子格点组成；每个子格点保存
+    (本体, 东, 西, 北, 南, 源项, 临时数组, 临时数组)。视图只在构建求解器时创建一次，
+    扫描时不再做布尔掩码的 gather / scatter。
+
+    bands 为行区间列表 [(j0, j1), ...]（默认整个区域），每个行带单独构造子格点视图，
+    以便同一颜色的各行带并行更新。
+    """
+    ny, nx = b.shape
+    if bands is None:
+        bands = [(0, ny)]
+    colors = []
+    for parities in (((0, 0), (1, 1)), ((0, 1), (1, 0))):
+        group = []
+        for j0, j1 in bands:
+            for pj, pi in parities:
+                jb = j0 + (pj - j0) % 2  # 行带内第一个满足奇偶性的行
+                sj, si = 1 + jb, 1 + pi
+                center = p_pad[sj:j1 + 1:2, si:nx + 1:2]
+                if center.size == 0:
+                    continue
+                group.append((
+                    center,
+                    p_pad[sj:j1 + 1:2, si + 1:nx + 2:2],  # 东
+                    p_pad[sj:j1 + 1:2, si - 1:nx:2],      # 西
+                    p_pad[sj + 1:j1 + 2:2, si:nx + 1:2],  # 北
+                    p_pad[sj - 1:j1:2, si:nx + 1:2],      # 南
+                    b[jb:j1:2, pi::2],
+                    np.empty(center.shape, dtype=p_pad.dtype),
+                    np.empty(center.shape, dtype=p_pad.dtype),
+                ))
+        colors.append(group)
+    return colors
+
+
+def jacobi_sweep(p_pad, b, dx2, dy2, out, tmp):
+    """一次 Jacobi 扫描：由 p_pad 计算新的内部压力写入 out（tmp 为同形临时数组）。"""
+    denom = 2 * (dx2 + dy2)
+    apply_neumann_ghosts(p_pad)
+    np.add(p_pad[1:-1, 2:], p_pad[1:-1, :-2], out=out)
+    out *= dy2 / denom
+    np.add(p_pad[2:, 1:-1], p_pad[:-2, 1:-1], out=tmp)
+    tmp *= dx2 / denom
+    out += tmp
+    np.multiply(b, dx2 * dy2 / denom, out=tmp)
+    out -= tmp
+    return out
+
+
+def _sor_update(center, east, west, north, south, src, t1, t2, c_x, c_y, c_b, omega):
+    """对一个子格点执行 p = (1 - omega) p + omega * p_gs。"""
+    np.add(east, west, out=t1)
+    t1 *= c_x
+    np.add(north, south, out=t2)
+    t2 *= c_y
+    t1 += t2
+    np.multiply(src, c_b, out=t2)
+    t1 -= t2
+    if omega != 1.0:
+        center *= 1.0 - omega
+        center += t1
+    else:
+        center[...] = t1
+
+
+def rb_sweep(p_pad, colors, dx2, dy2, omega, reverse=False, pool=None):
+    """
+    一次红黑排序 SOR 扫描，原地更新 p_pad 的内部单元。
+
+    colors 由 red_black_views(p_pad, b) 构造。每半步前刷新 ghost cells，
+    使黑色更新看到红色更新后的边界值。reverse=True 时先黑后红，
+    用于多重网格后光滑，使 V-cycle 保持对称。
+    给定线程池 pool 时，同一颜色的各子格点并行更新，红 / 黑之间同步一次。
+    """
+    denom = 2 * (dx2 + dy2)
+    coeffs = (omega * dy2 / denom, omega * dx2 / denom, omega * dx2 * dy2 / denom, omega)
+    for group in (colors[::-1] if reverse else colors):
+        apply_neumann_ghosts(p_pad)
+        if pool is None:
+            for item in group:
+                _sor_update(*item, *coeffs)
+        else:
+            for _ in pool.map(lambda item: _sor_update(*item, *coeffs), group):
+                pass
+
+
+def apply_laplacian(p_pad, dx2, dy2):
+    """无矩阵地作用 Neumann 5 点 Laplace 算子：返回 L p（p 取自 p_pad 内部单元）。"""
+    apply_neumann_ghosts(p_pad)
+    p_c = p_pad[1:-1, 1:-1]
+    return (p_pad[1:-1, 2:] - 2 * p_c + p_pad[1:-1, :-2]) / dx2 + \
+           (p_pad[2:, 1:-1] - 2 * p_c + p_pad[:-2, 1:-1]) / dy2
+
+
+def neumann_residual(p_pad, b, dx2, dy2, out=None):
+    """残差 r = b - L p（L 为 Neumann 5 点 Laplace 算子）。"""
+    lap = apply_laplacian(p_pad, dx2, dy2)
+    if out is None:
+        return b - lap
+    np.subtract(b, lap, out=out)
+    return out
+
+
+def restrict(r):
+    """限制算子：粗网格单元取其覆盖的 2x2 细网格单元平均值（单元中心格式）。"""
+    return 0.25 * (r[0::2, 0::2] + r[1::2, 0::2] + r[0::2, 1::2] + r[1::2, 1::2])
+
+
+def prolong(e_c, out):
+    """
+    延拓算子：单元中心双线性插值，结果累加到细网格 out 上。
+
+    每个细网格单元取 9/16 本粗单元 + 3/16 两个相邻粗单元 + 1/16 对角粗单元；
+    粗网格边界外的邻点用 edge 延拓，与 Neumann 条件 (dp/dn = 0) 一致。
+    """
+    e_pad = np.pad(e_c, 1, mode='edge')
+    c = e_pad[1:-1, 1:-1]
+    rows = (e_pad[:-2, 1:-1], e_pad[2:, 1:-1])  # 下 / 上邻点
+    cols = (e_pad[1:-1, :-2], e_pad[1:-1, 2:])  # 左 / 右邻点
+    diag = ((e_pad[:-2, :-2], e_pad[:-2, 2:]), (e_pad[2:, :-2], e_pad[2:, 2:]))
+    for a in (0, 1):
+        for s in (0, 1):
+            out[a::2, s::2] += (9.0 * c + 3.0 * rows[a] + 3.0 * cols[s] + diag[a][s]) / 16.0
+
+
+def _transfer_1d(n, m):
+    """
+    同一区间上 n 个细单元与 m 个粗单元之间的一维转移矩阵 (P, R)（稀疏，单元中心格式）。
+
+    P (n x m) 在细单元中心对粗单元值线性插值，两端之外取端点值（与 Neumann 条件一致）；
+    R = (m / n) P^T (m x n)，保持网格函数的均值不变，粗网格方程因此仍满足相容条件。
+    """
+    pos = np.clip((np.arange(n) + 0.5) * m / n - 0.5, 0.0, m - 1)
+    i0 = np.minimum(np.floor(pos).astype(int), max(m - 2, 0))
+    w = pos - i0
+    rows = np.arange(n)
+    P = sp.csr_matrix((np.concatenate([1.0 - w, w]), (np.concatenate([rows, rows]),
+                                                      np.concatenate([i0, np.minimum(i0 + 1, m - 1)]))),
+                      shape=(n, m))
+    return P, (P.T * (m / n)).tocsr()
+
+
+def _pair_average_1d(n):
+    """n（偶数）个细单元两两平均到 n / 2 个粗单元的一维限制矩阵（与 restrict 相同）。"""
+    cols = np.arange(n)
+    return sp.csr_matrix((np.full(n, 0.5), (cols // 2, cols)), shape=(n // 2, n))
+
+
+class MultigridSolver:
+    """
+    单元中心几何多重网格 (V-cycle) PPE 求解器。
+
+    - 光滑：复用红黑排序松弛 (rb_sweep, omega=1 即红黑 Gauss-Seidel)。
+    - 限制 / 延拓：2x2 平均 / 双线性插值，均保持 Neumann 边界条件。
+    - 粗网格：各层按粗化后的网格间距重新离散，最粗层用缓存的稀疏直接法精确求解。
+      偶数方向减半 (2dx)；奇数方向取 (n + 1) / 2 个等距粗单元（与细网格不嵌套），
+      该层的限制 / 延拓改用按方向分离的线性插值矩阵 (_transfer_1d)。
+      因此任意 nx、ny 都能粗化到最小边不足 4 个单元为止，2 的幂的倍数时各层完全嵌套。
+    每个 V-cycle 的开销与单元数成正比。
+
+    参数:
+        levels: 最多使用的网格层数（含最细层）。None 表示尽可能粗化。
+        pre_smooth, post_smooth: 每层前 / 后光滑次数。
+        dtype: 各层工作数组的浮点类型（最粗层的直接法始终以 float64 求解）。
+    """
+
+    def __init__(self, nx, ny, dx, dy, levels=None, pre_smooth=2, post_smooth=2, dtype=np.float64):
+        if levels is not None and int(levels) < 1:
+            raise ValueError("mg_levels 必须是 None 或正整数")
+        self.pre_smooth = pre_smooth
+        self.post_smooth = post_smooth
+        self.levels = []
+        while True:
+            lvl = {
+                "nx": nx, "ny": ny, "dx2": dx ** 2, "dy2": dy ** 2, "dx": dx, "dy": dy,
+                "p_pad": np.zeros((ny + 2, nx + 2), dtype=dtype),
+                "b": np.zeros((ny, nx), dtype=dtype),
+                "r": np.zeros((ny, nx), dtype=dtype),
+            }
+            lvl["colors"] = red_black_views(lvl["p_pad"], lvl["b"])
+            lvl["transfer"] = None
+            self.levels.append(lvl)
+            if levels is not None and len(self.levels) >= int(levels):
+                break
+            if min(nx, ny) < 4:
+                break
+            mx, my = (nx + 1) // 2, (ny + 1) // 2
+            if nx % 2 or ny % 2:
+                # 非嵌套粗化：(Ry, Rx, Py, Px)，偶数方向仍为两两平均 + 线性插值
+                (Px, Rx), (Py, Ry) = _transfer_1d(nx, mx), _transfer_1d(ny, my)
+                if nx % 2 == 0:
+                    Rx = _pair_average_1d(nx)
+                if ny % 2 == 0:
+                    Ry = _pair_average_1d(ny)
+                lvl["transfer"] = tuple(m.astype(dtype) for m in (Ry, Rx, Py, Px))
+            nx, ny, dx, dy = mx, my, dx * lvl["nx"] / mx, dy * lvl["ny"] / my
+
+    def _vcycle(self, k):
+        lvl = self.levels[k]
+        p_pad, b = lvl["p_pad"], lvl["b"]
+        if k == len(self.levels) - 1:
+            p_pad[1:-1, 1:-1] = solve_direct(b, lvl["dx"], lvl["dy"])
+            return
+
+        args = (lvl["colors"], lvl["dx2"], lvl["dy2"], 1.0)
+        for _ in range(self.pre_smooth):
+            rb_sweep(p_pad, *args)
+
+        coarse = self.levels[k + 1]
+        neumann_residual(p_pad, b, lvl["dx2"], lvl["dy2"], out=lvl["r"])
+        transfer = lvl["transfer"]
+        if transfer is None:
+            coarse["b"][...] = restrict(lvl["r"])
+        else:
+            Ry, Rx = transfer[:2]
+            coarse["b"][...] = Ry @ (Rx @ lvl["r"].T).T
+        coarse["p_pad"].fill(0.0)
+        self._vcycle(k + 1)
+        e_c = coarse["p_pad"][1:-1, 1:-1]
+        if transfer is None:
+            prolong(e_c, p_pad[1:-1, 1:-1])
+        else:
+            Py, Px = transfer[2:]
+            p_pad[1:-1, 1:-1] += Py @ (Px @ e_c.T).T
+
+        for _ in range(self.post_smooth):
+            rb_sweep(p_pad, *args, reverse=True)
+
+    def precondition(self, r, out):
+        """以零初值对 L e = r 执行一次 V-cycle，结果写入 out（用作 PCG 预条件子）。"""
+        top = self.levels[0]
+        top["b"][...] = r
+        top["p_pad"].fill(0.0)
+        self._vcycle(0)
+        out[...] = top["p_pad"][1:-1, 1:-1]
+        return out
+
+    def solve(self, b, p0=None, tol=1e-6, max_cycles=20, out=None):
+        """
+        以 p0 为初值（热启动）求解 L p = b，返回 (p, cycles)。
+
+        收敛判据为相对残差 ||b - L p||_2 <= tol * ||b||_2。
+        给定 out 时结果写入 out（可与 p0 为同一数组），否则返回新数组。
+        """
+        top = self.levels[0]
+        top["b"][...] = b
+        top["b"] -= np.mean(b)  # 投影到相容子空间
+        p_pad = top["p_pad"]
+        if p0 is None:
+            p_pad.fill(0.0)
+        else:
+            p_pad[1:-1, 1:-1] = p0
+
+        b_norm = np.linalg.norm(top["b"])
+        cycles = 0
+        r = neumann_residual(p_pad, top["b"], top["dx2"], top["dy2"], out=top["r"])
+        while cycles < max_cycles and np.linalg.norm(r) > tol * b_norm:
+            self._vcycle(0)
+            cycles += 1
+            r = neumann_residual(p_pad, top["b"], top["dx2"], top["dy2"], out=top["r"])
+        if out is None:
+            return p_pad[1:-1, 1:-1].copy(), cycles
+        out[...] = p_pad[1:-1, 1:-1]
+        return out, cycles
+
+
+class PCGSolver:
+    """
+    无矩阵预条件共轭梯度 (PCG) PPE 求解器。
+
+    - 算子：Neumann 5 点 Laplace 算子，直接在 ghost-padded 数组上作用 (apply_laplacian)。
+    - 相容性：右端项投影到零均值子空间，搜索方向同样去掉常数分量，避免在零空间上停滞。
+    - 预条件：一次多重网格 V-cycle。V-cycle 并非严格对称，因此 beta 采用
+      Polak-Ribiere 形式（flexible CG），对预条件子的轻微非对称不敏感。
+    L 与预条件子均为负定，CG 迭代与对 -L 求解完全等价。
+    """
+
+    def __init__(self, nx, ny, dx, dy, mg_levels=None, dtype=np.float64):
+        self.dx2 = dx ** 2
+        self.dy2 = dy ** 2
+        self.dtype = np.dtype(dtype)
+        self.mg = MultigridSolver(nx, ny, dx, dy, levels=mg_levels, dtype=dtype)
+        self.p_pad = np.zeros((ny + 2, nx + 2), dtype=dtype)  # 搜索方向（带 ghost cells）
+        self.r = np.zeros((ny, nx), dtype=dtype)
+        self.z = np.zeros((ny, nx), dtype=dtype)
+
+    def _precondition(self, r):
+        z = self.mg.precondition(r, self.z)
+        z -= np.mean(z)
+        return z
+
+    def solve(self, b, p0=None, tol=1e-6, max_iter=2000, out=None):
+        """
+        以 p0 为初值（热启动）求解 L p = b，返回 (p, iterations)。
+
+        收敛判据为相对残差 ||b - L p||_2 <= tol * ||b||_2。
+        给定 out 时直接在 out 上迭代（可与 p0 为同一数组），否则返回新数组。
+        """
+        ny, nx = b.shape
+        b = b - np.mean(b)  # 投影到相容子空间
+        x = np.zeros((ny, nx), dtype=self.dtype) if out is None else out
+        if p0 is None:
+            x.fill(0.0)
+        elif p0 is not x:
+            x[...] = p0
+
+        d_pad = self.p_pad
+        d = d_pad[1:-1, 1:-1]
+        d[...] = x
+        r = neumann_residual(d_pad, b, self.dx2, self.dy2, out=self.r)
+
+        b_norm = np.linalg.norm(b)
+        if np.linalg.norm(r) <= tol * b_norm:
+            return x, 0
+
+        z = self._precondition(r)
+        d[...] = z
+        rz = np.vdot(r, z)
+        z_old = z.copy()
+
+        it = 0
+        for it in range(1, max_iter + 1):
+            q = apply_laplacian(d_pad, self.dx2, self.dy2)
+            alpha = rz / np.vdot(d, q)
+            x += alpha * d
+            r -= alpha * q
+            if np.linalg.norm(r) <= tol * b_norm:
+                break
+
+            z = self._precondition(r)
+            beta = np.vdot(r, z - z_old) / rz
+            rz = np.vdot(r, z)
+            z_old[...] = z
+            d *= beta
+            d += z
+        return x, it
+
+
+# -----------------------------------------------------------------------------
+# 混合精度：float32 内层求解 + float64 迭代修正
+# -----------------------------------------------------------------------------
+
+class MixedPrecisionSolver:
+    """
+    混合精度 PPE 求解器 (iterative refinement)。
+
+    外层在 float64 中计算残差 r = b - L p，内层以 float32 近似求解修正方程 L e = r，
+    再在 float64 中更新 p += e，直至相对残差 ||b - L p||_2 <= tol * ||b||_2。
+    内层的主要开销（松弛扫描、V-cycle、DCT）按 float32 计算，读写的字节数减半；
+    最终精度由 float64 残差决定，不受单精度舍入限制。
+
+    参数:
+        method: 内层求解器，'fft'、'multigrid'、'pcg'、'sor' 或 'gauss_seidel'。
+        omega: sor 的松弛因子。
+        inner_tol: 内层求解的相对残差容差（float32 下不宜小于约 1e-5）。
+        max_refine: 外层修正的最多次数。
+    """
+
+    METHODS = ("fft", "multigrid", "pcg", "sor", "gauss_seidel")
+
+    def __init__(self, nx, ny, dx, dy, method, omega=1.8, mg_levels=None, mg_cycles=20,
+                 inner_tol=1e-3, max_refine=10, max_sweeps=2000):
+        if method not in self.METHODS:
+            raise ValueError(f"混合精度 PPE 不支持压力求解器: {method}")
+        self.method = method
+        self.dx, self.dy = dx, dy
+        self.dx2, self.dy2 = dx ** 2, dy ** 2
+        self.omega = 1.0 if method == "gauss_seidel" else omega
+        self.mg_cycles = mg_cycles
+        self.inner_tol = inner_tol
+        self.max_refine = max_refine
+        self.max_sweeps = max_sweeps
+
+        self.r = np.zeros((ny, nx))
+        self.r32 = np.zeros((ny, nx), dtype=np.float32)
+        self.e32 = np.zeros((ny, nx), dtype=np.float32)
+        self.mg = self.pcg = None
+        if method == "multigrid":
+            self.mg = MultigridSolver(nx, ny, dx, dy, levels=mg_levels, dtype=np.float32)
+        elif method == "pcg":
+            self.pcg = PCGSolver(nx, ny, dx, dy, mg_levels=mg_levels, dtype=np.float32)
+        elif method in ("sor", "gauss_seidel"):
+            self.e_pad = np.zeros((ny + 2, nx + 2), dtype=np.float32)
+            self.colors = red_black_views(self.e_pad, self.r32)
+            self.res32 = np.zeros((ny, nx), dtype=np.float32)
+
+    def _inner(self):
+        """以 float32 近似求解 L e = r32，结果写入 e32。"""
+        r32, e32 = self.r32, self.e32
+        if self.method == "fft":
+            np.copyto(e32, solve_fft(r32, self.dx, self.dy))
+        elif self.method == "multigrid":
+            self.mg.solve(r32, tol=self.inner_tol, max_cycles=self.mg_cycles, out=e32)
+        elif self.method == "pcg":
+            self.pcg.solve(r32, tol=self.inner_tol, max_iter=self.max_sweeps, out=e32)
+        else:
+            # 红黑 SOR：零初值，每 10 次扫描检查一次相对残差
+            e_pad = self.e_pad
+            e_pad.fill(0.0)
+            r_norm = np.linalg.norm(r32)
+            for it in range(self.max_sweeps):
+                rb_sweep(e_pad, self.colors, self.dx2, self.dy2, self.omega)
+                if it % 10 == 9:
+                    neumann_residual(e_pad, r32, self.dx2, self.dy2, out=self.res32)
+                    if np.linalg.norm(self.res32) <= self.inner_tol * r_norm:
+                        break
+            np.copyto(e32, e_pad[1:-1, 1:-1])
+
+    def solve(self, b, p_pad, tol=1e-6):
+        """
+        以 p_pad 内部的当前压力为初值求解 L p = b（float64，原地更新），返回外层修正次数。
+
+        b 应已投影到零均值子空间。
+        """
+        p = p_pad[1:-1, 1:-1]
+        b_norm = np.linalg.norm(b)
+        refine = 0
+        while refine < self.max_refine:
+            r = neumann_residual(p_pad, b, self.dx2, self.dy2, out=self.r)
+            r -= r.mean()
+            if np.linalg.norm(r) <= tol * b_norm:
+                break
+            np.copyto(self.r32, r)
+            self._inner()
+            p += self.e32
+            refine += 1
+        return refine
@@ -0,0 +1,189 @@
+"""
+求解进度显示与停止请求的回调接口。
+
+时间循环只通过一个进度对象 (ProgressSink) 与外界交互：
+
+    sink.start(step, total)          计算开始（step 为起始步数，续算时不为 0）
+    sink.on_progress(step, stats)    每 sink.every 步调用一次，step 为已完成的步数
+    sink.should_cancel()             紧随 on_progress 调用，返回 True 时停止计算
+    sink.finish(step, status)        计算结束，status 为 converged / diverged / canceled / max_iter
+
+stats 为当前状态的字典：phase ("march" 时间推进 / "newton" 定常模式的 Newton 迭代)、
+total，以及求解器提供的 dt、time、error（最近一次检查的相对速度变化）等。
+Newton 阶段的 step 为 Newton 迭代次数，stats 中给出 residual。
+
+every 为 None 的进度对象（NullProgress）在时间循环中从不被调用，也不导入任何界面库。
+适配器：NullProgress、TqdmProgress、StreamlitProgress 与包装普通函数的 Callbacks；
+make_progress 按名称或 "auto"（检测 Streamlit 运行环境）构造。
+"""
+
+
+def _cadence(every):
+    """校验回调间隔（正整数）。"""
+    try:
+        every = int(every)
+    except (TypeError, ValueError):
+        raise ValueError("progress_every 必须是正整数")
+    if every <= 0:
+        raise ValueError("progress_every 必须是正整数")
+    return every
+
+
+def in_streamlit():
+    """当前是否在 Streamlit 脚本中运行（未安装 streamlit 时为 False）。"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx() is not None
+    except Exception:
+        return False
+
+
+class ProgressSink:
+    """进度对象的基类：各方法均为空操作，子类按需覆盖。every 为 None 时不回调。"""
+
+    every = None
+
+    def start(self, step, total):
+        pass
+
+    def on_progress(self, step, stats):
+        pass
+
+    def should_cancel(self):
+        return False
+
+    def finish(self, step, status):
+        pass
+
+
+class NullProgress(ProgressSink):
+    """不显示进度、不响应停止请求（参数扫描的工作进程、服务端调用）。"""
+
+
+class Callbacks(ProgressSink):
+    """把普通函数 on_progress(step, stats) 与 should_cancel() 包装为进度对象，每 every 步调用一次。"""
+
+    def __init__(self, on_progress=None, should_cancel=None, every=100):
+        self._on_progress = on_progress
+        self._should_cancel = should_cancel
+        self.every = _cadence(every)
+
+    def on_progress(self, step, stats):
+        if self._on_progress is not None:
+            self._on_progress(step, stats)
+
+    def should_cancel(self):
+        return self._should_cancel is not None and bool(self._should_cancel())
+
+
+class TqdmProgress(ProgressSink):
+    """命令行 tqdm 进度条，每 every 步更新一次。"""
+
+    def __init__(self, every=10, desc="计算进度"):
+        self.every = _cadence(every)
+        self.desc = desc
+        self.bar = None
+
+    def start(self, step, total):
+        from tqdm import tqdm
+        self.bar = tqdm(desc=self.desc, unit="step", initial=step, total=total)
+
+    def on_progress(self, step, stats):
+        if stats.get("phase") == "newton":
+            self.bar.set_postfix_str(f"Newton {step}: {stats['residual']:.2e}")
+            return
+        self.bar.update(step - self.bar.n)
+        postfix = {key: stats[key] for key in ("active",) if key in stats}
+        if stats.get("error") is not None:
+            postfix["error"] = f"{stats['error']:.2e}"
+        if postfix:
+            self.bar.set_postfix(postfix, refresh=False)
+
+    def finish(self, step, status):
+        if self.bar is None:
+            return
+        # 定常模式中 Newton 推进的步数不计入进度条
+        self.bar.update(max(min(step, self.bar.total) - self.bar.n, 0))
+        self.bar.close()
+        self.bar = None
+
+
+class StreamlitProgress(ProgressSink):
+    """Streamlit 进度条；停止请求读取 st.session_state[cancel_key]（由界面上的停止按钮设置）。"""
+
+    def __init__(self, every=50, cancel_key="cfd_cancel_requested"):
+        self.every = _cadence(every)
+        self.cancel_key = cancel_key
+        self.st = None
+        self.bar = None
+        self.total = None
+
+    def start(self, step, total):
+        import streamlit as st
+        self.st = st
+        self.total = total
+        self.bar = st.progress(0, text="准备开始计算...")
+
+    def on_progress(self, step, stats):
+        if stats.get("phase") == "newton":
+            pct = int(min(step / stats["total"], 1.0) * 100)
+            self.bar.progress(pct, text=f"Newton 迭代 {step}/{stats['total']}，残差 {stats['residual']:.2e}")
+            return
+        pct = int(min(max(step / self.total, 0.0), 1.0) * 100) if self.total else 100
+        self.bar.progress(pct, text=f"计算中... {pct}% ({step}/{self.total})")
+
+    def should_cancel(self):
+        # 注意：Streamlit 交互触发 rerun 后才会更新 session_state
+        try:
+            return bool(self.st.session_state.get(self.cancel_key, False))
+        except Exception:
+            return False
+
+    def finish(self, step, status):
+        if self.bar is None:
+            return
+        text = {
+            "canceled": f"已停止于第 {step} 步",
+            "diverged": f"计算发散于第 {step} 步",
+            "converged": f"计算完成：第 {step} 步收敛",
+        }.get(status, "计算完成")
+        self.bar.progress(100, text=text)
+
+
+PROGRESS_ADAPTERS = {"null": NullProgress, "tqdm": TqdmProgress, "streamlit": StreamlitProgress}
+
+
+def make_progress(progress="auto", every=None, on_progress=None, should_cancel=None):
+    """
+    构造进度对象。
+
+    参数:
+        progress: "auto"（在 Streamlit 脚本中为 StreamlitProgress，否则为 TqdmProgress）、
+            "streamlit"、"tqdm"、"null" 或 None（不显示），也可以是实现 ProgressSink 接口的对象。
+        every: 回调间隔（步），None 时取各适配器的默认值；只用于按名称构造的适配器。
+        on_progress, should_cancel: 普通回调函数。给出任一个时包装为 Callbacks
+            (默认每 100 步调用一次)，此时 progress 只能为 "auto" 或 None。
+    """
+    kwargs = {} if every is None else {"every": every}
+    if on_progress is not None or should_cancel is not None:
+        if progress not in ("auto", None):
+            raise ValueError("on_progress / should_cancel 不能与 progress 适配器同时使用")
+        return Callbacks(on_progress, should_cancel, **kwargs)
+    if progress is None:
+        progress = "null"
+    if isinstance(progress, str):
+        if progress == "auto":
+            progress = "streamlit" if in_streamlit() else "tqdm"
+        if progress not in PROGRESS_ADAPTERS:
+            raise ValueError(f"未知的进度显示方式: {progress}")
+        if progress == "null":
+            return NullProgress()
+        return PROGRESS_ADAPTERS[progress](**kwargs)
+    if every is not None:
+        raise ValueError("progress_every 只用于按名称构造的进度适配器")
+    if not hasattr(progress, "every"):
+        raise ValueError("进度对象缺少属性 every")
+    for name in ("start", "on_progress", "should_cancel", "finish"):
+        if not callable(getattr(progress, name, None)):
+            raise ValueError(f"进度对象缺少方法 {name}()")
+    return progress
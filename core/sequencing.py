@@ -0,0 +1,57 @@
+"""
+网格序列 (grid sequencing)：粗网格解向细网格的守恒插值。
+
+MAC 交错网格上按整数倍 (rx, ry) 加密：
+- u（垂直面）：x 方向在粗网格面之间线性插值，y 方向在每个粗单元内取常数；
+- v（水平面）：y 方向线性插值，x 方向取常数；
+- p（单元中心）：每个粗单元的值复制到其覆盖的 rx * ry 个细单元（保持单元平均）。
+这样每个细单元的面通量之和等于所在粗单元的通量，离散散度 (u_E - u_W)/dx + (v_N - v_S)/dy
+在细网格上逐单元保持为粗网格的值，无散场插值后仍然无散。
+"""
+import numpy as np
+
+
+def normalize_sequence(grid_sequence, nx, ny):
+    """
+    校验网格序列，返回 [(nx_0, ny_0), ..., (nx, ny)]（末级缺省时自动补上目标网格）。
+
+    每一级在两个方向上都必须是上一级的整数倍，且不超过目标网格。
+    """
+    try:
+        levels = [(int(a), int(b)) for a, b in grid_sequence]
+    except (TypeError, ValueError):
+        raise ValueError("grid_sequence 必须是 (nx, ny) 二元组的列表")
+    if not levels or levels[-1] != (nx, ny):
+        levels.append((nx, ny))
+    for (nx_c, ny_c), (nx_f, ny_f) in zip(levels[:-1], levels[1:]):
+        if nx_c < 2 or ny_c < 2:
+            raise ValueError("grid_sequence 中的网格尺寸至少为 2")
+        if nx_f <= nx_c and ny_f <= ny_c:
+            raise ValueError("grid_sequence 必须逐级加密")
+        if nx_f % nx_c or ny_f % ny_c:
+            raise ValueError(f"网格 {nx_f}x{ny_f} 不是 {nx_c}x{ny_c} 的整数倍加密")
+    return levels
+
+
+def _lerp_faces(a, r, axis):
+    """沿 axis 把 n+1 个面上的值线性插值到 r*n+1 个面上。"""
+    n = a.shape[axis] - 1
+    t = np.arange(r * n + 1) / r
+    i = np.minimum(t.astype(int), n - 1)
+    w = t - i
+    lo = np.take(a, i, axis=axis)
+    hi = np.take(a, i + 1, axis=axis)
+    shape = [1] * a.ndim
+    shape[axis] = -1
+    w = w.reshape(shape)
+    return lo * (1.0 - w) + hi * w
+
+
+def prolong_mac(u, v, p, nx, ny):
+    """把粗网格上的 (u, v, p) 插值到 nx x ny 的细 MAC 网格。"""
+    ny_c, nx_c = p.shape
+    rx, ry = nx // nx_c, ny // ny_c
+    u_f = np.repeat(_lerp_faces(u, rx, axis=1), ry, axis=0)
+    v_f = np.repeat(_lerp_faces(v, ry, axis=0), rx, axis=1)
+    p_f = np.repeat(np.repeat(p, ry, axis=0), rx, axis=1)
+    return u_f, v_f, p_f
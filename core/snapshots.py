@@ -0,0 +1,178 @@
+"""
+磁盘快照存储：按帧流式写入内存映射文件，按需读取。
+
+目录结构:
+    u.dat / v.dat / p.dat   各场按帧连续存放的原始数组 (C 顺序)，由 np.memmap 读写
+    index.json              元数据：各场形状与 dtype；close() 后另含帧数与每帧对应的时间步
+    steps.txt               写入过程中逐帧追加的时间步（每行一个 JSON 值），close() 后删除
+
+写入端 SnapshotStore 预分配 capacity 帧，写满后把文件扩大一倍并重新映射，
+内存中只保留映射本身与步数列表。index.json 只在创建、扩容与 close() 时原子地重写，
+每帧只向 steps.txt 追加一行，写入开销不随帧数增长；计算中断时按 steps.txt 的行数
+仍可读取已写入的帧。
+
+读取端 SnapshotFrames 是只读的惰性序列：len() 与下标访问与 list 相同，
+下标访问时才从映射中拷贝该帧，可直接替代 lid_driven_cavity_mac 返回的 u_list / v_list / p_list。
+"""
+import json
+import os
+
+import numpy as np
+
+_FIELDS = ("u", "v", "p")
+_INDEX = "index.json"
+_STEPS = "steps.txt"
+
+
+def _field_shapes(nx, ny):
+    return {"u": (ny, nx + 1), "v": (ny + 1, nx), "p": (ny, nx)}
+
+
+class SnapshotFrames:
+    """某个场的惰性帧序列（只读）。"""
+
+    def __init__(self, path, shape, dtype, count):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.count = int(count)
+        self._map = None
+
+    def _frames(self):
+        if self._map is None:
+            self._map = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self.count,) + self.shape)
+        return self._map
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        index = int(index)
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("快照下标越界")
+        return np.array(self._frames()[index])
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def __getstate__(self):
+        # 序列化时不携带映射本身
+        state = dict(self.__dict__)
+        state["_map"] = None
+        return state
+
+
+class SnapshotStore:
+    """
+    可增长的快照写入器。
+
+    用法:
+        store = SnapshotStore(directory, nx, ny)
+        store.append(u, v, p, step)
+        ...
+        u_frames, v_frames, p_frames = store.close()
+    """
+
+    def __init__(self, directory, nx, ny, capacity=16, dtype=np.float64):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.shapes = _field_shapes(nx, ny)
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.steps = []
+        self.capacity = 0
+        self.maps = {}
+        self._steps_file = open(os.path.join(self.directory, _STEPS), "w", encoding="utf-8")
+        self._grow(max(1, int(capacity)))
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.dat")
+
+    def _grow(self, capacity):
+        """把各场文件扩大到 capacity 帧并重新映射。"""
+        for name in _FIELDS:
+            old = self.maps.pop(name, None)
+            if old is not None:
+                old.flush()
+                del old
+            frame_bytes = int(np.prod(self.shapes[name])) * self.dtype.itemsize
+            mode = "r+b" if self.capacity > 0 else "w+b"
+            with open(self._path(name), mode) as f:
+                f.truncate(capacity * frame_bytes)
+            self.maps[name] = np.memmap(self._path(name), dtype=self.dtype, mode="r+",
+                                        shape=(capacity,) + self.shapes[name])
+        self.capacity = capacity
+        self._write_index(final=False)
+
+    def _write_index(self, final):
+        """写入 index.json；final 为 False 时不含帧数与步数（由 steps.txt 给出）。"""
+        index = {
+            "dtype": self.dtype.str,
+            "shapes": {name: list(shape) for name, shape in self.shapes.items()},
+        }
+        if final:
+            index.update(count=self.count, steps=self.steps)
+        tmp = os.path.join(self.directory, _INDEX + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, os.path.join(self.directory, _INDEX))
+
+    def append(self, u, v, p, step):
+        """追加一帧（step 为该帧对应的时间步）。"""
+        if self.count == self.capacity:
+            self._grow(2 * self.capacity)
+        for name, field in zip(_FIELDS, (u, v, p)):
+            self.maps[name][self.count] = field
+        self.count += 1
+        step = None if step is None else int(step)
+        self.steps.append(step)
+        self._steps_file.write(json.dumps(step) + "\n")
+        self._steps_file.flush()
+
+    def close(self):
+        """写回映射、把文件截断到实际帧数，返回 (u_frames, v_frames, p_frames)。"""
+        for name in _FIELDS:
+            frames = self.maps.pop(name)
+            frames.flush()
+            del frames
+            frame_bytes = int(np.prod(self.shapes[name])) * self.dtype.itemsize
+            with open(self._path(name), "r+b") as f:
+                f.truncate(self.count * frame_bytes)
+        self.capacity = self.count
+        self._write_index(final=True)
+        self._steps_file.close()
+        os.remove(os.path.join(self.directory, _STEPS))
+        return open_snapshots(self.directory)
+
+
+def _read_index(directory):
+    """读取 index.json；写入未正常结束（无 steps）时由 steps.txt 补上帧数与步数。"""
+    with open(os.path.join(directory, _INDEX), encoding="utf-8") as f:
+        index = json.load(f)
+    if "steps" not in index:
+        with open(os.path.join(directory, _STEPS), encoding="utf-8") as f:
+            # 最后一行可能只写了一半
+            lines = f.read().split("\n")[:-1]
+        index["steps"] = [json.loads(line) for line in lines]
+        index["count"] = len(index["steps"])
+    return index
+
+
+def open_snapshots(directory):
+    """打开已有的快照目录，返回 (u_frames, v_frames, p_frames)；帧步数见 snapshot_steps。"""
+    directory = os.fspath(directory)
+    index = _read_index(directory)
+    return tuple(
+        SnapshotFrames(os.path.join(directory, f"{name}.dat"), index["shapes"][name], index["dtype"], index["count"])
+        for name in _FIELDS
+    )
+
+
+def snapshot_steps(directory):
+    """快照目录中每帧对应的时间步列表。"""
+    return _read_index(os.fspath(directory))["steps"]
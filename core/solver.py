@@ -1,378 +1,1062 @@
+import time
+from collections import namedtuple
+from functools import partial
+
 import numpy as np
-from tqdm import tqdm
 
+from . import kernels, kernels_numba, kernels_stretched
+from .checkpoint import CheckpointWriter, load_checkpoint, pack_state, restore_ab2
+from .codec import SnapshotCodec, encoded_snapshots, snapshot_report
+from .grid import mac_grid
+from .kernels import ADIDiffusion, MACWorkspace, row_bands, stable_dt, velocity_change
+from .pressure import (MixedPrecisionSolver, MultigridSolver, PCGSolver, jacobi_sweep, neumann_laplacian,
+                       rb_sweep, rb_sweep_stretched, red_black_views, solve_direct, solve_direct_stretched,
+                       solve_fft, stretched_laplacian, stretched_red_black_views)
+from .progress import make_progress
+from .schemes import DIFFUSION_FACTOR, RK3_STAGES, AB2History, SSPRK3
+from .sequencing import normalize_sequence, prolong_mac
+from .snapshots import SnapshotStore
+from .steady import newton_krylov_steady
+
+# 自适应时间步长每次更新允许的最大增长倍数
+DT_GROWTH = 1.2
+
+# 早期检查点中缺少的参数按默认值参与续算一致性校验
+_CHECKPOINT_DEFAULTS = {"dtype": "float64", "mixed_precision": False, "grid_stretch": None, "stretch_factor": None}
+
+# 拉伸网格上可用的压力求解器（变系数算子；auto 选 direct）
+STRETCHED_SOLVERS = ("direct", "sor", "gauss_seidel")
+
+# CavitySolver 分阶段计时的各阶段
+PHASES = ("predict", "ppe_source", "ppe_solve", "project")
+
+
+def _steps_taken(info):
+    """一次计算实际推进的时间步数。"""
+    for key in ("converged_step", "canceled_step", "diverged_step"):
+        if info.get(key) is not None:
+            return int(info[key])
+    return int(info["max_iter"])
+
+
+def _initial_field(value, shape, name):
+    """校验初始场的形状与取值，返回 float64 数组；value 为 None 时返回 None。"""
+    if value is None:
+        return None
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.shape != shape:
+        raise ValueError(f"{name} 的形状应为 {shape}，实际为 {arr.shape}")
+    if not np.all(np.isfinite(arr)):
+        raise ValueError(f"{name} 含有 inf 或 nan")
+    return arr
+
+
+def _run_grid_sequence(grid_sequence, nx, ny, save_interval, snapshot_dir, snapshot_codec, return_info,
+                       initial_state, params):
+    """按网格序列逐级求解，上一级的最终场插值后作为下一级初值。"""
+    levels = normalize_sequence(grid_sequence, nx, ny)
+    stats = []
+    state = initial_state
+    for k, (nx_k, ny_k) in enumerate(levels):
+        last = k == len(levels) - 1
+        if k > 0:
+            state = prolong_mac(*state, nx_k, ny_k)
+        print(f"=== 网格序列 {k + 1}/{len(levels)}: {nx_k}x{ny_k} ===")
+
+        t0 = time.perf_counter()
+        u_list, v_list, p_list, info = lid_driven_cavity_mac(
+            nx=nx_k, ny=ny_k, save_interval=save_interval if last else None,
+            snapshot_dir=snapshot_dir if last else None, snapshot_codec=snapshot_codec if last else None,
+            return_info=True, u0=state[0], v0=state[1], p0=state[2], **params,
+        )
+        stats.append({
+            "nx": nx_k,
+            "ny": ny_k,
+            "steps": _steps_taken(info),
+            "time": time.perf_counter() - t0,
+            "converged": info["converged"],
+        })
+        # 中途停止或发散时不再加密，返回当前级的结果
+        if info["canceled"] or info["diverged"]:
+            break
+        state = (u_list[-1], v_list[-1], p_list[-1])
 
-def lid_driven_cavity_mac(
-        Re=100, nx=60, ny=60, max_iter=20000, dt=0.001, Vtol=1e-6, Ptol=1e-6,
-        pressure_solver="sor", omega=1.8,
-        save_interval=None,
-    return_info: bool = False,
-):
-    """
-    MAC网格 + 有限差分法求解顶盖驱动方腔流。
+    info["levels"] = stats
+    if return_info:
+        return u_list, v_list, p_list, info
+    return u_list, v_list, p_list
 
-    参数:
-        Vtol: 速度场收敛容差 (默认 1e-5)
-        Ptol: 压力泊松方程收敛容差 (默认 1e-6)
-        pressure_solver: 'jacobi', 'gauss_seidel', 'sor'
-        omega: 仅当 solver='sor' 时生效。推荐范围 1.7 - 1.9。
-               对于 gauss_seidel，omega 会自动被视为 1.0。
-        save_interval:
-            - None: 不保存全历史，只在结束时保存最后一帧（最省内存，推荐）。
-            - 正整数 N: 每 N 个时间步保存一次快照；并且结束时也会保存最后一帧。
-        进度显示:
-            - 若在 Streamlit 环境运行，函数内部会自动显示进度条，并在结束后保留。
-            - 若在命令行/脚本运行，默认使用 tqdm 显示进度。
-    """
 
-    # 尝试检测 Streamlit 运行环境（用于显示进度条）
-    progress_bar = None
-    st = None
-    try:
-        import streamlit as st  # noqa: N812
-        try:
-            from streamlit.runtime.scriptrunner import get_script_run_ctx
-            in_streamlit = get_script_run_ctx() is not None
-        except Exception:
-            in_streamlit = False
+# 求解器状态的轻量视图：u / v / p 为工作区的只读视图（不复制数据）
+CavityState = namedtuple("CavityState", ["step", "time", "dt", "u", "v", "p"])
 
-        if in_streamlit:
-            progress_bar = st.progress(0, text="准备开始计算...")
-    except Exception:
-        progress_bar = None
-        st = None
 
-    # -------------------------------------------------------------------------
-    # 1. 基础设置与网格初始化
-    # -------------------------------------------------------------------------
-    Lx, Ly = 1.0, 1.0
-    dx = Lx / nx
-    dy = Ly / ny
-
-    # MAC 网格定义
-    # u: (ny, nx+1) 垂直网格面
-    # v: (ny+1, nx) 水平网格面
-    # p: (ny, nx)   单元中心
-    u = np.zeros((ny, nx + 1))
-    v = np.zeros((ny + 1, nx))
-    p = np.zeros((ny, nx))
-
-    # 边界速度
-    u_top = 1.0
-
-    # 结果容器
-    u_list = []
-    v_list = []
-    p_list = []
+class _GrowingBuffer:
+    """按需倍增容量的记录缓冲区（每条记录为定长的一行），避免逐条追加 Python 对象。"""
 
-    last_saved_step = None
+    def __init__(self, dtype, width=None, capacity=1024):
+        self.shape = () if width is None else (width,)
+        self.data = np.empty((capacity,) + self.shape, dtype=dtype)
+        self.size = 0
 
-    # save_interval 参数校验
-    if save_interval is not None:
-        try:
-            save_interval = int(save_interval)
-        except (TypeError, ValueError):
-            raise ValueError("save_interval 必须是 None 或正整数")
-        if save_interval <= 0:
-            raise ValueError("save_interval 必须是 None 或正整数")
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.empty_like(self.data)])
+        self.data[self.size] = value
+        self.size += 1
 
-    # 预计算系数 (避免循环内重复计算)
-    inv_Re = 1.0 / Re
-    dx2 = dx ** 2
-    dy2 = dy ** 2
-    denom = 2 * (dx2 + dy2)
-    inv_denom = 1.0 / denom
+    def clear(self):
+        self.size = 0
 
-    # -------------------------------------------------------------------------
-    # 参数稳定性检查 (CFL & Diffusion)
-    # -------------------------------------------------------------------------
-    u_max_est = 1.0  # 顶盖驱动速度
-    # CFL 条件: dt <= dx / u
-    dt_cfl = min(dx, dy) / u_max_est
-    # 扩散限制: dt <= Re * dx^2 / 4
-    dt_diff = 0.25 * Re * min(dx, dy) ** 2
-    dt_recommended = min(dt_cfl, dt_diff)
-
-    print(f"--- 参数检查 ---")
-    print(f"网格: {nx}x{ny}, Re: {Re}")
-    print(f"推荐 dt <= {dt_recommended:.5f} (CFL: {dt_cfl:.5f}, Diff: {dt_diff:.5f})")
-
-    if dt > dt_recommended:
-        print(f"警告: 当前 dt={dt} 可能导致不稳定！建议减小 dt。")
-    else:
-        print(f"当前 dt={dt} 满足稳定性条件。")
-
-    if pressure_solver == "sor":
-        print(f"当前 Solver 为 SOR，使用 omega={omega}。推荐范围通常在 1.7 - 1.9 之间。")
-
-    # 准备红黑棋盘掩码 (仅用于 SOR/GS 的向量化)
-    # 如果是 Jacobi，我们不会使用这些掩码
-    mask_red = None
-    mask_black = None
-    if pressure_solver in ["sor", "gauss_seidel"]:
-        y_grid, x_grid = np.meshgrid(np.arange(ny), np.arange(nx), indexing='ij')
-        mask_red = (y_grid + x_grid) % 2 == 0
-        mask_black = (y_grid + x_grid) % 2 == 1
-        # 注意：新的 PPE 求解器将在全域求解，因此直接使用全尺寸掩码
-
-    # 确定松弛因子
-    # 如果不是 SOR，强制 omega = 1.0 (GS) 或不使用 (Jacobi)
-    if pressure_solver == "gauss_seidel":
-        current_omega = 1.0
-    elif pressure_solver == "sor":
-        current_omega = omega
-    else:
-        current_omega = None  # Jacobi 不使用
+    def view(self):
+        return self.data[:self.size]
 
-    print(f"开始计算: Re={Re}, Grid={nx}x{ny}, Solver={pressure_solver}")
 
-    # -------------------------------------------------------------------------
-    # 2. 时间步迭代
-    # -------------------------------------------------------------------------
-    iterator = range(max_iter)
-    # Streamlit 环境下不使用 tqdm（避免控制台刷屏）
-    if progress_bar is None:
-        iterator = tqdm(iterator, desc="计算进度", unit="step")
+def _readonly(arr):
+    view = arr.view()
+    view.flags.writeable = False
+    return view
 
-    converged_step = None
-    canceled_step = None
 
-    for n in iterator:
-        un = u.copy()
-        vn = v.copy()
+class CavitySolver:
+    """
+    可反复推进的顶盖驱动方腔流求解器。
+
+    构造时完成一次参数校验与全部准备工作：网格与系数、带 ghost cells 的工作区、
+    压力求解器（红黑视图、多重网格层级、直接法分解等）与时间格式的附加状态；
+    之后 step / run_until / iter_states 只做时间推进，可以分多次调用：
+
+        solver = CavitySolver(Re=400, nx=64, ny=64, dt="auto")
+        solver.step(500)
+        status = solver.run_until(1e-6, max_iter=20000)
+        for state in solver.iter_states(every=100, max_iter=30000):
+            ...  # state.u / state.v / state.p 为只读视图，继续推进后内容随之改变
+
+    reset() 把场、步数与 dt 恢复到初始状态（可同时更换 Re 与初始场），
+    保留已分配的数组与分解，用于在同一网格上连续计算多个算例。
+
+    参数含义同 lid_driven_cavity_mac；verbose=False 时不输出参数检查等提示信息。
+    属性 n 为已推进的步数，time 为物理时间，dt_history 为 (步数, dt) 的历史，
+    status 为最近一次 run_until / iter_states 的结束状态
+    ("converged" / "diverged" / "max_iter"，尚未结束时为 None)。
+    运行统计：timings 为 PHASES 各阶段的累计耗时 (s)，ppe_histogram[k] 为 PPE 迭代次数为 k 的步数
+    （内存固定，超出范围的计入最后一格），ppe_summary() 给出步数 / 总次数 / 平均 / 最大值。
+    record_history=True 时另外记录逐步的 PPE 迭代次数 (ppe_iterations，int32 数组) 与收敛检查步的
+    (步数, err_u, err_v) (velocity_history，(m, 3) 数组)，其内存随步数增长；reset_telemetry() 清空。
+    """
 
-        if progress_bar is not None and (n % 50 == 0):
-            pct = int(min(max(n / max_iter, 0.0), 1.0) * 100)
-            progress_bar.progress(pct, text=f"计算中... {pct}% ({n}/{max_iter})")
+    def __init__(self, Re=100, nx=60, ny=60, dt=0.001, Ptol=1e-6, pressure_solver="auto", omega=1.8,
+                 mg_levels=None, mg_cycles=20, backend="numpy", threads=1, dt_every=50, dt_safety=0.8,
+                 time_scheme="euler", u0=None, v0=None, p0=None, dtype=np.float64, mixed_precision=False,
+                 grid_stretch=None, stretch_factor=None, verbose=True, record_history=False):
+        self.verbose = verbose
+        self.record_history = record_history
+
+        # ---------------------------------------------------------------------
+        # 1. 基础设置与网格初始化
+        # ---------------------------------------------------------------------
+        Lx, Ly = 1.0, 1.0
+        grid = mac_grid(nx, ny, grid_stretch, stretch_factor)
+        stretched = not grid.uniform
+        if stretched:
+            # 稳定性估计与 ws.dx / ws.dy 取最小网格间距
+            dx, dy = float(grid.hx.min()), float(grid.hy.min())
+        else:
+            dx = Lx / nx
+            dy = Ly / ny
 
-            # 允许“停止计算”请求（注意：Streamlit 交互触发 rerun 后才会更新 session_state）
+        # threads 参数校验 (工作区按线程数划分行带)
+        try:
+            threads = int(threads)
+        except (TypeError, ValueError):
+            raise ValueError("threads 必须是正整数")
+        if threads <= 0:
+            raise ValueError("threads 必须是正整数")
+
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float64, np.float32):
+            raise ValueError(f"不支持的浮点类型: {dtype}")
+        if mixed_precision and dtype != np.float64:
+            raise ValueError("mixed_precision 要求 dtype=float64（PPE 内层已为 float32）")
+        if stretched and threads > 1:
+            print("警告: 拉伸网格内核不做行带划分，忽略 threads。")
+            threads = 1
+
+        # MAC 网格定义 (场变量为工作区中带 ghost cells 数组的内部视图)
+        # u: (ny, nx+1) 垂直网格面
+        # v: (ny+1, nx) 水平网格面
+        # p: (ny, nx)   单元中心
+        ws = MACWorkspace(nx, ny, dx, dy, threads=threads, dtype=dtype)
+        self.ws = ws
+        self.u, self.v, self.p = ws.u, ws.v, ws.p
+        self._set_fields(u0, v0, p0)
+
+        # 均匀网格上 DCT 可精确对角化 PPE 算子，默认使用 fft；拉伸网格上 DCT 不再适用，使用直接法
+        if pressure_solver == "auto":
+            pressure_solver = "direct" if stretched else "fft"
+
+        if pressure_solver not in ("jacobi", "gauss_seidel", "sor", "direct", "fft", "multigrid", "pcg"):
+            raise ValueError(f"未知的压力求解器: {pressure_solver}")
+        if mixed_precision and pressure_solver not in MixedPrecisionSolver.METHODS:
+            raise ValueError(f"混合精度 PPE 不支持压力求解器: {pressure_solver}")
+
+        if time_scheme not in ("euler", "imex", "ab2", "rk3"):
+            raise ValueError(f"未知的时间推进格式: {time_scheme}")
+
+        if stretched:
+            if pressure_solver not in STRETCHED_SOLVERS:
+                raise ValueError(f"拉伸网格不支持压力求解器 {pressure_solver}（可用: {', '.join(STRETCHED_SOLVERS)}）")
+            if time_scheme == "imex":
+                raise ValueError("拉伸网格不支持 time_scheme='imex'")
+            if mixed_precision:
+                raise ValueError("拉伸网格不支持 mixed_precision")
+
+        if backend not in ("numpy", "numba"):
+            raise ValueError(f"未知的计算后端: {backend}")
+        if backend == "numba" and not kernels_numba.NUMBA_AVAILABLE:
+            print("警告: 未安装 numba，回退到 NumPy 后端。")
+            backend = "numpy"
+        if stretched and backend == "numba":
+            print("警告: 拉伸网格只有 NumPy 内核，回退到 NumPy 后端。")
+            backend = "numpy"
+        if stretched:
+            self.kern = kernels_stretched
+            kernels_stretched.attach(ws, grid)
+        else:
+            self.kern = kernels_numba if backend == "numba" else kernels
+
+        self.nx, self.ny = nx, ny
+        self.dx, self.dy = dx, dy
+        self.grid = grid
+        self.stretched = stretched
+        self.grid_stretch = grid_stretch
+        self.dtype = dtype
+        self.mixed_precision = mixed_precision
+        self.pressure_solver = pressure_solver
+        self.time_scheme = time_scheme
+        self.backend = backend
+        self.Ptol = Ptol
+        self.mg_cycles = mg_cycles
+
+        # 预计算系数 (避免循环内重复计算)
+        self.dx2 = dx ** 2
+        self.dy2 = dy ** 2
+
+        # 边界速度
+        self.u_top = 1.0
+
+        # ---------------------------------------------------------------------
+        # 参数稳定性检查 (CFL & Diffusion) 与时间步长
+        # ---------------------------------------------------------------------
+        self.dt_auto = isinstance(dt, str)
+        if self.dt_auto:
+            if dt != "auto":
+                raise ValueError("dt 必须是正数或 \"auto\"")
             try:
-                if st is not None and bool(st.session_state.get("cfd_cancel_requested", False)):
-                    canceled_step = n + 1
-                    progress_bar.progress(100, text=f"已停止于第 {canceled_step} 步")
-                    break
-            except Exception:
-                pass
-
-        # ==================== A. 求解动量方程 (预测步) ====================
-
-        # --- U 动量方程 (针对内部垂直面 u[j, i]) ---
-        # 扩展边界以处理 Ghost Cells
-        un_pad = np.pad(un, ((1, 1), (0, 0)), 'edge')
-        un_pad[0, :] = -un[0, :]  # 下壁面无滑移
-        un_pad[-1, :] = 2 * u_top - un[-1, :]  # 顶盖 Dirichlet
-
-        u_c = un[:, 1:-1]
-
-        # 扩散项 (Laplacian)
-        diff_u = inv_Re * (
-                (un[:, 2:] - 2 * u_c + un[:, :-2]) / dx2 +
-                (un_pad[2:, 1:-1] - 2 * u_c + un_pad[:-2, 1:-1]) / dy2
-        )
-
-        # 对流项 (MAC格式核心：平均与差分)
-        # 1. du^2/dx
-        du2_dx = (((u_c + un[:, 2:]) / 2) ** 2 - ((u_c + un[:, :-2]) / 2) ** 2) / dx
-
-        # 2. d(uv)/dy
-        # 需要插值 v 到 u 的位置 (垂直边角点)
-        v_nw = vn[1:, :-1]  # 左上
-        v_ne = vn[1:, 1:]  # 右上
-        v_sw = vn[:-1, :-1]  # 左下
-        v_se = vn[:-1, 1:]  # 右下
-
-        v_avg_u_top = (v_ne + v_nw) / 2
-        v_avg_u_bot = (v_se + v_sw) / 2
-        u_avg_y_top = (un_pad[2:, 1:-1] + u_c) / 2
-        u_avg_y_bot = (u_c + un_pad[:-2, 1:-1]) / 2
+                dt_every = int(dt_every)
+            except (TypeError, ValueError):
+                raise ValueError("dt_every 必须是正整数")
+            if dt_every <= 0:
+                raise ValueError("dt_every 必须是正整数")
+            if not 0.0 < dt_safety <= 1.0:
+                raise ValueError("dt_safety 必须在 (0, 1] 内")
+        self.dt_every = dt_every
+        self.dt_safety = dt_safety
+        self._dt_fixed = None if self.dt_auto else dt
+        self._set_reynolds(Re)
+
+        if pressure_solver == "sor":
+            self._log(f"当前 Solver 为 SOR，使用 omega={omega}。推荐范围通常在 1.7 - 1.9 之间。")
+
+        # 准备红黑子格点的跨步视图 (仅用于 SOR/GS 的向量化)
+        # 如果是 Jacobi，我们不会使用这些视图
+        rb_colors = None
+        if pressure_solver in ["sor", "gauss_seidel"] and stretched:
+            rb_colors = stretched_red_black_views(ws.p_pad, ws.b, grid)
+        elif pressure_solver in ["sor", "gauss_seidel"] and backend == "numpy" and not mixed_precision:
+            rb_colors = red_black_views(ws.p_pad, ws.b, bands=row_bands(ny, ws.threads))
+        self.rb_colors = rb_colors
+
+        # 多重网格层级与工作数组只在构造时建立一次
+        self.mg_solver = None
+        self.pcg_solver = None
+        self.mixed_solver = None
+        self._ppe_operator = None  # ppe_residual 使用的稀疏 Laplace 算子，首次调用时组装
+        if mixed_precision:
+            self.mixed_solver = MixedPrecisionSolver(nx, ny, dx, dy, pressure_solver, omega=omega,
+                                                     mg_levels=mg_levels, mg_cycles=mg_cycles)
+        elif pressure_solver == "multigrid":
+            self.mg_solver = MultigridSolver(nx, ny, dx, dy, levels=mg_levels, dtype=dtype)
+        elif pressure_solver == "pcg":
+            self.pcg_solver = PCGSolver(nx, ny, dx, dy, mg_levels=mg_levels, dtype=dtype)
+
+        # 确定松弛因子
+        # 如果不是 SOR，强制 omega = 1.0 (GS) 或不使用 (Jacobi)
+        if pressure_solver == "gauss_seidel":
+            current_omega = 1.0
+        elif pressure_solver == "sor":
+            current_omega = omega
+        else:
+            current_omega = None  # Jacobi 不使用
 
-        duv_dy = (u_avg_y_top * v_avg_u_top - u_avg_y_bot * v_avg_u_bot) / dy
+        # 一次红黑 SOR 扫描 (按后端选择实现)
+        if stretched:
+            self.sor_sweep = partial(rb_sweep_stretched, ws.p_pad, rb_colors, current_omega)
+        elif backend == "numba":
+            self.sor_sweep = partial(kernels_numba.rb_sweep, ws.p_pad, ws.b, self.dx2, self.dy2, current_omega)
+        else:
+            self.sor_sweep = partial(rb_sweep, ws.p_pad, rb_colors, self.dx2, self.dy2, current_omega, pool=ws.pool)
 
-        u_star = un.copy()
-        u_star[:, 1:-1] = u_c + dt * (-du2_dx - duv_dy + diff_u)
+        # 最大 PPE 迭代次数 (防止死循环)
+        self.max_ppe_iter = 2000
+        self.p_old, self.p_tmp = ws.tp
+
+        # 时间推进格式所需的附加状态：IMEX 的三对角分解、AB2 的环形缓冲区、RK3 的级间存储
+        self.adi = self.ab2 = self.rk3 = None
+        if time_scheme == "imex":
+            self.adi = ADIDiffusion(nx, ny, dx, dy, dtype=dtype)
+            self.adi.update(self.dt, self.inv_Re)
+        elif time_scheme == "ab2":
+            self.ab2 = AB2History(nx, ny, dtype=dtype)
+        elif time_scheme == "rk3":
+            self.rk3 = SSPRK3(nx, ny, dtype=dtype)
+
+        self.n = 0
+        self.time = 0.0
+        self.status = None
+        self.error = None
+        self.reset_telemetry()
+
+        precision = "mixed" if mixed_precision else dtype.name
+        grid_desc = f"{nx}x{ny}" + (f" ({grid_stretch})" if stretched else "")
+        self._log(f"开始计算: Re={Re}, Grid={grid_desc}, Solver={pressure_solver}, Backend={backend}, "
+                  f"Precision={precision}")
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _set_fields(self, u0, v0, p0):
+        """校验并写入初始场（未给出的场保持原值）。"""
+        for field, value, name in ((self.u, u0, "u0"), (self.v, v0, "v0"), (self.p, p0, "p0")):
+            value = _initial_field(value, field.shape, name)
+            if value is not None:
+                np.copyto(field, value)
+
+    def _set_reynolds(self, Re):
+        """设置 Re，按顶盖速度估计稳定步长并确定初始 dt。"""
+        self.Re = Re
+        self.inv_Re = 1.0 / Re
+        dx, dy = self.dx, self.dy
+
+        u_max_est = 1.0  # 顶盖驱动速度
+        # CFL 条件: dt <= dx / u
+        dt_cfl = min(dx, dy) / u_max_est
+        # 扩散限制: dt <= Re * dx^2 / 4
+        dt_diff = 0.25 * Re * min(dx, dy) ** 2
+        # 粘性项隐式处理时扩散限制不再适用；显式格式按各自的实轴稳定区间缩放
+        if self.time_scheme != "imex":
+            dt_diff *= DIFFUSION_FACTOR[self.time_scheme]
+        dt_recommended = dt_cfl if self.time_scheme == "imex" else min(dt_cfl, dt_diff)
+
+        self._log(f"--- 参数检查 ---")
+        self._log(f"网格: {self.nx}x{self.ny}, Re: {Re}")
+        if self.time_scheme == "imex":
+            self._log(f"推荐 dt <= {dt_recommended:.5f} (CFL: {dt_cfl:.5f}，粘性项隐式处理，无扩散限制)")
+        else:
+            self._log(f"推荐 dt <= {dt_recommended:.5f} (CFL: {dt_cfl:.5f}, Diff: {dt_diff:.5f})")
 
-        # --- V 动量方程 (针对内部水平面 v[j, i]) ---
-        vn_pad = np.pad(vn, ((0, 0), (1, 1)), 'edge')
-        vn_pad[:, 0] = -vn[:, 0]
-        vn_pad[:, -1] = -vn[:, -1]
+        # 自适应时间步长：初值取顶盖速度估计的稳定步长
+        if self.dt_auto:
+            self.dt = self.dt_safety * dt_recommended
+            self._log(f"自适应时间步长：初始 dt={self.dt:.5f}，每 {self.dt_every} 步按实际 CFL 更新 "
+                      f"(安全系数 {self.dt_safety})。")
+        else:
+            self.dt = self._dt_fixed
+            if self.dt > dt_recommended:
+                self._log(f"警告: 当前 dt={self.dt} 可能导致不稳定！建议减小 dt。")
+            else:
+                self._log(f"当前 dt={self.dt} 满足稳定性条件。")
+        self.dt_history = [(0, self.dt)]
+
+    def reset(self, u0=None, v0=None, p0=None, Re=None):
+        """
+        回到第 0 步：场清零后写入给出的初始场，dt 与格式历史恢复初值，可同时更换 Re。
+        工作区、压力求解器的分解与层级等全部保留。
+        """
+        if Re is not None:
+            if not Re > 0:
+                raise ValueError("Re 必须是正数")
+            self._set_reynolds(Re)
+        else:
+            self.dt = self.dt_history[0][1]
+            self.dt_history = [(0, self.dt)]
+        for pad in (self.ws.u_pad, self.ws.v_pad, self.ws.p_pad):
+            pad.fill(0.0)
+        self._set_fields(u0, v0, p0)
+        if self.adi is not None:
+            self.adi.update(self.dt, self.inv_Re)
+        self.reset_history()
+        self.n = 0
+        self.time = 0.0
+        self.status = None
+        self.error = None
+        self.reset_telemetry()
+        return self
+
+    def reset_history(self):
+        """清除多步格式的历史（AB2 的上一步右端项），下一步按单步格式起步。"""
+        if self.ab2 is not None:
+            self.ab2.k = 0
+            self.ab2.dt_prev = None
+
+    def reset_telemetry(self):
+        """清空各阶段累计耗时、PPE 迭代次数统计与速度变化历史。"""
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        # RK3 每步三次 PPE，单步迭代次数不超过 3 * max_ppe_iter（多重网格的 mg_cycles 更大时计入最后一格）
+        self.ppe_histogram = np.zeros(3 * self.max_ppe_iter + 1, dtype=np.int64)
+        if self.record_history:
+            self._ppe_steps = _GrowingBuffer(np.int32)
+            self._velocity = _GrowingBuffer(np.float64, width=3, capacity=64)
+        else:
+            self._ppe_steps = self._velocity = None
+
+    @property
+    def ppe_iterations(self):
+        """逐步的 PPE 迭代次数（int32 数组，需 record_history=True，否则为 None）。"""
+        return None if self._ppe_steps is None else self._ppe_steps.view()
+
+    @property
+    def velocity_history(self):
+        """收敛检查步的 (步数, err_u, err_v)，(m, 3) 数组（需 record_history=True，否则为 None）。"""
+        return None if self._velocity is None else self._velocity.view()
+
+    def _record_ppe(self, its):
+        self.ppe_histogram[min(its, len(self.ppe_histogram) - 1)] += 1
+        if self._ppe_steps is not None:
+            self._ppe_steps.append(its)
+
+    def ppe_summary(self):
+        """PPE 迭代次数的汇总：steps（PPE 步数）、total、mean 与 max（由直方图计算）。"""
+        hist = self.ppe_histogram
+        steps = int(hist.sum())
+        total = int(np.dot(hist, np.arange(len(hist))))
+        nonzero = np.flatnonzero(hist)
+        return {"steps": steps, "total": total, "mean": total / steps if steps else None,
+                "max": int(nonzero[-1]) if nonzero.size else None}
+
+    def ppe_residual(self):
+        """
+        最近一次 PPE 求解的相对残差 ||b - L p||_2 / ||b||_2（尚未推进或 b = 0 时为 None）。
+        稀疏算子 L 只在首次调用时组装并保存在求解器上，逐步调用时每次只做一次稀疏矩阵乘。
+        """
+        b = np.asarray(self.ws.b, dtype=np.float64).ravel()
+        b_norm = np.linalg.norm(b)
+        if not self.ppe_histogram.any() or b_norm == 0.0:
+            return None
+        if self._ppe_operator is None:
+            if self.stretched:
+                self._ppe_operator = stretched_laplacian(self.grid)
+            else:
+                self._ppe_operator = neumann_laplacian(self.nx, self.ny, self.dx, self.dy)
+        r = b - self._ppe_operator @ np.asarray(self.p, dtype=np.float64).ravel()
+        return float(np.linalg.norm(r) / b_norm)
+
+    def restore(self, state):
+        """从 core.checkpoint.load_checkpoint 读取的状态继续：场、步数、dt 及其历史、AB2 历史。"""
+        for field, key in ((self.u, "u"), (self.v, "v"), (self.p, "p")):
+            np.copyto(field, state[key])
+        self.n = int(state["step"])
+        self.dt = float(state["dt"])
+        self.dt_history = [(int(k), float(t)) for k, t in state["dt_history"]]
+        # 物理时间由 dt 历史逐段累加
+        ends = [k for k, _ in self.dt_history[1:]] + [self.n]
+        self.time = sum((k1 - k0) * t for (k0, t), k1 in zip(self.dt_history, ends))
+        if self.ab2 is not None:
+            restore_ab2(self.ab2, state)
+        if self.adi is not None:
+            self.adi.update(self.dt, self.inv_Re)
+        self.status = None
+        return self
+
+    def checkpoint_state(self, params):
+        """当前状态打包为检查点字典（见 core.checkpoint.pack_state），params 为随检查点保存的参数。"""
+        return pack_state(self.u, self.v, self.p, self.n, self.dt, self.dt_history, params, ab2=self.ab2)
+
+    def state(self):
+        """当前状态 (CavityState)。u / v / p 为只读视图，不复制数据；需要保留时请自行 copy。"""
+        return CavityState(self.n, self.time, self.dt, _readonly(self.u), _readonly(self.v), _readonly(self.p))
 
-        v_c = vn[1:-1, :]
+    # -------------------------------------------------------------------------
+    # 2. 时间推进
+    # -------------------------------------------------------------------------
+    def _update_dt(self):
+        """自适应时间步长：每 dt_every 步按实际速度更新 dt。"""
+        n = self.n
+        if not (self.dt_auto and n > 0 and n % self.dt_every == 0):
+            return
+        dt_cfl_live, dt_diff_live = stable_dt(self.ws, self.Re)
+        dt_limit = dt_cfl_live if self.adi is not None else \
+            min(dt_cfl_live, DIFFUSION_FACTOR[self.time_scheme] * dt_diff_live)
+        dt_new = min(self.dt_safety * dt_limit, DT_GROWTH * self.dt)
+        if dt_new != self.dt:
+            self.dt = dt_new
+            self.dt_history.append((n, self.dt))
+            if self.adi is not None:
+                self.adi.update(self.dt, self.inv_Re)
+
+    def time_step(self):
+        """以当前 dt 原地推进一个时间步：预测、PPE、速度修正（不更新步数与 dt）。"""
+        ws, kern, dt = self.ws, self.kern, self.dt
+        timings = self.timings
+        clock = time.perf_counter
+        # ==================== A. 求解动量方程 (预测步) ====================
+        if self.rk3 is not None:
+            # SSP-RK3：每一级 Euler 预测后与 u^n 组合，再投影
+            self.rk3.save(ws)
+            its = 0
+            for a_k, b_k in RK3_STAGES:
+                t0 = clock()
+                kern.predict(ws, dt, self.inv_Re, self.u_top)
+                self.rk3.combine(ws, a_k, b_k)
+                timings["predict"] += clock() - t0
+                its += self.pressure_step(b_k * dt)
+            self._record_ppe(its)
+            return
+
+        t0 = clock()
+        kern.predict(ws, dt, self.inv_Re, self.u_top)
+        if self.adi is not None:
+            self.adi.apply(ws, dt)
+        elif self.ab2 is not None:
+            self.ab2.apply(ws, dt)
+        timings["predict"] += clock() - t0
+        self._record_ppe(self.pressure_step(dt))
+
+    def pressure_step(self, dt):
+        """
+        由 ws.u_star / ws.v_star 求解 PPE 并做速度修正（dt 为本次投影的有效步长），
+        返回 PPE 的迭代次数（直接法与 fft 记为 1）。
+        """
+        ws, p, Ptol = self.ws, self.p, self.Ptol
+        pressure_solver = self.pressure_solver
+        timings = self.timings
+        clock = time.perf_counter
+        # ==================== B. 压力泊松方程 (PPE) ====================
 
-        # 扩散项
-        diff_v = inv_Re * (
-                (vn_pad[1:-1, 2:] - 2 * v_c + vn_pad[1:-1, :-2]) / dx2 +
-                (vn[2:, :] - 2 * v_c + vn[:-2, :]) / dy2
-        )
+        # 计算源项 b = (1/dt) * div(u*)，并满足相容条件 sum(b) = 0
+        t0 = clock()
+        b = self.kern.ppe_source(ws, dt)
+        t1 = clock()
 
-        # 对流项
-        # 1. d(v^2)/dy
-        dv2_dy = (((v_c + vn[2:, :]) / 2) ** 2 - ((v_c + vn[:-2, :]) / 2) ** 2) / dy
+        its = 1
+        if self.mixed_solver is not None:
+            # --- 混合精度：float32 内层求解 + float64 迭代修正 ---
+            its = self.mixed_solver.solve(b, ws.p_pad, tol=Ptol)
 
-        # 2. d(uv)/dx
-        u_ne = un[1:, 1:]
-        u_nw = un[1:, :-1]
-        u_se = un[:-1, 1:]
-        u_sw = un[:-1, :-1]
+        elif pressure_solver == "jacobi":
+            # --- 雅可比迭代 ---
+            p_old, p_tmp = self.p_old, self.p_tmp
+            for it_ppe in range(self.max_ppe_iter):
+                p_new = jacobi_sweep(ws.p_pad, b, self.dx2, self.dy2, out=p_old, tmp=p_tmp)
 
-        u_avg_v_right = (u_ne + u_se) / 2
-        u_avg_v_left = (u_nw + u_sw) / 2
-        v_avg_x_right = (vn_pad[1:-1, 2:] + v_c) / 2
-        v_avg_x_left = (vn_pad[1:-1, :-2] + v_c) / 2
+                # 检查收敛 (每 10 步检查一次以节省开销)
+                if it_ppe % 10 == 0:
+                    np.subtract(p_new, p, out=p_tmp)
+                    np.abs(p_tmp, out=p_tmp)
+                    diff = p_tmp.max()
+                    np.copyto(p, p_new)
+                    if diff < Ptol:
+                        break
+                else:
+                    np.copyto(p, p_new)
+            its = it_ppe + 1
 
-        duv_dx = (v_avg_x_right * u_avg_v_right - v_avg_x_left * u_avg_v_left) / dx
+        elif pressure_solver in ["sor", "gauss_seidel"]:
+            # --- SOR / GS 迭代 (红黑排序) ---
+            if self.backend == "numpy" and self.rb_colors is None:
+                raise RuntimeError("内部错误：SOR/GS 模式下未正确初始化红黑视图")
 
-        v_star = vn.copy()
-        v_star[1:-1, :] = v_c + dt * (-duv_dx - dv2_dy + diff_v)
+            p_old, p_tmp = self.p_old, self.p_tmp
+            for it_ppe in range(self.max_ppe_iter):
+                check_ppe = (it_ppe % 10 == 0)
+                if check_ppe:
+                    np.copyto(p_old, p)
 
-        # 强制中间速度边界
-        u_star[:, 0] = 0.0
-        u_star[:, -1] = 0.0
-        v_star[0, :] = 0.0
-        v_star[-1, :] = 0.0
-        # ==================== B. 压力泊松方程 (PPE) ====================
+                self.sor_sweep()
 
-        # 计算源项 b = (1/dt) * div(u*)
-        div_u_star = (u_star[:, 1:] - u_star[:, :-1]) / dx + \
-                     (v_star[1:, :] - v_star[:-1, :]) / dy
-        b = div_u_star / dt
+                # 检查收敛
+                if check_ppe:
+                    np.subtract(p, p_old, out=p_tmp)
+                    np.abs(p_tmp, out=p_tmp)
+                    if p_tmp.max() < Ptol:
+                        break
+            its = it_ppe + 1
 
-        # 使用 Ghost Cells 扩展 p 以处理边界条件 (Neumann BC: dp/dn = 0)
-        p_pad = np.pad(p, ((1, 1), (1, 1)), 'edge')
+        elif pressure_solver == "multigrid":
+            # --- 几何多重网格 V-cycle (以上一步压力热启动) ---
+            _, its = self.mg_solver.solve(b, p0=p, tol=Ptol, max_cycles=self.mg_cycles, out=p)
 
-        # 最大 PPE 迭代次数 (防止死循环)
-        max_ppe_iter = 2000
+        elif pressure_solver == "pcg":
+            # --- 预条件共轭梯度 (以上一步压力热启动) ---
+            _, its = self.pcg_solver.solve(b, p0=p, tol=Ptol, max_iter=self.max_ppe_iter, out=p)
 
-        if pressure_solver == "jacobi":
-            # --- 雅可比迭代 ---
-            for it_ppe in range(max_ppe_iter):
-                p_old_inner = p_pad[1:-1, 1:-1].copy()
+        elif pressure_solver == "direct":
+            # --- 稀疏直接法 (缓存分解，每步一次回代) ---
+            if self.stretched:
+                np.copyto(p, solve_direct_stretched(b, self.grid))
+            else:
+                np.copyto(p, solve_direct(b, self.dx, self.dy))
 
-                # 1. 应用 Neumann 边界条件到 Ghost Cells
-                p_pad[0, 1:-1] = p_pad[1, 1:-1]   # Bottom
-                p_pad[-1, 1:-1] = p_pad[-2, 1:-1] # Top
-                p_pad[1:-1, 0] = p_pad[1:-1, 1]   # Left
-                p_pad[1:-1, -1] = p_pad[1:-1, -2] # Right
+        elif pressure_solver == "fft":
+            # --- DCT 快速泊松求解 ---
+            np.copyto(p, solve_fft(b, self.dx, self.dy))
 
-                # 2. 更新所有流体网格 (1:-1, 1:-1)
-                p_new = (dy2 * (p_pad[1:-1, 2:] + p_pad[1:-1, :-2]) +
-                         dx2 * (p_pad[2:, 1:-1] + p_pad[:-2, 1:-1]) -
-                         dx2 * dy2 * b) * inv_denom
+        # 归一化压力
+        np.subtract(p, p.mean(), out=p)
+        t2 = clock()
 
-                p_pad[1:-1, 1:-1] = p_new
+        # ==================== C. 速度修正 (Projection) ====================
+        self.kern.project(ws, dt, self.u_top)
+        timings["ppe_source"] += t1 - t0
+        timings["ppe_solve"] += t2 - t1
+        timings["project"] += clock() - t2
+        return its
+
+    def step(self, n=1):
+        """推进 n 个时间步（dt="auto" 时按 dt_every 更新步长），返回 self。"""
+        for _ in range(int(n)):
+            self._update_dt()
+            self.time_step()
+            self.time += self.dt
+            self.n += 1
+        return self
+
+    def _march(self, tol, max_iter, check_every):
+        """
+        逐步推进的生成器，每推进一步产出一次。
+
+        tol 不为 None 时在步数为 check_every 的整数倍处检查相对速度变化：出现 inf / nan 时
+        status 为 "diverged"，小于 tol 时为 "converged"；总步数达到 max_iter 时为 "max_iter"。
+        status 确定后产出最后一次即结束。
+        """
+        try:
+            check_every = int(check_every)
+        except (TypeError, ValueError):
+            raise ValueError("check_every 必须是正整数")
+        if check_every <= 0:
+            raise ValueError("check_every 必须是正整数")
+        ws = self.ws
+        self.status = None
+        if max_iter is not None and self.n >= max_iter:
+            self.status = "max_iter"
+            return
+        while True:
+            # 仅在收敛检查步保存上一时刻速度
+            check_step = tol is not None and self.n % check_every == 0
+            if check_step:
+                np.copyto(ws.u_old, self.u)
+                np.copyto(ws.v_old, self.v)
+
+            self.step()
+
+            if check_step:
+                # 使用相对误差
+                err_u, err_v = velocity_change(ws)
+                # 数值发散：速度出现 inf / nan 时立即停止
+                if not (np.isfinite(err_u) and np.isfinite(err_v)):
+                    self.error = float("inf")
+                    self.status = "diverged"
+                else:
+                    self.error = max(err_u, err_v)
+                    if self._velocity is not None:
+                        self._velocity.append((self.n, err_u, err_v))
+                    if err_u < tol and err_v < tol:
+                        self.status = "converged"
+            if self.status is None and max_iter is not None and self.n >= max_iter:
+                self.status = "max_iter"
+            yield
+            if self.status is not None:
+                return
+
+    def run_until(self, tol, max_iter=None, check_every=100):
+        """
+        推进至收敛（每 check_every 步的相对速度变化 < tol）、发散或总步数达到 max_iter，
+        返回结束状态 ("converged" / "diverged" / "max_iter")。max_iter 为 None 时不限步数。
+        """
+        for _ in self._march(tol, max_iter, check_every):
+            pass
+        return self.status
+
+    def iter_states(self, every=1, max_iter=None, tol=None, check_every=100):
+        """
+        推进并每 every 步产出一次当前状态 (CavityState，只读视图)。
+
+        结束条件同 run_until（tol 为 None 时不检查收敛）；结束时的状态总会产出。
+        max_iter 与 tol 均为 None 时无限推进，由调用方决定何时停止迭代。
+        """
+        try:
+            every = int(every)
+        except (TypeError, ValueError):
+            raise ValueError("every 必须是正整数")
+        if every <= 0:
+            raise ValueError("every 必须是正整数")
+        for _ in self._march(tol, max_iter, check_every):
+            if self.n % every == 0 or self.status is not None:
+                yield self.state()
 
-                # 检查收敛 (每 10 步检查一次以节省开销)
-                if it_ppe % 10 == 0:
-                    diff = np.max(np.abs(p_new - p_old_inner))
-                    if diff < Ptol:
-                        break
 
-            # 取回结果
-            p = p_pad[1:-1, 1:-1]
+def _phase_timings(solver_timings, driver_time, wall_time):
+    """合并求解器与驱动层的分阶段耗时；other 为收敛检查、dt 更新、进度回调等其余开销。"""
+    timings = dict(solver_timings)
+    timings.update(driver_time)
+    timings["other"] = max(wall_time - sum(timings.values()), 0.0)
+    timings["total"] = wall_time
+    return timings
 
-        elif pressure_solver in ["sor", "gauss_seidel"]:
-            # --- SOR / GS 迭代 (红黑排序) ---
-            if mask_red is None or mask_black is None:
-                raise RuntimeError("内部错误：SOR/GS 模式下未正确初始化 mask_red/mask_black")
 
-            for it_ppe in range(max_ppe_iter):
-                p_old_inner = p_pad[1:-1, 1:-1].copy()
+def lid_driven_cavity_mac(
+        Re=100, nx=60, ny=60, max_iter=20000, dt=0.001, Vtol=1e-6, Ptol=1e-6,
+        pressure_solver="auto", omega=1.8,
+        save_interval=None,
+        mg_levels=None, mg_cycles=20,
+        backend="numpy", threads=1,
+        dt_every=50, dt_safety=0.8,
+        time_scheme="euler",
+        mode="transient", newton_tol=1e-6, newton_maxiter=50, newton_steps=20, newton_warmup=1000,
+        grid_sequence=None,
+        u0=None, v0=None, p0=None,
+        checkpoint_every=None, checkpoint_path=None, resume_from=None,
+        snapshot_dir=None, snapshot_codec=None,
+        dtype=np.float64, mixed_precision=False,
+        grid_stretch=None, stretch_factor=None,
+        progress="auto", progress_every=None, on_progress=None, should_cancel=None,
+    return_info: bool = False,
+):
+    """
+    MAC网格 + 有限差分法求解顶盖驱动方腔流。
 
-                # 1. 应用 BCs
-                p_pad[0, 1:-1] = p_pad[1, 1:-1]
-                p_pad[-1, 1:-1] = p_pad[-2, 1:-1]
-                p_pad[1:-1, 0] = p_pad[1:-1, 1]
-                p_pad[1:-1, -1] = p_pad[1:-1, -2]
+    参数:
+        dt: 时间步长。传入 "auto" 时启用自适应时间步长：每 dt_every 步根据实际的
+            max|u|、max|v| 重新计算对流 (CFL) 限制 1 / (max|u|/dx + max|v|/dy) 与扩散限制，
+            取二者较小值乘以安全系数 dt_safety 作为目标；目标小于当前 dt 时立即减小，
+            否则每次最多增大 DT_GROWTH (1.2) 倍。所选 dt 的历史记录在 info["dt_history"] 中。
+        time_scheme: 时间推进格式。
+            - euler: 对流项与粘性项均为显式前向 Euler（默认）。
+            - imex: 对流项显式，粘性项用 Crank-Nicolson ADI 隐式处理（见 kernels.ADIDiffusion），
+              消除扩散稳定性限制 dt <= Re dx^2 / 4，时间步长只受 CFL 条件约束，适合低 Re、细网格。
+            - ab2: 二阶 Adams-Bashforth，上一步的右端项保存在环形缓冲区中（见 core.schemes）。
+              每步代价与 euler 相同，扩散稳定限制为 euler 的一半。
+            - rk3: 三阶 SSP Runge-Kutta，每一级后投影一次（每步 3 次 PPE）。稳定域覆盖
+              虚轴的一段，高 Re 下可使用接近 CFL 限制的 dt。
+            ab2 / rk3 对内部点的更新为二阶 / 三阶，但顶盖速度每步直接覆盖 u 的最上一行，
+            整体时间精度受此限制仍为一阶（与 euler 相同）。
+        Vtol: 速度场收敛容差 (默认 1e-5)
+        Ptol: 压力泊松方程收敛容差 (默认 1e-6)
+        pressure_solver: 'auto', 'jacobi', 'gauss_seidel', 'sor', 'direct', 'fft'
+            - auto: 均匀网格上使用 fft。
+            - direct: 稀疏 LU 直接法。PPE 算子只组装、分解一次（按网格缓存），
+              每步仅需一次回代，不受 Ptol 影响。
+            - multigrid: 几何多重网格 V-cycle，以红黑 Gauss-Seidel 为光滑器，
+              每步以上一步压力热启动，迭代至相对残差 < Ptol。开销随单元数近似线性增长。
+              nx、ny 不要求为偶数：奇数方向按 (n + 1) / 2 粗化（非嵌套网格），各层一直粗化到
+              最小边不足 4 个单元；nx、ny 为 2 的幂的倍数时各层完全嵌套，收敛最快。
+            - pcg: 无矩阵预条件共轭梯度，预条件子为一次多重网格 V-cycle，
+              以上一步压力热启动，迭代至相对残差 < Ptol。
+            - fft: DCT-II/DCT-III 变换对角化 Neumann Laplace 算子，O(N log N) 直接求解，
+              不受 Ptol 影响。
+        omega: 仅当 solver='sor' 时生效。推荐范围 1.7 - 1.9。
+               对于 gauss_seidel，omega 会自动被视为 1.0。
+        mg_levels: 多重网格层数（含最细层，multigrid 与 pcg 预条件子共用），None 表示粗化到最小边不足 4 个单元为止。
+        mg_cycles: 多重网格每个时间步最多执行的 V-cycle 次数。
+        backend: 时间步内核后端。
+            - numpy: 预分配工作区上的向量化 ufunc 内核（默认）。
+            - numba: 预测步、PPE 源项、红黑 SOR 扫描与速度修正编译为融合的并行循环；
+              结果与 numpy 后端在舍入误差内一致。未安装 numba 时自动回退到 numpy。
+        threads: numpy 后端的线程数。>1 时预测步与红黑 SOR 扫描按行分带，
+                 在持久化线程池上并行（红 / 黑半步之间同步）。numba 后端使用其自身的
+                 并行线程（由 NUMBA_NUM_THREADS 控制），忽略此参数。
+        mode: 求解模式。
+            - transient: 显式时间推进直至速度收敛（默认）。
+            - steady: 先推进 newton_warmup 步（不超过 max_iter）作为初值，再以 Newton-Krylov
+              直接求离散定常解（见 core.steady）：残差为连续推进 newton_steps 步前后的速度差
+              除以推进时间，迭代至 max|残差| < newton_tol 或达到 newton_maxiter 次。
+              info 中给出 Newton 迭代次数与残差历史。
+        grid_sequence: 网格序列，如 [(32, 32), (64, 64), (128, 128)]。依次在各级网格上求解，
+            每级结果按守恒方式插值到下一级作为初值（见 core.sequencing），末级为 (nx, ny)
+            （缺省时自动补上）。大尺度涡的建立过程在粗网格上完成，细网格只需少量步数。
+            save_interval 只作用于末级；info["levels"] 给出各级的网格、步数、耗时与收敛状态。
+        u0, v0, p0: 初始场（默认全零），形状分别为 (ny, nx+1)、(ny+1, nx)、(ny, nx)，
+            可只给出其中一部分。常用于以已收敛的解为初值继续计算（见 core.continuation）。
+            与 grid_sequence 同时使用时作用于第一级网格。
+        checkpoint_every, checkpoint_path: 每 checkpoint_every 步把当前状态写入 checkpoint_path
+            （压缩 .npz，先写临时文件再原子替换，见 core.checkpoint）。写盘在后台线程进行，
+            上一次尚未写完时跳过本次检查点，不阻塞时间循环。
+        resume_from: 检查点文件路径。从其中保存的步数、场、dt 与格式历史继续计算，
+            结果与不中断的计算逐位相同（网格、Re、dt、时间格式与压力求解器必须与原计算一致）。
+            max_iter 仍为总步数；续算前保存的快照不在检查点中。
+        save_interval:
+            - None: 不保存全历史，只在结束时保存最后一帧（最省内存，推荐）。
+            - 正整数 N: 每 N 个时间步保存一次快照；并且结束时也会保存最后一帧。
+        snapshot_dir: 快照目录。给出时各帧流式写入该目录下的内存映射文件（见 core.snapshots），
+            内存占用不随帧数增长；返回的 u_list / v_list / p_list 为按需读取的惰性序列，
+            支持 len() 与下标访问，每帧对应的时间步可由 core.snapshots.snapshot_steps 读取。
+        dtype: 场、ghost cells 与 PPE 工作数组的浮点类型，np.float64（默认）或 np.float32。
+            内核受内存带宽限制，float32 每个单元读写的字节数减半，大网格上吞吐量接近翻倍；
+            代价是速度场只有约 7 位有效数字，Vtol 不宜小于约 1e-6。定常模式要求 float64。
+        mixed_precision: 混合精度 PPE（要求 dtype=float64，压力求解器为 fft / multigrid / pcg /
+            sor / gauss_seidel）。内层以 float32 求解修正方程，外层以 float64 残差做迭代修正
+            (iterative refinement)，直至相对残差 ||b - L p|| <= Ptol ||b||（见 pressure.MixedPrecisionSolver）。
+        grid_stretch: 网格拉伸方式。None 为均匀网格（默认）；'tanh' 或 'cosine' 为两端壁面加密的
+            拉伸网格（见 core.grid），对流、扩散与 PPE 使用变系数有限体积格式 (core.kernels_stretched)。
+            拉伸网格只支持 numpy 后端、euler / ab2 / rk3 格式与 direct / sor / gauss_seidel 压力求解器
+            （auto 选 direct），不支持 grid_sequence 与 mixed_precision；显式扩散限制按最小网格间距计算。
+        stretch_factor: 拉伸强度。tanh 为 beta（默认 1.5），cosine 为 alpha ∈ (0, 1]（默认 0.5）。
+            各网格面 / 单元中心坐标在 info["coords"] 中返回（也可由 core.grid.mac_coordinates 计算）。
+        snapshot_codec: 快照在内存中的编码方式 (core.codec.SnapshotCodec，或其参数字典)。
+            给出时各帧按降精度 / 时间增量 / 压缩编码保存，返回的 u_list / v_list / p_list
+            为按需解码的序列；info["snapshot_codec"] 给出各场的误差上限、实际最大误差与压缩比。
+            不能与 snapshot_dir 同时使用。
+        progress: 进度显示与停止请求（见 core.progress）。
+            - auto: 在 Streamlit 脚本中显示 Streamlit 进度条并响应界面的停止按钮，否则使用 tqdm（默认）。
+            - streamlit / tqdm: 指定适配器；null 或 None: 不显示进度，时间循环中不做任何界面调用或导入。
+            - 也可以传入实现 core.progress.ProgressSink 接口的对象。
+        progress_every: 进度回调间隔（步），默认 tqdm 10 步、Streamlit 50 步、回调函数 100 步。
+        on_progress, should_cancel: 回调函数 on_progress(step, stats) 与 should_cancel()，
+            每 progress_every 步调用一次（step 为已完成的步数，stats 含 total / dt / time / error 等）；
+            should_cancel() 返回 True 时停止计算 (info["canceled"])。给出时不再显示进度条。
+        return_info=True 时 info 还包含本次调用的运行统计（计时与迭代次数直方图的开销每步不到 1 微秒、
+            内存固定，始终开启；逐步记录只在 return_info=True 时进行，每步 4 字节）:
+            - timings: 各阶段累计耗时 (s)，predict（预测步，含 ADI / AB2 / RK3 组合）、ppe_source、
+              ppe_solve（PPE 求解与压力归一化）、project、snapshot、checkpoint、other 与 total；
+            - ppe_iterations: 每个时间步的 PPE 迭代次数，int32 数组（RK3 为三级之和，直接法与 fft
+              每次记为 1）；ppe_summary: 其步数 / 总次数 / 平均 / 最大值；
+            - ppe_residual: 最后一次 PPE 的相对残差 ||b - L p|| / ||b||；
+            - velocity_change_history: 收敛检查步的 (步数, err_u, err_v)，(m, 3) 数组；
+            - steps_per_s 与 mlups（每秒百万单元更新数 nx * ny * 步数 / 耗时 / 1e6）。
+    """
 
-                # 2. Red Update
-                p_gs = (dy2 * (p_pad[1:-1, 2:] + p_pad[1:-1, :-2]) +
-                        dx2 * (p_pad[2:, 1:-1] + p_pad[:-2, 1:-1]) -
-                        dx2 * dy2 * b) * inv_denom
+    # 检查点中记录的求解参数（续算时校验一致性）
+    run_params = {
+        "Re": float(Re), "nx": int(nx), "ny": int(ny),
+        "dt": dt if isinstance(dt, str) else float(dt),
+        "time_scheme": time_scheme, "pressure_solver": pressure_solver, "omega": float(omega),
+        "Vtol": float(Vtol), "Ptol": float(Ptol), "max_iter": int(max_iter), "mode": mode,
+        "dtype": np.dtype(dtype).name, "mixed_precision": bool(mixed_precision),
+        "grid_stretch": grid_stretch, "stretch_factor": None if stretch_factor is None else float(stretch_factor),
+    }
+
+    if grid_sequence is not None:
+        if checkpoint_every is not None or resume_from is not None:
+            raise ValueError("grid_sequence 不支持检查点与续算")
+        if grid_stretch is not None:
+            raise ValueError("grid_sequence 只支持均匀网格")
+        return _run_grid_sequence(
+            grid_sequence, nx, ny, save_interval, snapshot_dir, snapshot_codec, return_info, (u0, v0, p0),
+            dict(Re=Re, max_iter=max_iter, dt=dt, Vtol=Vtol, Ptol=Ptol,
+                 pressure_solver=pressure_solver, omega=omega, mg_levels=mg_levels, mg_cycles=mg_cycles,
+                 backend=backend, threads=threads, dt_every=dt_every, dt_safety=dt_safety,
+                 time_scheme=time_scheme, mode=mode, newton_tol=newton_tol, newton_maxiter=newton_maxiter,
+                 newton_steps=newton_steps, newton_warmup=newton_warmup,
+                 dtype=dtype, mixed_precision=mixed_precision,
+                 progress=progress, progress_every=progress_every,
+                 on_progress=on_progress, should_cancel=should_cancel),
+        )
 
-                p_pad[1:-1, 1:-1][mask_red] = (1 - current_omega) * p_pad[1:-1, 1:-1][mask_red] + \
-                                              current_omega * p_gs[mask_red]
+    # 驱动层参数校验（求解器本身的参数由 CavitySolver 校验）
+    if mode not in ("transient", "steady"):
+        raise ValueError(f"未知的求解模式: {mode}")
+    if mode == "steady" and np.dtype(dtype) != np.float64:
+        raise ValueError("定常模式 (Newton-Krylov) 要求 dtype=float64")
+    if mode == "steady" and (int(newton_steps) <= 0 or int(newton_maxiter) <= 0 or int(newton_warmup) < 0):
+        raise ValueError("newton_steps / newton_maxiter 必须是正整数，newton_warmup 必须是非负整数")
+
+    # 检查点参数校验与续算状态读取
+    checkpoint = None
+    if checkpoint_every is not None:
+        try:
+            checkpoint_every = int(checkpoint_every)
+        except (TypeError, ValueError):
+            raise ValueError("checkpoint_every 必须是 None 或正整数")
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every 必须是 None 或正整数")
+        if checkpoint_path is None:
+            raise ValueError("设置 checkpoint_every 时必须给出 checkpoint_path")
+
+    resume_state = None
+    if resume_from is not None:
+        if any(x is not None for x in (u0, v0, p0)):
+            raise ValueError("resume_from 与 u0 / v0 / p0 不能同时使用")
+        resume_state = load_checkpoint(resume_from)
+        saved = resume_state["params"]
+        mismatch = [key for key in ("nx", "ny", "Re", "dt", "time_scheme", "pressure_solver", "omega",
+                                    "dtype", "mixed_precision", "grid_stretch", "stretch_factor")
+                    if saved.get(key, _CHECKPOINT_DEFAULTS.get(key)) != run_params[key]]
+        if mismatch:
+            raise ValueError(f"检查点参数与本次计算不一致: {', '.join(mismatch)}")
 
-                # 3. Black Update
-                p_gs = (dy2 * (p_pad[1:-1, 2:] + p_pad[1:-1, :-2]) +
-                        dx2 * (p_pad[2:, 1:-1] + p_pad[:-2, 1:-1]) -
-                        dx2 * dy2 * b) * inv_denom
+    # save_interval 参数校验
+    if save_interval is not None:
+        try:
+            save_interval = int(save_interval)
+        except (TypeError, ValueError):
+            raise ValueError("save_interval 必须是 None 或正整数")
+        if save_interval <= 0:
+            raise ValueError("save_interval 必须是 None 或正整数")
 
-                p_pad[1:-1, 1:-1][mask_black] = (1 - current_omega) * p_pad[1:-1, 1:-1][mask_black] + \
-                                                current_omega * p_gs[mask_black]
+    if snapshot_codec is not None:
+        if snapshot_dir is not None:
+            raise ValueError("snapshot_codec 不能与 snapshot_dir 同时使用")
+        if isinstance(snapshot_codec, dict):
+            snapshot_codec = SnapshotCodec(**snapshot_codec)
+        if not isinstance(snapshot_codec, SnapshotCodec):
+            raise ValueError("snapshot_codec 必须是 SnapshotCodec 或其参数字典")
 
-                # 检查收敛
-                if it_ppe % 10 == 0:
-                    diff = np.max(np.abs(p_pad[1:-1, 1:-1] - p_old_inner))
-                    if diff < Ptol:
-                        break
+    sink = make_progress(progress, progress_every, on_progress, should_cancel)
 
-            # 取回结果
-            p = p_pad[1:-1, 1:-1]
+    # -------------------------------------------------------------------------
+    # 1. 求解器：网格、工作区、压力求解器与时间格式状态
+    # -------------------------------------------------------------------------
+    solver = CavitySolver(
+        Re=Re, nx=nx, ny=ny, dt=dt, Ptol=Ptol, pressure_solver=pressure_solver, omega=omega,
+        mg_levels=mg_levels, mg_cycles=mg_cycles, backend=backend, threads=threads,
+        dt_every=dt_every, dt_safety=dt_safety, time_scheme=time_scheme,
+        u0=u0, v0=v0, p0=p0, dtype=dtype, mixed_precision=mixed_precision,
+        grid_stretch=grid_stretch, stretch_factor=stretch_factor, record_history=return_info,
+    )
+    u, v, p = solver.u, solver.v, solver.p
+    n_start = 0
+    if resume_state is not None:
+        solver.restore(resume_state)
+        n_start = solver.n
+        print(f"从检查点 {resume_from} 续算：第 {n_start} 步，dt={solver.dt:.5g}")
+
+    # 结果容器（给出 snapshot_dir 时写入磁盘快照存储，给出 snapshot_codec 时编码保存）
+    u_list = []
+    v_list = []
+    p_list = []
+    store = SnapshotStore(snapshot_dir, nx, ny, dtype=solver.dtype) if snapshot_dir is not None else None
+    if snapshot_codec is not None:
+        u_list, v_list, p_list = encoded_snapshots(snapshot_codec, nx, ny)
+
+    # 驱动层的计时（求解器各阶段的计时见 solver.timings）
+    driver_time = {"snapshot": 0.0, "checkpoint": 0.0}
+
+    def save_frame(step):
+        t0 = time.perf_counter()
+        if store is not None:
+            store.append(u, v, p, step)
+        elif snapshot_codec is not None:
+            u_list.append(u)
+            v_list.append(v)
+            p_list.append(p)
+        else:
+            u_list.append(u.copy())
+            v_list.append(v.copy())
+            p_list.append(p.copy())
+        driver_time["snapshot"] += time.perf_counter() - t0
 
-        # 归一化压力
-        p -= np.mean(p)
+    last_saved_step = None
 
-        # ==================== C. 速度修正 (Projection) ====================
+    # -------------------------------------------------------------------------
+    # 2. 时间步迭代
+    # -------------------------------------------------------------------------
+    # 定常模式下时间推进只用于提供 Newton 初值
+    n_march = max_iter if mode == "transient" else min(max_iter, int(newton_warmup))
+    every = sink.every
+    sink.start(n_start, n_march)
+    t_start = time.perf_counter()
 
-        # 修正 u
-        u[:, 1:-1] = u_star[:, 1:-1] - dt * (p[:, 1:] - p[:, :-1]) / dx
-        # 修正 v
-        v[1:-1, :] = v_star[1:-1, :] - dt * (p[1:, :] - p[:-1, :]) / dy
+    converged_step = None
+    canceled_step = None
+    diverged_step = None
 
-        # 强制最终边界条件
-        u[:, 0] = 0.0
-        u[:, -1] = 0.0
-        v[0, :] = 0.0
-        v[-1, :] = 0.0
-        u[-1, :] = u_top  # 恢复驱动速度
+    for _ in solver._march(Vtol, n_march, 100):
+        n = solver.n - 1  # 本步的步号（从 0 起）
 
         # ==================== D. 检查收敛与数据保存 ====================
+        if solver.status == "diverged":
+            diverged_step = solver.n
+            print(f"计算发散于第 {diverged_step} 步，请减小 dt。")
+            break
 
-        if n % 100 == 0:
-            # 使用相对误差
-            err_u = np.linalg.norm(u - un) / (np.linalg.norm(un) + 1e-12)
-            err_v = np.linalg.norm(v - vn) / (np.linalg.norm(vn) + 1e-12)
-
-            if err_u < Vtol and err_v < Vtol:
-                converged_step = n + 1
-                print(f"收敛于第 {converged_step} 步 (Error: {max(err_u, err_v):.2e})")
+        if solver.status == "converged":
+            converged_step = solver.n
+            print(f"收敛于第 {converged_step} 步 (Error: {solver.error:.2e})")
 
         # 按需保存快照：
         # - 不保存第 0 步（避免用户理解为“每 N 步保存一次”却多出一帧）
         # - 结束时会另保存最后一帧，因此这里也记录保存步数用于去重
         if save_interval is not None:
             if n > 0 and (n % save_interval) == 0:
-                u_list.append(u.copy())
-                v_list.append(v.copy())
-                p_list.append(p.copy())
+                save_frame(n + 1)
                 last_saved_step = n + 1
 
         if converged_step is not None:
-            if progress_bar is not None:
-                progress_bar.progress(100, text=f"已收敛，停止于第 {converged_step} 步")
             break
 
+        # 进度回调与停止请求（NullProgress 的 every 为 None，不做任何调用）
+        if every is not None and solver.n % every == 0:
+            sink.on_progress(solver.n, {"phase": "march", "total": n_march, "dt": solver.dt,
+                                        "time": solver.time, "error": solver.error})
+            if sink.should_cancel():
+                canceled_step = solver.n
+                break
+
+        # 周期性检查点（数组拷贝后交给后台线程写盘）
+        if checkpoint_every is not None and (n + 1) % checkpoint_every == 0:
+            t0 = time.perf_counter()
+            if checkpoint is None:
+                checkpoint = CheckpointWriter(checkpoint_path)
+            checkpoint.submit(solver.checkpoint_state(run_params))
+            driver_time["checkpoint"] += time.perf_counter() - t0
+
     else:
-        print(f"达到最大迭代次数 {max_iter}，未完全收敛。")
+        if mode == "transient":
+            print(f"达到最大迭代次数 {max_iter}，未完全收敛。")
 
-    # 结束时保证保存最后一帧（无论是否收敛），并避免与间隔快照重复
-    final_step = None
-    try:
-        final_step = (converged_step if converged_step is not None else (n + 1))
-    except Exception:
-        final_step = None
+    if checkpoint is not None:
+        checkpoint.close()
 
-    if save_interval is None or (last_saved_step != final_step):
-        u_list.append(u.copy())
-        v_list.append(v.copy())
-        p_list.append(p.copy())
-
-    if progress_bar is not None:
-        if canceled_step is not None:
-            progress_bar.progress(100, text=f"已停止于第 {canceled_step} 步")
-        elif converged_step is not None:
-            progress_bar.progress(100, text=f"计算完成：第 {converged_step} 步收敛")
+    # ==================== 定常模式：Newton-Krylov ====================
+    final_step = solver.n
+    newton_history = []
+    if mode == "steady" and converged_step is None and canceled_step is None and diverged_step is None:
+
+        def on_newton(k, res):
+            print(f"Newton 迭代 {k}: max|F| = {res:.2e}")
+            if every is not None:
+                sink.on_progress(k, {"phase": "newton", "total": int(newton_maxiter), "residual": res})
+
+        newton_ok, newton_history, newton_time_steps = newton_krylov_steady(
+            solver.ws, solver.time_step, solver.dt, steps=int(newton_steps), tol=newton_tol,
+            maxiter=int(newton_maxiter), callback=on_newton, reset=solver.reset_history,
+        )
+        final_step = solver.n + newton_time_steps
+        if newton_ok:
+            converged_step = final_step
+            print(f"Newton-Krylov 收敛：{len(newton_history)} 次迭代 (残差 {newton_history[-1]:.2e})")
         else:
-            progress_bar.progress(100, text="计算完成")
+            print(f"Newton-Krylov 未在 {newton_maxiter} 次迭代内收敛。")
+
+    # 结束时保证保存最后一帧（无论是否收敛），并避免与间隔快照重复
+    if save_interval is None or (last_saved_step != final_step):
+        save_frame(final_step)
+    if store is not None:
+        t0 = time.perf_counter()
+        u_list, v_list, p_list = store.close()
+        driver_time["snapshot"] += time.perf_counter() - t0
+    wall_time = time.perf_counter() - t_start
+    steps_run = final_step - n_start
+
+    if canceled_step is not None:
+        sink.finish(canceled_step, "canceled")
+    elif diverged_step is not None:
+        sink.finish(diverged_step, "diverged")
+    elif converged_step is not None:
+        sink.finish(converged_step, "converged")
+    else:
+        sink.finish(final_step, "max_iter")
 
     if return_info:
         info = {
@@ -380,8 +1064,29 @@ def lid_driven_cavity_mac(
             "converged_step": converged_step,
             "canceled": canceled_step is not None,
             "canceled_step": canceled_step,
+            "diverged": diverged_step is not None,
+            "diverged_step": diverged_step,
             "max_iter": int(max_iter),
+            "mode": mode,
+            "dt_history": list(solver.dt_history),
+            "time_scheme": time_scheme,
+            "resumed_from_step": n_start if resume_state is not None else None,
+            "checkpoints_written": checkpoint.written if checkpoint is not None else 0,
+            "coords": solver.grid.coordinates(),
+            # 运行统计：各阶段累计耗时 (s)、逐步 PPE 迭代次数、PPE 相对残差、速度变化历史与吞吐量
+            "timings": _phase_timings(solver.timings, driver_time, wall_time),
+            "ppe_iterations": solver.ppe_iterations,
+            "ppe_summary": solver.ppe_summary(),
+            "ppe_residual": solver.ppe_residual(),
+            "velocity_change_history": solver.velocity_history,
+            "steps_per_s": steps_run / wall_time if wall_time > 0 else None,
+            "mlups": nx * ny * steps_run / wall_time * 1e-6 if wall_time > 0 else None,
         }
+        if mode == "steady":
+            info["newton_iterations"] = len(newton_history)
+            info["residual_history"] = list(newton_history)
+        if snapshot_codec is not None:
+            info["snapshot_codec"] = snapshot_report((u_list, v_list, p_list))
         return u_list, v_list, p_list, info
 
     return u_list, v_list, p_list
@@ -0,0 +1,92 @@
+"""
+定常解的 Newton-Krylov 求解 (mode="steady")。
+
+把投影法时间推进器 Φ 作为预条件子：未知量为 MAC 内部速度 x = (u, v)，非线性方程为
+
+    F(x) = (Φ^K(x) - x) / (K dt) = 0,
+
+Φ^K 表示连续推进 K 个时间步（每步含预测、PPE 与速度修正）。F(x) = 0 当且仅当 x 是
+离散定常解：动量方程残差与压力梯度平衡，且投影保证离散散度为零（压力即最后一次 PPE 的解）。
+K 步推进使刚性的扩散模态在 F 中被阻尼，Krylov 迭代只需处理慢模态，
+因此比直接对定常残差做 Newton 迭代收敛快得多。
+Jacobian-向量积由 scipy.optimize.newton_krylov 以有限差分近似 (JFNK)，内层为 LGMRES。
+"""
+import numpy as np
+from scipy.optimize import NoConvergence, newton_krylov
+
+# 每次 Newton 迭代内 LGMRES 的最大迭代次数
+KRYLOV_MAXITER = 50
+
+
+def pack_velocity(ws):
+    """把内部速度面 u[:, 1:-1] 与 v[1:-1, :] 拼成一维向量。"""
+    return np.concatenate([ws.u[:, 1:-1].ravel(), ws.v[1:-1, :].ravel()])
+
+
+def unpack_velocity(ws, x):
+    """pack_velocity 的逆操作，原地写回工作区。"""
+    u_in, v_in = ws.u[:, 1:-1], ws.v[1:-1, :]
+    n_u = u_in.size
+    u_in[...] = x[:n_u].reshape(u_in.shape)
+    v_in[...] = x[n_u:].reshape(v_in.shape)
+
+
+def newton_krylov_steady(ws, time_step, dt, steps=20, tol=1e-6, maxiter=50, callback=None, reset=None):
+    """
+    以工作区中的当前速度为初值，用 Newton-Krylov 求离散定常解。
+
+    参数:
+        time_step: 无参函数，原地推进工作区一个时间步。
+        steps: 每次残差计算推进的时间步数 K。
+        tol: 残差 max|F| 的收敛容差。
+        maxiter: 最大 Newton 迭代次数。
+        callback: 每次 Newton 迭代后调用 callback(k, residual)。
+        reset: 可选的无参函数，每次残差计算前调用，清除多步格式（如 AB2）的历史，
+            使 Φ^K(x) 只取决于 x；否则 Newton 迭代面对的是随调用次数变化的函数，无法收敛。
+
+    返回 (converged, residual_history, n_steps)：n_steps 为残差计算累计推进的时间步数。
+    结束时工作区保存被接受的迭代点 x 的速度（即所报告残差对应的状态，而不是 Φ^K(x)），
+    压力为由 x 推进 K 步中最后一次 PPE 的解。
+    """
+    history = []
+    n_steps = [0]
+
+    def residual(x):
+        unpack_velocity(ws, x)
+        if reset is not None:
+            reset()
+        for _ in range(steps):
+            time_step()
+        n_steps[0] += steps
+        return (pack_velocity(ws) - x) / (steps * dt)
+
+    def on_iter(x, f):
+        res = float(np.abs(f).max())
+        history.append(res)
+        if res < best["res"]:
+            best["x"] = x.copy()
+            best["res"] = res
+        if callback is not None:
+            callback(len(history), res)
+
+    # 以初值的残差作为基准，未收敛时返回的点不会比初值更差
+    x0 = pack_velocity(ws)
+    with np.errstate(over="ignore", invalid="ignore"):
+        res0 = float(np.abs(residual(x0)).max())
+    best = {"x": x0.copy(), "res": res0 if np.isfinite(res0) else np.inf}
+    converged = True
+    try:
+        with np.errstate(over="ignore", invalid="ignore"):
+            x = newton_krylov(residual, x0, method="lgmres", inner_maxiter=KRYLOV_MAXITER,
+                              f_tol=tol, maxiter=maxiter, callback=on_iter)
+    except (NoConvergence, ValueError):
+        # 未收敛（或试探点发散）时退回残差最小的迭代点
+        converged = False
+        x = best["x"] if np.isfinite(best["res"]) else x0
+
+    # 由最终速度重新推进 K 步，使压力与速度场一致，再写回 x 本身
+    res = np.abs(residual(x)).max()
+    unpack_velocity(ws, x)
+    if converged and not history:
+        history.append(float(res))
+    return converged, history, n_steps[0]
@@ -0,0 +1,241 @@
+"""
+参数扫描：在进程池中并行运行 lid_driven_cavity_mac，结果逐个落盘并汇总。
+
+每个算例是一组 (Re, nx, ny, dt, pressure_solver, omega)，由 sweep_grid 按笛卡尔积生成，
+或直接给出参数字典的列表。run_sweep 把各算例提交到 ProcessPoolExecutor (spawn)：
+
+- 工作进程中的求解器不显示进度 (progress=None)，时间循环中没有界面调用；
+- 工作进程的 BLAS / OpenMP 线程数固定为 1（进程数即并行度，避免 P 个进程 x T 个线程的超额订阅）。
+  线程数环境变量在创建工作进程时设置（子进程在加载 BLAS 之前即继承），
+  安装了 threadpoolctl 时工作进程启动后再限制一次已加载的线程池；
+- 算例完成后由工作进程把最终场写入 out_dir/case_NNNN.npz（原子替换，见 core.checkpoint），
+  主进程按完成顺序把汇总行追加到 out_dir/summary.csv，中途中断时已完成的结果仍在磁盘上；
+- 全部完成后按算例编号重写 summary.csv，并返回汇总行的列表。
+
+汇总行包含收敛步数、实际步数、墙钟时间、steps/s，以及 Re 有 Ghia (1982) 数据时的中心线误差
+(见 core.validation.ghia_error)。
+
+命令行:
+    python -m core.sweep --re 100 400 1000 --grid 32 64 [--dt 0.001] [--solver fft]
+                         [--omega 1.8] [--out sweep_out] [--processes 4] [--max-iter 20000]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+# 工作进程中固定为 1 的线程数环境变量
+BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                    "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS", "BLIS_NUM_THREADS")
+
+# 算例参数与汇总表的列
+CASE_KEYS = ("Re", "nx", "ny", "dt", "pressure_solver", "omega")
+SUMMARY_COLUMNS = ("case",) + CASE_KEYS + (
+    "status", "converged_step", "steps", "wall_time", "steps_per_s",
+    "ghia_u_max", "ghia_u_rms", "ghia_v_max", "ghia_v_rms", "file", "error",
+)
+
+
+def sweep_grid(Re, nx, ny=None, dt=0.001, pressure_solver="auto", omega=1.8):
+    """
+    参数的笛卡尔积，返回算例参数字典的列表。
+
+    每个参数可以是单个值或序列；ny 为 None 时与 nx 相同（只生成方形网格，不做 nx x ny 的组合）。
+    """
+    def values(x):
+        return list(x) if isinstance(x, (list, tuple)) else [x]
+
+    grids = [(n, n) for n in values(nx)] if ny is None else list(itertools.product(values(nx), values(ny)))
+    cases = []
+    for Re_k, (nx_k, ny_k), dt_k, solver_k, omega_k in itertools.product(
+            values(Re), grids, values(dt), values(pressure_solver), values(omega)):
+        cases.append({"Re": Re_k, "nx": nx_k, "ny": ny_k, "dt": dt_k,
+                      "pressure_solver": solver_k, "omega": omega_k})
+    return cases
+
+
+@contextlib.contextmanager
+def _pinned_blas_env():
+    """临时把线程数环境变量设为 1，期间创建的子进程继承该设置。"""
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARS}
+    os.environ.update({name: "1" for name in BLAS_THREAD_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _init_worker():
+    """工作进程初始化：限制已加载的 BLAS / OpenMP 线程池（需要 threadpoolctl，未安装时跳过）。"""
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(1)
+
+
+def _run_case(index, case, out_dir, save_fields, solver_kwargs):
+    """在工作进程中运行一个算例，写出最终场，返回汇总行。"""
+    import numpy as np
+
+    from .checkpoint import save_checkpoint
+    from .solver import _steps_taken, lid_driven_cavity_mac
+    from .validation import ghia_error
+
+    row = {key: case.get(key) for key in CASE_KEYS}
+    row["case"] = index
+    sink = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            u_list, v_list, p_list, info = lid_driven_cavity_mac(**case, **solver_kwargs, progress=None,
+                                                                 return_info=True)
+    except Exception as exc:  # 单个算例出错不影响其余算例
+        row.update(status="error", error=f"{type(exc).__name__}: {exc}")
+        return row
+    wall_time = time.perf_counter() - t0
+
+    u, v, p = u_list[-1], v_list[-1], p_list[-1]
+    steps = _steps_taken(info)
+    if info["converged"]:
+        status = "converged"
+    elif info["diverged"]:
+        status = "diverged"
+    else:
+        status = "max_iter"
+    row.update(status=status, converged_step=info["converged_step"], steps=steps,
+               wall_time=wall_time, steps_per_s=steps / wall_time if wall_time > 0 else None)
+
+    coords = info["coords"]
+    err = ghia_error(u, v, case["Re"], coords["x_face"], coords["y_face"]) if status != "diverged" else None
+    if err is not None:
+        row.update({f"ghia_{key}": value for key, value in err.items()})
+
+    if save_fields:
+        name = f"case_{index:04d}.npz"
+        save_checkpoint(os.path.join(out_dir, name), {
+            "u": np.asarray(u), "v": np.asarray(v), "p": np.asarray(p),
+            "steps": np.int64(steps),
+            "params": np.array(json.dumps({**case, **solver_kwargs}, default=str)),
+        })
+        row["file"] = name
+    return row
+
+
+def _write_summary(path, rows):
+    """原子地写出汇总表 (CSV)。"""
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def run_sweep(cases, out_dir, processes=None, save_fields=True, on_result=None, **solver_kwargs):
+    """
+    在进程池中运行全部算例，返回按算例编号排序的汇总行列表。
+
+    参数:
+        cases: 算例参数字典的列表（见 sweep_grid），键为 lid_driven_cavity_mac 的参数名。
+        out_dir: 输出目录（不存在时创建）。
+        processes: 工作进程数，默认 os.cpu_count()。
+        save_fields: 是否把各算例的最终场写入 case_NNNN.npz（u / v / p / steps / params）。
+        on_result: 可选回调 on_result(row)，每完成一个算例在主进程中调用一次（按完成顺序）。
+        其余参数 (max_iter、Vtol、time_scheme 等) 原样传给每个算例的求解器。
+    """
+    cases = [dict(case) for case in cases]
+    if not cases:
+        raise ValueError("cases 不能为空")
+    for key in ("save_interval", "snapshot_dir", "snapshot_codec", "return_info"):
+        if key in solver_kwargs:
+            raise ValueError(f"参数扫描不支持 {key}（只保存各算例的最终场）")
+    for key in ("progress", "progress_every", "on_progress", "should_cancel"):
+        if key in solver_kwargs:
+            raise ValueError(f"参数扫描不支持 {key}（工作进程不显示单个算例的进度）")
+    processes = int(processes) if processes is not None else (os.cpu_count() or 1)
+    if processes <= 0:
+        raise ValueError("processes 必须是正整数")
+
+    os.makedirs(out_dir, exist_ok=True)
+    summary_path = os.path.join(out_dir, "summary.csv")
+    rows = []
+    print(f"参数扫描: {len(cases)} 个算例，{processes} 个进程，输出目录 {out_dir}")
+
+    with open(summary_path, "w", newline="", encoding="utf-8") as stream:
+        writer = csv.DictWriter(stream, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        stream.flush()
+        with ProcessPoolExecutor(max_workers=min(processes, len(cases)), mp_context=get_context("spawn"),
+                                 initializer=_init_worker) as pool:
+            # spawn 上下文按需创建工作进程：提交期间的环境变量即为工作进程的环境
+            with _pinned_blas_env():
+                futures = [pool.submit(_run_case, k, case, out_dir, save_fields, solver_kwargs)
+                           for k, case in enumerate(cases)]
+            for future in as_completed(futures):
+                row = future.result()
+                rows.append(row)
+                writer.writerow(row)
+                stream.flush()
+                print(f"[{len(rows)}/{len(cases)}] 算例 {row['case']}: Re={row['Re']}, "
+                      f"{row['nx']}x{row['ny']}, {row['status']}")
+                if on_result is not None:
+                    on_result(row)
+
+    rows.sort(key=lambda r: r["case"])
+    _write_summary(summary_path, rows)
+    return rows
+
+
+def format_summary(rows):
+    """汇总行的文本表格。"""
+    def num(x, fmt):
+        return "-" if x is None else format(x, fmt)
+
+    lines = [f"{'case':>4} {'Re':>7} {'grid':>9} {'dt':>8} {'solver':>12} {'status':>9} "
+             f"{'steps':>7} {'time[s]':>8} {'steps/s':>8} {'Ghia u':>7} {'Ghia v':>7}"]
+    for r in rows:
+        dt = r["dt"] if isinstance(r["dt"], str) else num(r["dt"], ".2e")
+        lines.append(
+            f"{r['case']:>4d} {r['Re']:>7g} {str(r['nx']) + 'x' + str(r['ny']):>9} {dt:>8} "
+            f"{r['pressure_solver']:>12} {r['status']:>9} {num(r.get('steps'), 'd'):>7} "
+            f"{num(r.get('wall_time'), '.2f'):>8} {num(r.get('steps_per_s'), '.1f'):>8} "
+            f"{num(r.get('ghia_u_max'), '.4f'):>7} {num(r.get('ghia_v_max'), '.4f'):>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="顶盖驱动方腔流参数扫描")
+    parser.add_argument("--re", type=float, nargs="+", required=True)
+    parser.add_argument("--grid", type=int, nargs="+", required=True, help="方形网格尺寸 n (n x n)")
+    parser.add_argument("--dt", nargs="+", default=["0.001"], help="时间步长或 auto")
+    parser.add_argument("--solver", nargs="+", default=["auto"])
+    parser.add_argument("--omega", type=float, nargs="+", default=[1.8])
+    parser.add_argument("--out", default="sweep_out")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--max-iter", type=int, default=20000)
+    parser.add_argument("--vtol", type=float, default=1e-6)
+    parser.add_argument("--time-scheme", default="euler")
+    parser.add_argument("--no-fields", action="store_true", help="不保存各算例的最终场")
+    args = parser.parse_args(argv)
+
+    dts = [d if d == "auto" else float(d) for d in args.dt]
+    cases = sweep_grid(args.re, args.grid, dt=dts, pressure_solver=args.solver, omega=args.omega)
+    rows = run_sweep(cases, args.out, processes=args.processes, save_fields=not args.no_fields,
+                     max_iter=args.max_iter, Vtol=args.vtol, time_scheme=args.time_scheme)
+    print(format_summary(rows))
+
+
+if __name__ == "__main__":
+    main()
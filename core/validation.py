@@ -0,0 +1,120 @@
+"""
+Ghia, Ghia & Shin (1982) 顶盖驱动方腔基准数据与中心线误差。
+
+GHIA_DATA[Re] 给出 x = 0.5 竖直中心线上的 u (y_u, u) 与 y = 0.5 水平中心线上的 v (x_v, v)。
+centerline_profiles 从 MAC 场中提取两条中心线（补上壁面 / 顶盖边界值），
+ghia_error 把中心线线性插值到 Ghia 采样点上，给出最大与均方根误差。
+"""
+import numpy as np
+
+GHIA_DATA = {
+    100: {
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719, 0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u':   [1.0000, 0.84123, 0.78871, 0.73722, 0.68717, 0.23151, 0.00332, -0.13641, -0.20581, -0.21090, -0.15662, -0.10150, -0.06434, -0.04775, -0.04192, -0.03717, 0.00000],
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563, 0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v':   [0.0000, -0.05906, -0.07391, -0.08864, -0.10313, -0.16914, -0.22445, -0.24533, 0.05454, 0.17527, 0.17507, 0.16077, 0.12317, 0.10890, 0.10091, 0.09233, 0.00000]
+    },
+    400: {
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719, 0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u':   [1.0000, 0.75837, 0.68439, 0.61756, 0.55892, 0.29093, 0.16256, 0.02135, -0.11477, -0.17119, -0.32726, -0.24299, -0.14612, -0.10338, -0.09266, -0.08186, 0.00000],
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563, 0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v':   [0.0000, -0.12146, -0.15663, -0.19254, -0.22847, -0.23827, -0.44993, -0.38598, 0.05186, 0.30174, 0.30203, 0.28124, 0.22965, 0.20920, 0.19713, 0.18360, 0.00000]
+    },
+    1000: {
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719, 0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u':   [1.0000, 0.65928, 0.57492, 0.51117, 0.46604, 0.33304, 0.18719, 0.05702, -0.06080, -0.10648, -0.27805, -0.38289, -0.29730, -0.22220, -0.20196, -0.18109, 0.00000],
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563, 0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v':   [0.0000, -0.21388, -0.27669, -0.33714, -0.39188, -0.51550, -0.42665, -0.31966, 0.02526, 0.32235, 0.33075, 0.37095, 0.32627, 0.30353, 0.29012, 0.27485, 0.00000]
+    },
+    3200: {
+        # Table I: u-velocity along vertical line (x=0.5)
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719,
+                0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u': [1.0000, 0.53236, 0.48296, 0.46547, 0.46101, 0.34682, 0.19791, 0.07156, -0.04272, -0.086636, -0.24427,
+              -0.34323, -0.41933, -0.37827, -0.35344, -0.32407, 0.00000],
+        # Table II: v-velocity along horizontal line (y=0.5)
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563,
+                0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v': [0.0000, -0.39017, -0.47425, -0.52357, -0.54053, -0.44307, -0.37401, -0.31184, 0.00999, 0.28188,
+              0.29030, 0.37119, 0.42768, 0.41906, 0.40917, 0.39560, 0.00000]
+    },
+    5000: {
+        # Table I: u-velocity
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719,
+                0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u': [1.0000, 0.48223, 0.46120, 0.45992, 0.46036, 0.33556, 0.20087, 0.08183, -0.03039, -0.07404, -0.22855,
+              -0.33050, -0.40435, -0.43643, -0.42901, -0.41165, 0.00000],
+        # Table II: v-velocity
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563,
+                0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v': [0.0000, -0.49774, -0.55069, -0.55408, -0.52876, -0.41442, -0.36214, -0.30018, 0.00945, 0.27280,
+              0.28066, 0.35368, 0.42951, 0.43648, 0.43329, 0.42447, 0.00000]
+    },
+    7500: {
+        # Table I: u-velocity
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719,
+                0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u': [1.0000, 0.47244, 0.47048, 0.47323, 0.47167, 0.34228, 0.20591, 0.08342, -0.03800, -0.07503, -0.23176,
+              -0.32393, -0.38324, -0.43025, -0.43590, -0.43154, 0.00000],
+        # Table II: v-velocity
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563,
+                0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v': [0.0000, -0.53858, -0.55216, -0.52347, -0.48590, -0.41050, -0.36213, -0.30448, 0.00824, 0.27348,
+              0.28117, 0.35060, 0.41824, 0.43564, 0.44030, 0.43979, 0.00000]
+    },
+    10000: {
+        # Table I: u-velocity
+        'y_u': [1.0000, 0.9766, 0.9688, 0.9609, 0.9531, 0.8516, 0.7344, 0.6172, 0.5000, 0.4531, 0.2813, 0.1719,
+                0.1016, 0.0703, 0.0625, 0.0547, 0.0000],
+        'u': [1.0000, 0.47221, 0.47783, 0.48070, 0.47804, 0.34635, 0.20673, 0.08344, 0.03111, -0.07540, -0.23186,
+              -0.32709, -0.38000, -0.41657, -0.42537, -0.42735, 0.00000],
+        # Table II: v-velocity
+        'x_v': [1.0000, 0.9688, 0.9609, 0.9531, 0.9453, 0.9063, 0.8594, 0.8047, 0.5000, 0.2344, 0.2266, 0.1563,
+                0.0938, 0.0781, 0.0703, 0.0625, 0.0000],
+        'v': [0.0000, -0.54302, -0.52987, -0.49099, -0.45863, -0.41496, -0.36737, -0.30719, 0.00831, 0.27224,
+              0.28003, 0.35070, 0.41487, 0.43124, 0.43733, 0.43983, 0.00000]
+    }
+}
+
+
+def centerline_profiles(u, v, x_face=None, y_face=None):
+    """
+    提取中心线剖面，返回 (y, u_mid, x, v_mid)。
+
+    u_mid 为 x = 0.5 处的 u（在相邻两列面之间线性插值），y 为对应的单元中心高度，首尾补上
+    下壁面 (u = 0) 与顶盖 (u = 1)；v_mid 为 y = 0.5 处的 v，x 首尾补上左右壁面 (v = 0)。
+    x_face / y_face 为网格面坐标，默认按 [0, 1] 上的均匀网格。
+    """
+    ny, nx = u.shape[0], v.shape[1]
+    x_face = np.linspace(0.0, 1.0, nx + 1) if x_face is None else np.asarray(x_face)
+    y_face = np.linspace(0.0, 1.0, ny + 1) if y_face is None else np.asarray(y_face)
+
+    def mid(values, faces, axis):
+        i = int(np.clip(np.searchsorted(faces, 0.5) - 1, 0, len(faces) - 2))
+        w = (0.5 - faces[i]) / (faces[i + 1] - faces[i])
+        return (1.0 - w) * np.take(values, i, axis=axis) + w * np.take(values, i + 1, axis=axis)
+
+    y = np.concatenate([[y_face[0]], 0.5 * (y_face[1:] + y_face[:-1]), [y_face[-1]]])
+    x = np.concatenate([[x_face[0]], 0.5 * (x_face[1:] + x_face[:-1]), [x_face[-1]]])
+    u_mid = np.concatenate([[0.0], mid(np.asarray(u, dtype=np.float64), x_face, axis=1), [1.0]])
+    v_mid = np.concatenate([[0.0], mid(np.asarray(v, dtype=np.float64), y_face, axis=0), [0.0]])
+    return y, u_mid, x, v_mid
+
+
+def ghia_error(u, v, Re, x_face=None, y_face=None):
+    """
+    中心线与 Ghia 数据的误差，返回 {"u_max", "u_rms", "v_max", "v_rms"}；
+    Re 不在 GHIA_DATA 中时返回 None。
+    """
+    g = GHIA_DATA.get(int(Re)) if float(Re).is_integer() else None
+    if g is None:
+        return None
+    y, u_mid, x, v_mid = centerline_profiles(u, v, x_face, y_face)
+    du = np.interp(g["y_u"], y, u_mid) - np.asarray(g["u"])
+    dv = np.interp(g["x_v"], x, v_mid) - np.asarray(g["v"])
+    return {
+        "u_max": float(np.abs(du).max()),
+        "u_rms": float(np.sqrt(np.mean(du ** 2))),
+        "v_max": float(np.abs(dv).max()),
+        "v_rms": float(np.sqrt(np.mean(dv ** 2))),
+    }
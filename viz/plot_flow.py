@@ -6,7 +6,12 @@ from matplotlib.ticker import FuncFormatter, LinearLocator, FormatStrFormatter
 _FONT_FAMILY = ["Times New Roman", "DejaVu Serif", "Liberation Serif", "serif"]
 
 
-def _prepare_center_fields(u, v, p, Lx=1.0, Ly=1.0):
+def _prepare_center_fields(u, v, p, Lx=1.0, Ly=1.0, x_face=None, y_face=None):
+    """
+    把 MAC 场插值到单元中心，返回 (X, Y, u_center, v_center)。
+
+    x_face / y_face 为网格面坐标（拉伸网格见 info["coords"]）；缺省时按均匀网格生成。
+    """
     ny, nx = p.shape
 
     # 1) MAC -> Center
@@ -21,15 +26,42 @@ def _prepare_center_fields(u, v, p, Lx=1.0, Ly=1.0):
         v_center = v
 
     # 2) Center coordinates
-    dx = Lx / nx
-    dy = Ly / ny
-    x = np.linspace(dx / 2, Lx - dx / 2, nx)
-    y = np.linspace(dy / 2, Ly - dy / 2, ny)
+    if x_face is None:
+        dx = Lx / nx
+        x = np.linspace(dx / 2, Lx - dx / 2, nx)
+    else:
+        x_face = np.asarray(x_face)
+        x = (x_face[:-1] + x_face[1:]) / 2.0
+    if y_face is None:
+        dy = Ly / ny
+        y = np.linspace(dy / 2, Ly - dy / 2, ny)
+    else:
+        y_face = np.asarray(y_face)
+        y = (y_face[:-1] + y_face[1:]) / 2.0
     X, Y = np.meshgrid(x, y)
 
     return X, Y, u_center, v_center
 
 
+def _uniform_resample(X, Y, *fields):
+    """
+    streamplot 要求等间距网格：把非均匀网格上的场逐方向线性插值到同样点数的均匀网格。
+    已是均匀网格时原样返回。
+    """
+    x, y = X[0, :], Y[:, 0]
+    xu = np.linspace(x[0], x[-1], x.size)
+    yu = np.linspace(y[0], y[-1], y.size)
+    if np.allclose(x, xu) and np.allclose(y, yu):
+        return (X, Y) + fields
+    out = []
+    for f in fields:
+        f = np.array([np.interp(xu, x, row) for row in f])
+        f = np.array([np.interp(yu, y, col) for col in f.T]).T
+        out.append(f)
+    Xu, Yu = np.meshgrid(xu, yu)
+    return (Xu, Yu) + tuple(out)
+
+
 def _setup_axis(ax, Lx, Ly, title):
     # 坐标轴格式化
     def axis_formatter(x, _pos):
@@ -59,8 +91,8 @@ def _setup_colorbar(cbar, fmt: str = '%7.2f'):
     cbar.ax.tick_params(labelsize=12)
 
 
-def plot_u_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False):
-    X, Y, u_center, _v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly)
+def plot_u_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False, x_face=None, y_face=None):
+    X, Y, u_center, _v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly, x_face=x_face, y_face=y_face)
 
     plt.rcParams['font.family'] = _FONT_FAMILY
     plt.rcParams['font.size'] = 12
@@ -81,8 +113,8 @@ def plot_u_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=
     return fig
 
 
-def plot_v_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False):
-    X, Y, _u_center, v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly)
+def plot_v_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False, x_face=None, y_face=None):
+    X, Y, _u_center, v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly, x_face=x_face, y_face=y_face)
 
     plt.rcParams['font.family'] = _FONT_FAMILY
     plt.rcParams['font.size'] = 12
@@ -103,8 +135,8 @@ def plot_v_velocity(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=
     return fig
 
 
-def plot_pressure(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False):
-    X, Y, _u_center, _v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly)
+def plot_pressure(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=False, x_face=None, y_face=None):
+    X, Y, _u_center, _v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly, x_face=x_face, y_face=y_face)
 
     plt.rcParams['font.family'] = _FONT_FAMILY
     plt.rcParams['font.size'] = 12
@@ -125,8 +157,9 @@ def plot_pressure(u, v, p, Re, Lx=1.0, Ly=1.0, levels=15, filename=None, show=Fa
     return fig
 
 
-def plot_streamlines(u, v, p, Re, Lx=1.0, Ly=1.0, density=1.5, filename=None, show=False):
-    X, Y, u_center, v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly)
+def plot_streamlines(u, v, p, Re, Lx=1.0, Ly=1.0, density=1.5, filename=None, show=False, x_face=None, y_face=None):
+    X, Y, u_center, v_center = _uniform_resample(
+        *_prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly, x_face=x_face, y_face=y_face))
 
     plt.rcParams['font.family'] = _FONT_FAMILY
     plt.rcParams['font.size'] = 12
@@ -157,7 +190,7 @@ def plot_streamlines(u, v, p, Re, Lx=1.0, Ly=1.0, density=1.5, filename=None, sh
     return fig
 
 
-def plot_results(u, v, p, Re, Lx=1.0, Ly=1.0, filename=None, show=False):
+def plot_results(u, v, p, Re, Lx=1.0, Ly=1.0, filename=None, show=False, x_face=None, y_face=None):
     """
     绘制顶盖驱动方腔流的综合结果图 (u, v, p, Streamlines)。
     自动处理 MAC 网格到中心网格的插值。
@@ -170,9 +203,10 @@ def plot_results(u, v, p, Re, Lx=1.0, Ly=1.0, filename=None, show=False):
         Lx, Ly: 区域尺寸
         filename: 保存文件名；为 None 则不保存
         show: 是否 plt.show()（Streamlit 下应为 False）
+        x_face, y_face: 网格面坐标（拉伸网格时传入 info["coords"] 中的值）；缺省为均匀网格
     """
     # 兼容接口：仍返回 2x2 Figure（用于脚本或你仍想一次性保存）
-    X, Y, u_center, v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly)
+    X, Y, u_center, v_center = _prepare_center_fields(u, v, p, Lx=Lx, Ly=Ly, x_face=x_face, y_face=y_face)
 
     plt.rcParams['font.family'] = _FONT_FAMILY
     plt.rcParams['font.size'] = 14
@@ -202,12 +236,13 @@ def plot_results(u, v, p, Re, Lx=1.0, Ly=1.0, filename=None, show=False):
     _setup_colorbar(fig.colorbar(cf3, ax=ax3, fraction=0.046, pad=0.04))
 
     ax4 = axes[1, 1]
-    speed = np.sqrt(u_center ** 2 + v_center ** 2)
+    Xs, Ys, us, vs = _uniform_resample(X, Y, u_center, v_center)
+    speed = np.sqrt(us ** 2 + vs ** 2)
     st = ax4.streamplot(
-        X,
-        Y,
-        u_center,
-        v_center,
+        Xs,
+        Ys,
+        us,
+        vs,
         color=speed,
         cmap='jet',
         density=1.5,